@@ -0,0 +1,74 @@
+from functools import partial
+
+from django.db import transaction
+
+from core.choices import ObjectChangeActionChoices
+from .models import ObjectChange
+
+__all__ = (
+    'ChangeQueue',
+    'flush_changes',
+)
+
+
+class ChangeQueue:
+    """
+    An in-memory buffer of ObjectChange records pending creation for the current request. Each change is accepted
+    only once the transaction (if any) in which it was made has been committed, so that changes which are rolled back
+    are never recorded.
+    """
+    def __init__(self):
+        self.changes = []
+
+    def __len__(self):
+        return len(self.changes)
+
+    def add(self, objectchange):
+        """
+        Queue an ObjectChange for creation once the current transaction has been committed.
+        """
+        # Release any references to the changed and related objects, which may be deleted before the queue is flushed
+        for field_name in ('changed_object', 'related_object'):
+            field = objectchange._meta.get_field(field_name)
+            if field.is_cached(objectchange):
+                field.delete_cached_value(objectchange)
+
+        transaction.on_commit(partial(self.changes.append, objectchange))
+
+    def clear(self):
+        self.changes = []
+
+
+def flush_changes(queue):
+    """
+    Write all committed ObjectChange records in the queue to the database. Successive updates to the same object are
+    merged into the most recent change recorded for that object, so that each object is logged once per request with
+    its final state. Updates which did not result in a change to the object are discarded.
+    """
+    changes = []
+    latest = {}
+    for objectchange in queue.changes:
+        key = (objectchange.changed_object_type_id, objectchange.changed_object_id)
+        prev_change = latest.get(key)
+
+        if (
+            prev_change is not None and
+            objectchange.action == ObjectChangeActionChoices.ACTION_UPDATE and
+            prev_change.action != ObjectChangeActionChoices.ACTION_DELETE
+        ):
+            prev_change.postchange_data = objectchange.postchange_data
+            prev_change.object_repr = objectchange.object_repr
+            prev_change.__dict__.pop('has_changes', None)
+            continue
+
+        changes.append(objectchange)
+        latest[key] = objectchange
+
+    changes = [
+        objectchange for objectchange in changes
+        if objectchange.action != ObjectChangeActionChoices.ACTION_UPDATE or objectchange.has_changes
+    ]
+    ObjectChange.objects.bulk_create(changes)
+    queue.clear()
+
+    return changes
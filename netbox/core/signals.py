@@ -13,8 +13,9 @@ from core.events import *
 from extras.events import enqueue_event
 from extras.utils import run_validators
 from netbox.config import get_config
-from netbox.context import current_request, events_queue
+from netbox.context import change_queue, current_request, events_queue
 from netbox.models.features import ChangeLoggingMixin
+from netbox.signals import post_bulk_create
 from utilities.exceptions import AbortRequest
 from .models import ConfigRevision, DataSource, ObjectChange
 
@@ -75,10 +76,22 @@ def handle_changed_object(sender, instance, **kwargs):
         OBJECT_UPDATED: ObjectChangeActionChoices.ACTION_UPDATE,
         OBJECT_DELETED: ObjectChangeActionChoices.ACTION_DELETE,
     }[event_type]
+
+    # Ensure that we're working with fresh M2M assignments
+    if m2m_changed:
+        instance._prefetched_objects_cache = {}
+
     objectchange = instance.to_objectchange(action)
-    # If this is a many-to-many field change, check for a previous ObjectChange instance recorded
-    # for this object by this request and update it
-    if m2m_changed and (
+    objectchange.user = request.user
+    objectchange.user_name = request.user.username
+    objectchange.request_id = request.id
+    if (queue := change_queue.get()) is not None:
+        # Buffer the change for creation at the end of the request (if committed). Successive changes to the same object
+        # (including changes to its many-to-many assignments) are merged into a single record.
+        queue.add(objectchange)
+    elif m2m_changed and (
+        # If this is a many-to-many field change, check for a previous ObjectChange instance recorded
+        # for this object by this request and update it
         prev_change := ObjectChange.objects.filter(
             changed_object_type=ContentType.objects.get_for_model(instance),
             changed_object_id=instance.pk,
@@ -88,14 +101,8 @@ def handle_changed_object(sender, instance, **kwargs):
         prev_change.postchange_data = objectchange.postchange_data
         prev_change.save()
     elif objectchange and objectchange.has_changes:
-        objectchange.user = request.user
-        objectchange.request_id = request.id
         objectchange.save()
 
-    # Ensure that we're working with fresh M2M assignments
-    if m2m_changed:
-        instance.refresh_from_db()
-
     # Enqueue the object for event processing
     queue = events_queue.get()
     enqueue_event(queue, instance, request.user, request.id, event_type)
@@ -108,6 +115,43 @@ def handle_changed_object(sender, instance, **kwargs):
         model_updates.labels(instance._meta.model_name).inc()
 
 
+@receiver(post_bulk_create)
+def handle_bulk_created_objects(sender, instances, **kwargs):
+    """
+    Fires when objects are created in bulk.
+    """
+    if not hasattr(sender, 'to_objectchange'):
+        return
+
+    # Get the current request, or bail if not set
+    request = current_request.get()
+    if request is None:
+        return
+
+    # Create an ObjectChange record for each new object
+    queue = change_queue.get()
+    objectchanges = []
+    for instance in instances:
+        objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_CREATE)
+        objectchange.user = request.user
+        objectchange.user_name = request.user.username
+        objectchange.request_id = request.id
+        if queue is not None:
+            queue.add(objectchange)
+        else:
+            objectchanges.append(objectchange)
+    ObjectChange.objects.bulk_create(objectchanges)
+
+    # Enqueue the objects for event processing
+    queue = events_queue.get()
+    for instance in instances:
+        enqueue_event(queue, instance, request.user, request.id, OBJECT_CREATED)
+    events_queue.set(queue)
+
+    # Increment metric counters
+    model_inserts.labels(sender._meta.model_name).inc(len(instances))
+
+
 @receiver(pre_delete)
 def handle_deleted_object(sender, instance, **kwargs):
     """
@@ -136,8 +180,12 @@ def handle_deleted_object(sender, instance, **kwargs):
             instance.snapshot()
         objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
         objectchange.user = request.user
+        objectchange.user_name = request.user.username
         objectchange.request_id = request.id
-        objectchange.save()
+        if (queue := change_queue.get()) is not None:
+            queue.add(objectchange)
+        else:
+            objectchange.save()
 
     # Django does not automatically send an m2m_changed signal for the reverse direction of a
     # many-to-many relationship (see https://code.djangoproject.com/ticket/17688), so we need to
@@ -1,5 +1,8 @@
+import uuid
+
 from django.contrib.contenttypes.models import ContentType
-from django.test import override_settings
+from django.db import transaction
+from django.test import RequestFactory, TransactionTestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 
@@ -9,6 +12,10 @@ from dcim.choices import SiteStatusChoices
 from dcim.models import Site, CableTermination, Device, DeviceType, DeviceRole, Interface, Cable
 from extras.choices import *
 from extras.models import CustomField, CustomFieldChoiceSet, Tag
+from netbox.context import current_request
+from netbox.context_managers import change_logging, event_tracking
+from users.models import User
+from utilities.exceptions import AbortTransaction
 from utilities.testing import APITestCase
 from utilities.testing.utils import create_tags, post_data
 from utilities.testing.views import ModelViewTestCase
@@ -590,3 +597,75 @@ class ChangeLogAPITest(APITestCase):
         self.assertEqual(objectchange.prechange_data['name'], 'Site 1')
         self.assertEqual(objectchange.prechange_data['slug'], 'site-1')
         self.assertEqual(objectchange.postchange_data, None)
+
+
+class ChangeQueueTest(TransactionTestCase):
+    """
+    Changes are queued only when a request is not processed within an enclosing transaction.
+    """
+    serialized_rollback = True
+
+    def setUp(self):
+        ContentType.objects.clear_cache()
+        # event_tracking() does not clear the current request if an exception is raised
+        self.addCleanup(current_request.reset, current_request.set(None))
+        self.user = User.objects.create_user(username='testuser')
+        self.request = RequestFactory().get('/')
+        self.request.id = uuid.uuid4()
+        self.request.user = self.user
+
+    def test_change_queue(self):
+        tags = create_tags('Tag 1', 'Tag 2')
+
+        # Create a site and make several successive changes to it within a single request
+        with event_tracking(self.request), change_logging(self.request):
+            with transaction.atomic():
+                site = Site.objects.create(name='Site 1', slug='site-1')
+                site.description = 'foo'
+                site.save()
+            site.tags.set(tags)
+            site.description = 'bar'
+            site.save()
+            # No ObjectChanges are written until the request has completed
+            self.assertEqual(ObjectChange.objects.count(), 0)
+
+        # Check that a single ObjectChange reflecting the final state of the object was recorded
+        oc = ObjectChange.objects.get()
+        self.assertEqual(oc.changed_object, site)
+        self.assertEqual(oc.action, ObjectChangeActionChoices.ACTION_CREATE)
+        self.assertEqual(oc.user, self.user)
+        self.assertEqual(oc.user_name, self.user.username)
+        self.assertEqual(oc.request_id, self.request.id)
+        self.assertEqual(oc.postchange_data['description'], 'bar')
+        self.assertEqual(oc.postchange_data['tags'], ['Tag 1', 'Tag 2'])
+
+    def test_change_queue_rollback(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+
+        # Changes rolled back to a savepoint are not recorded
+        with event_tracking(self.request), change_logging(self.request):
+            with transaction.atomic():
+                site.snapshot()
+                site.description = 'foo'
+                site.save()
+                try:
+                    with transaction.atomic():
+                        Site.objects.create(name='Site 2', slug='site-2')
+                        site.snapshot()
+                        site.description = 'bar'
+                        site.save()
+                        raise AbortTransaction()
+                except AbortTransaction:
+                    pass
+        oc = ObjectChange.objects.get()
+        self.assertEqual(oc.changed_object, site)
+        self.assertEqual(oc.action, ObjectChangeActionChoices.ACTION_UPDATE)
+        self.assertEqual(oc.postchange_data['description'], 'foo')
+
+        # Changes rolled back by an unhandled exception are not recorded
+        with self.assertRaises(ValueError):
+            with event_tracking(self.request), change_logging(self.request):
+                with transaction.atomic():
+                    Site.objects.create(name='Site 3', slug='site-3')
+                    raise ValueError()
+        self.assertEqual(ObjectChange.objects.count(), 1)
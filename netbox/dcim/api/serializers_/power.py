@@ -1,3 +1,6 @@
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
 from dcim.choices import *
 from dcim.models import PowerFeed, PowerPanel
 from netbox.api.fields import ChoiceField, RelatedObjectCountField
@@ -23,6 +26,8 @@ class PowerPanelSerializer(NetBoxModelSerializer):
         default=None
     )
 
+    power_draw = serializers.SerializerMethodField(read_only=True)
+
     # Related object counts
     powerfeed_count = RelatedObjectCountField('powerfeeds')
 
@@ -30,10 +35,14 @@ class PowerPanelSerializer(NetBoxModelSerializer):
         model = PowerPanel
         fields = [
             'id', 'url', 'display_url', 'display', 'site', 'location', 'name', 'description', 'comments', 'tags',
-            'custom_fields', 'powerfeed_count', 'created', 'last_updated',
+            'custom_fields', 'powerfeed_count', 'power_draw', 'created', 'last_updated',
         ]
         brief_fields = ('id', 'url', 'display', 'name', 'description', 'powerfeed_count')
 
+    @extend_schema_field(serializers.JSONField())
+    def get_power_draw(self, obj):
+        return obj.get_power_draw()
+
 
 class PowerFeedSerializer(NetBoxModelSerializer, CabledObjectSerializer, ConnectedEndpointsSerializer):
     power_panel = PowerPanelSerializer(nested=True)
@@ -64,13 +73,19 @@ class PowerFeedSerializer(NetBoxModelSerializer, CabledObjectSerializer, Connect
         required=False,
         allow_null=True
     )
+    power_draw = serializers.SerializerMethodField(read_only=True, allow_null=True)
 
     class Meta:
         model = PowerFeed
         fields = [
             'id', 'url', 'display_url', 'display', 'power_panel', 'rack', 'name', 'status', 'type', 'supply',
-            'phase', 'voltage', 'amperage', 'max_utilization', 'mark_connected', 'cable', 'cable_end', 'link_peers',
-            'link_peers_type', 'connected_endpoints', 'connected_endpoints_type', 'connected_endpoints_reachable',
-            'description', 'tenant', 'comments', 'tags', 'custom_fields', 'created', 'last_updated', '_occupied',
+            'phase', 'voltage', 'amperage', 'max_utilization', 'power_draw', 'mark_connected', 'cable', 'cable_end',
+            'link_peers', 'link_peers_type', 'connected_endpoints', 'connected_endpoints_type',
+            'connected_endpoints_reachable', 'description', 'tenant', 'comments', 'tags', 'custom_fields', 'created',
+            'last_updated', '_occupied',
         ]
         brief_fields = ('id', 'url', 'display', 'name', 'description', 'cable', '_occupied')
+
+    @extend_schema_field(serializers.JSONField(allow_null=True))
+    def get_power_draw(self, obj):
+        return obj.get_power_draw()
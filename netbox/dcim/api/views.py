@@ -1,6 +1,8 @@
 from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.db import transaction
 from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework.decorators import action
@@ -9,9 +11,10 @@ from rest_framework.routers import APIRootView
 from rest_framework.viewsets import ViewSet
 
 from dcim import filtersets
-from dcim.constants import CABLE_TRACE_SVG_DEFAULT_WIDTH
+from dcim.constants import CABLE_TRACE_SVG_DEFAULT_WIDTH, RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
 from dcim.models import *
-from dcim.svg import CableTraceSVG
+from dcim.svg import CableTraceSVG, RackElevationSVG
+from dcim.utils import deferred_device_components
 from extras.api.mixins import ConfigContextQuerySetMixin, RenderConfigMixin
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.metadata import ContentTypeMetadata
@@ -207,18 +210,27 @@ class RackViewSet(NetBoxModelViewSet):
                 except ValueError:
                     pass
 
-            # Render and return the elevation as an SVG drawing with the correct content type
-            drawing = rack.get_elevation_svg(
-                face=data['face'],
-                user=request.user,
+            elevation = RackElevationSVG(
+                rack,
                 unit_width=data['unit_width'],
                 unit_height=data['unit_height'],
                 legend_width=data['legend_width'],
+                margin_width=RACK_ELEVATION_DEFAULT_MARGIN_WIDTH,
+                user=request.user,
                 include_images=data['include_images'],
                 base_url=request.build_absolute_uri('/'),
                 highlight_params=highlight_params
             )
-            return HttpResponse(drawing.tostring(), content_type='image/svg+xml')
+
+            # Return 304 (Not Modified) if the client's copy of the elevation is current
+            etag = elevation.get_etag(data['face'])
+            if response := get_conditional_response(request, etag=etag):
+                return response
+
+            # Render and return the elevation as an SVG drawing with the correct content type
+            response = HttpResponse(elevation.render_cached(data['face']), content_type='image/svg+xml')
+            response.headers['ETag'] = etag
+            return response
 
         else:
             # Return a JSON representation of the rack units in the elevation
@@ -398,6 +410,11 @@ class DeviceViewSet(
 
         return serializers.DeviceWithConfigContextSerializer
 
+    def create(self, request, *args, **kwargs):
+        # Instantiate the components of all new devices together, once all devices have been created
+        with transaction.atomic(), deferred_device_components():
+            return super().create(request, *args, **kwargs)
+
 
 class VirtualDeviceContextViewSet(NetBoxModelViewSet):
     queryset = VirtualDeviceContext.objects.all()
@@ -563,7 +580,7 @@ class VirtualChassisViewSet(NetBoxModelViewSet):
 #
 
 class PowerPanelViewSet(NetBoxModelViewSet):
-    queryset = PowerPanel.objects.all()
+    queryset = PowerPanel.objects.annotate_power_draw()
     serializer_class = serializers.PowerPanelSerializer
     filterset_class = filtersets.PowerPanelFilterSet
 
@@ -573,7 +590,7 @@ class PowerPanelViewSet(NetBoxModelViewSet):
 #
 
 class PowerFeedViewSet(PathEndpointMixin, NetBoxModelViewSet):
-    queryset = PowerFeed.objects.prefetch_related(
+    queryset = PowerFeed.objects.annotate_power_draw().prefetch_related(
         '_path', 'cable__terminations',
     )
     serializer_class = serializers.PowerFeedSerializer
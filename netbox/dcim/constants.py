@@ -19,6 +19,9 @@ RACK_ELEVATION_DEFAULT_MARGIN_WIDTH = 15
 
 RACK_STARTING_UNIT_DEFAULT = 1
 
+# Time (in seconds) for which rendered rack elevations are cached
+RACK_ELEVATION_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 #
 # RearPorts
@@ -93,6 +96,29 @@ MODULAR_COMPONENT_MODELS = Q(
         'rearport',
     ))
 
+# Component template models, in the order in which components are instantiated for a new Device (such that any
+# components referenced by another are created first)
+DEVICE_COMPONENT_TEMPLATE_MODELS = (
+    'consoleporttemplate',
+    'consoleserverporttemplate',
+    'powerporttemplate',
+    'poweroutlettemplate',
+    'interfacetemplate',
+    'rearporttemplate',
+    'frontporttemplate',
+    'modulebaytemplate',
+    'devicebaytemplate',
+    'inventoryitemtemplate',
+)
+
+
+#
+# Power
+#
+
+# Time (in seconds) for which calculated power draws are cached
+POWER_DRAW_CACHE_TIMEOUT = 60 * 60
+
 
 #
 # Cabling and connections
@@ -1,10 +1,10 @@
 from django.core.management.base import BaseCommand
 from django.core.management.color import no_style
-from django.db import connection
+from django.db import connection, transaction
 from django.db.models import Q
 
 from dcim.models import CablePath, ConsolePort, ConsoleServerPort, Interface, PowerFeed, PowerOutlet, PowerPort
-from dcim.signals import create_cablepath
+from dcim.utils import create_cablepaths
 
 ENDPOINT_MODELS = (
     ConsolePort,
@@ -28,6 +28,10 @@ class Command(BaseCommand):
             "--no-input", action='store_true', dest='no_input',
             help="Do not prompt user for any input/confirmation"
         )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, dest='batch_size',
+            help="Number of origins to trace together (default: 1000)"
+        )
 
     def draw_progress_bar(self, percentage):
         """
@@ -80,10 +84,14 @@ class Command(BaseCommand):
                 continue
             self.stdout.write(f'Retracing {origins_count} cabled {model._meta.verbose_name_plural}...')
             i = 0
-            for i, obj in enumerate(origins, start=1):
-                create_cablepath([obj])
-                if not i % 100:
-                    self.draw_progress_bar(i * 100 / origins_count)
+            batch_size = options['batch_size']
+            origin_ids = list(origins.order_by('pk').values_list('pk', flat=True))
+            for offset in range(0, origins_count, batch_size):
+                batch = model.objects.filter(pk__in=origin_ids[offset:offset + batch_size])
+                with transaction.atomic():
+                    create_cablepaths([[obj] for obj in batch], batch_size=batch_size)
+                i += len(batch)
+                self.draw_progress_bar(i * 100 / origins_count)
             self.draw_progress_bar(100)
             self.stdout.write(self.style.SUCCESS(f'\n  Retraced {i} {model._meta.verbose_name_plural}'))
 
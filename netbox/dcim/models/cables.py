@@ -1,4 +1,5 @@
 import itertools
+from collections import defaultdict
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.core.exceptions import ValidationError
@@ -10,7 +11,7 @@ from core.models import ObjectType
 from dcim.choices import *
 from dcim.constants import *
 from dcim.fields import PathField
-from dcim.utils import decompile_path_node, object_to_path_node
+from dcim.utils import compile_path_node, decompile_path_node, object_to_path_node
 from netbox.models import ChangeLoggedModel, PrimaryModel
 from utilities.conversion import to_meters
 from utilities.exceptions import AbortRequest
@@ -526,8 +527,6 @@ class CablePath(models.Model):
         Cable or WirelessLink connects (interfaces, console ports, circuit termination, etc.). All terminations must be
         of the same type and must belong to the same parent object.
         """
-        from circuits.models import CircuitTermination
-
         if not terminations:
             return None
 
@@ -535,8 +534,33 @@ class CablePath(models.Model):
         if len(terminations) > 1 and not all(t.link == terminations[0].link for t in terminations[1:]):
             raise UnsupportedCablePath(_("All originating terminations must be attached to the same link"))
 
+        trace = cls._trace(terminations)
+        if trace is None:
+            return None
+        path, is_complete, is_active, is_split = trace
+
+        return cls(
+            path=path,
+            is_complete=is_complete,
+            is_active=is_active,
+            is_split=is_split
+        )
+
+    @staticmethod
+    def _trace(terminations, position_stack=None, is_origin=True):
+        """
+        Trace a path onward from the given near-end terminations. Returns a tuple of (path, is_complete, is_active,
+        is_split), where path holds only the steps traced from this point, or None if tracing from the origin and no
+        link is attached.
+
+        :param terminations: The near-end termination objects from which to begin tracing
+        :param position_stack: The stack of FrontPort positions carried over from any preceding steps
+        :param is_origin: True if the terminations are the originating end of the path
+        """
+        from circuits.models import CircuitTermination
+
         path = []
-        position_stack = []
+        position_stack = position_stack or []
         is_complete = False
         is_active = True
         is_split = False
@@ -568,7 +592,7 @@ class CablePath(models.Model):
             # Step 2: Determine the attached links (Cable or WirelessLink), if any
             links = [termination.link for termination in terminations if termination.link is not None]
             if len(links) == 0:
-                if len(path) == 1:
+                if is_origin and len(path) == 1:
                     # If this is the start of the path and no link exists, return None
                     return None
                 # Otherwise, halt the trace if no link exists
@@ -732,12 +756,7 @@ class CablePath(models.Model):
                     is_split = True
                 break
 
-        return cls(
-            path=path,
-            is_complete=is_complete,
-            is_active=is_active,
-            is_split=is_split
-        )
+        return path, is_complete, is_active, is_split
 
     def retrace(self):
         """
@@ -754,6 +773,158 @@ class CablePath(models.Model):
             self.delete()
     retrace.alters_data = True
 
+    def retrace_from(self, nodes, suffix_cache=None):
+        """
+        Retrace the path from the first hop which involves any of the specified nodes, retaining all preceding steps
+        as-is. If the path must be traced again from its origin, this is equivalent to calling retrace().
+
+        :param nodes: A set of modified path nodes (as returned by object_to_path_node())
+        :param suffix_cache: An optional dictionary in which traced suffixes are stored for reuse by other CablePaths
+            continuing from the same hop
+        """
+        start = self._get_resume_step(nodes)
+        state = self._get_prefix_state(start) if start else None
+        if state is None:
+            return self.retrace()
+        position_stack, is_active, prefix_is_split = state
+
+        # Paths arriving at the same near-end terminations with the same position stack share an identical suffix
+        key = (tuple(self.path[start]), tuple(tuple(positions) for positions in position_stack))
+        if suffix_cache is not None and key in suffix_cache:
+            trace = suffix_cache[key]
+        else:
+            terminations = self._get_step_objects(self.path[start])
+            if terminations is None:
+                return self.retrace()
+            trace = self._trace(terminations, position_stack=position_stack, is_origin=False)
+            if suffix_cache is not None:
+                suffix_cache[key] = trace
+        suffix, is_complete, suffix_is_active, is_split = trace
+
+        self.path = [*self.path[:start], *[list(step) for step in suffix]]
+        self.is_complete = is_complete
+        self.is_active = is_active and suffix_is_active
+        self.is_split = prefix_is_split or is_split
+        self.save()
+    retrace_from.alters_data = True
+
+    def _get_resume_step(self, nodes):
+        """
+        Return the index of the near-end step of the first hop which involves any of the specified nodes.
+        """
+        for i, step in enumerate(self.path):
+            if not nodes.isdisjoint(step):
+                break
+        else:
+            return 0
+        start = i - i % 3
+
+        # A CircuitTermination's peer is recorded along with its ProviderNetwork or other termination as part of the
+        # preceding hop; resume from that hop instead.
+        link_types = (
+            ObjectType.objects.get_for_model(Cable).pk,
+            ObjectType.objects.get_for_model(WirelessLink).pk,
+        )
+        if start + 1 < len(self.path) and self.path[start + 1]:
+            ct_id, _ = decompile_path_node(self.path[start + 1][0])
+            if ct_id not in link_types:
+                start -= 3
+
+        return max(start, 0)
+
+    def _get_prefix_state(self, start):
+        """
+        Reconstruct the FrontPort position stack, link status, and split status for all hops preceding the given step.
+        Returns a tuple of (position_stack, is_active, is_split), or None if any of the objects in the path no longer
+        exist.
+        """
+        frontport_type = ObjectType.objects.get_for_model(FrontPort).pk
+        rearport_type = ObjectType.objects.get_for_model(RearPort).pk
+        cable_type = ObjectType.objects.get_for_model(Cable).pk
+        wirelesslink_type = ObjectType.objects.get_for_model(WirelessLink).pk
+
+        # Collect object IDs by type. Also include the resume step, as its RearPorts determine whether the final
+        # FrontPort positions were pushed onto the stack.
+        object_ids = defaultdict(set)
+        for step in self.path[:start + 1]:
+            for node in step:
+                ct_id, object_id = decompile_path_node(node)
+                object_ids[ct_id].add(object_id)
+
+        frontport_positions = dict(
+            FrontPort.objects.filter(pk__in=object_ids[frontport_type]).values_list('pk', 'rear_port_position')
+        ) if object_ids[frontport_type] else {}
+        rearport_positions = dict(
+            RearPort.objects.filter(pk__in=object_ids[rearport_type]).values_list('pk', 'positions')
+        ) if object_ids[rearport_type] else {}
+        link_statuses = []
+        if object_ids[cable_type]:
+            link_statuses.extend(
+                Cable.objects.filter(pk__in=object_ids[cable_type]).values_list('status', flat=True)
+            )
+        if object_ids[wirelesslink_type]:
+            link_statuses.extend(
+                WirelessLink.objects.filter(pk__in=object_ids[wirelesslink_type]).values_list('status', flat=True)
+            )
+        if len(link_statuses) != len(object_ids[cable_type]) + len(object_ids[wirelesslink_type]):
+            return None
+        is_active = all(status == LinkStatusChoices.STATUS_CONNECTED for status in link_statuses)
+
+        # Replay the position stack operations performed by _trace() for each far-end step
+        position_stack = []
+        for i in range(2, start, 3):
+            far_end = [decompile_path_node(node) for node in self.path[i]]
+            if not far_end:
+                continue
+            if far_end[0][0] == frontport_type:
+                _, next_id = decompile_path_node(self.path[i + 1][0])
+                if next_id not in rearport_positions:
+                    return None
+                if len(self.path[i + 1]) > 1 or rearport_positions[next_id] > 1:
+                    positions = [frontport_positions.get(object_id) for _, object_id in far_end]
+                    if None in positions:
+                        return None
+                    position_stack.append(positions)
+            elif far_end[0][0] == rearport_type:
+                if far_end[0][1] not in rearport_positions:
+                    return None
+                if (len(far_end) > 1 or rearport_positions[far_end[0][1]] > 1) and position_stack:
+                    position_stack.pop()
+
+        # Replay the asymmetric path check performed by _trace() for each near-end step. A single termination must
+        # have a link attached, as the path continues past it.
+        is_split = False
+        for i in range(0, start, 3):
+            if len(self.path[i]) > 1:
+                terminations = self._get_step_objects(self.path[i])
+                if terminations is None:
+                    return None
+                if any(t.link is None for t in terminations):
+                    is_split = True
+                    break
+
+        return position_stack, is_active, is_split
+
+    @staticmethod
+    def _get_step_objects(step):
+        """
+        Return the objects for all nodes within a path step, in order, or None if any no longer exist.
+        """
+        object_ids = defaultdict(list)
+        for node in step:
+            ct_id, object_id = decompile_path_node(node)
+            object_ids[ct_id].append(object_id)
+
+        objects = {}
+        for ct_id, pks in object_ids.items():
+            model = ObjectType.objects.get_for_id(ct_id).model_class()
+            for obj in model.objects.filter(pk__in=pks):
+                objects[compile_path_node(ct_id, obj.pk)] = obj
+
+        if len(objects) != len(set(step)):
+            return None
+        return [objects[node] for node in step]
+
     def get_cable_ids(self):
         """
         Return all Cable IDs within the path.
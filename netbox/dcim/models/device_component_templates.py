@@ -378,12 +378,13 @@ class PowerOutletTemplate(ModularComponentTemplateModel):
                     )
                 )
 
-    def instantiate(self, **kwargs):
-        if self.power_port:
+    def instantiate(self, power_port=None, **kwargs):
+        """
+        The PowerPort to which the PowerOutlet is assigned is looked up by name unless otherwise specified.
+        """
+        if power_port is None and self.power_port:
             power_port_name = self.power_port.resolve_name(kwargs.get('module'))
             power_port = PowerPort.objects.get(name=power_port_name, **kwargs)
-        else:
-            power_port = None
         return self.component_model(
             name=self.resolve_name(kwargs.get('module')),
             label=self.resolve_label(kwargs.get('module')),
@@ -589,12 +590,13 @@ class FrontPortTemplate(ModularComponentTemplateModel):
         except RearPortTemplate.DoesNotExist:
             pass
 
-    def instantiate(self, **kwargs):
-        if self.rear_port:
+    def instantiate(self, rear_port=None, **kwargs):
+        """
+        The RearPort to which the FrontPort is mapped is looked up by name unless otherwise specified.
+        """
+        if rear_port is None and self.rear_port:
             rear_port_name = self.rear_port.resolve_name(kwargs.get('module'))
             rear_port = RearPort.objects.get(name=rear_port_name, **kwargs)
-        else:
-            rear_port = None
         return self.component_model(
             name=self.resolve_name(kwargs.get('module')),
             label=self.resolve_label(kwargs.get('module')),
@@ -802,13 +804,15 @@ class InventoryItemTemplate(MPTTModel, ComponentTemplateModel):
         verbose_name = _('inventory item template')
         verbose_name_plural = _('inventory item templates')
 
-    def instantiate(self, **kwargs):
-        parent = InventoryItem.objects.get(name=self.parent.name, **kwargs) if self.parent else None
-        if self.component:
+    def instantiate(self, parent=None, component=None, **kwargs):
+        """
+        The parent InventoryItem and the assigned component are looked up by name unless otherwise specified.
+        """
+        if parent is None and self.parent:
+            parent = InventoryItem.objects.get(name=self.parent.name, **kwargs)
+        if component is None and self.component:
             model = self.component.component_model
             component = model.objects.get(name=self.component.name, **kwargs)
-        else:
-            component = None
         return self.component_model(
             parent=parent,
             name=self.name,
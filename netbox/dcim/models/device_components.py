@@ -4,13 +4,13 @@ from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelatio
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Sum
 from django.utils.translation import gettext_lazy as _
 from mptt.models import MPTTModel, TreeForeignKey
 
 from dcim.choices import *
 from dcim.constants import *
 from dcim.fields import WWNField
+from dcim.power import get_power_draws
 from netbox.choices import ColorChoices
 from netbox.models import OrganizationalModel, NetBoxModel
 from utilities.fields import ColorField, NaturalOrderingField
@@ -405,47 +405,15 @@ class PowerPort(ModularComponentModel, CabledObjectModel, PathEndpoint, Tracking
 
     def get_power_draw(self):
         """
-        Return the allocated and maximum power draw (in VA) and child PowerOutlet count for this PowerPort.
+        Return the allocated and maximum power draw (in VA) and child PowerOutlet count for this PowerPort. If no draw
+        has been defined manually, it is aggregated from the PowerPorts connected to its child PowerOutlets (per leg,
+        for PowerPorts fed by a three-phase PowerFeed).
         """
-        from dcim.models import PowerFeed
+        # Return the value retrieved by annotate_power_draws(), if any
+        if hasattr(self, '_power_draw'):
+            return self._power_draw
 
-        # Calculate aggregate draw of all child power outlets if no numbers have been defined manually
-        if self.allocated_draw is None and self.maximum_draw is None:
-            utilization = self.get_downstream_powerports().aggregate(
-                maximum_draw_total=Sum('maximum_draw'),
-                allocated_draw_total=Sum('allocated_draw'),
-            )
-            ret = {
-                'allocated': utilization['allocated_draw_total'] or 0,
-                'maximum': utilization['maximum_draw_total'] or 0,
-                'outlet_count': self.poweroutlets.count(),
-                'legs': [],
-            }
-
-            # Calculate per-leg aggregates for three-phase power feeds
-            if len(self.link_peers) == 1 and isinstance(self.link_peers[0], PowerFeed) and \
-                    self.link_peers[0].phase == PowerFeedPhaseChoices.PHASE_3PHASE:
-                for leg, leg_name in PowerOutletFeedLegChoices:
-                    utilization = self.get_downstream_powerports(leg=leg).aggregate(
-                        maximum_draw_total=Sum('maximum_draw'),
-                        allocated_draw_total=Sum('allocated_draw'),
-                    )
-                    ret['legs'].append({
-                        'name': leg_name,
-                        'allocated': utilization['allocated_draw_total'] or 0,
-                        'maximum': utilization['maximum_draw_total'] or 0,
-                        'outlet_count': self.poweroutlets.filter(feed_leg=leg).count(),
-                    })
-
-            return ret
-
-        # Default to administratively defined values
-        return {
-            'allocated': self.allocated_draw or 0,
-            'maximum': self.maximum_draw or 0,
-            'outlet_count': self.poweroutlets.count(),
-            'legs': [],
-        }
+        return get_power_draws([self.pk]).get(self.pk)
 
 
 class PowerOutlet(ModularComponentModel, CabledObjectModel, PathEndpoint, TrackingModelMixin):
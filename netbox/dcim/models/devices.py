@@ -10,7 +10,6 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import F, ProtectedError
 from django.db.models.functions import Lower
-from django.db.models.signals import post_save
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
@@ -19,8 +18,8 @@ from core.models import ObjectType
 from dcim.choices import *
 from dcim.constants import *
 from dcim.fields import MACAddressField
-from dcim.utils import update_interface_bridges
-from extras.models import ConfigContextModel, CustomField
+from dcim.utils import defer_device_components, instantiate_device_components
+from extras.models import ConfigContextModel
 from extras.querysets import ConfigContextModelQuerySet
 from netbox.choices import ColorChoices
 from netbox.config import ConfigItem
@@ -658,6 +657,13 @@ class Device(
         to_field='device'
     )
 
+    # Stored merge of all applicable config contexts (if MATERIALIZE_CONFIG_CONTEXTS is enabled)
+    _config_context = models.JSONField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+
     objects = ConfigContextModelQuerySet.as_manager()
 
     clone_fields = (
@@ -884,43 +890,6 @@ class Device(
                 ).format(virtual_chassis=self.vc_master_for)
             })
 
-    def _instantiate_components(self, queryset, bulk_create=True):
-        """
-        Instantiate components for the device from the specified component templates.
-
-        Args:
-            bulk_create: If True, bulk_create() will be called to create all components in a single query
-                         (default). Otherwise, save() will be called on each instance individually.
-        """
-        model = queryset.model.component_model
-
-        if bulk_create:
-            components = [obj.instantiate(device=self) for obj in queryset]
-            if not components:
-                return
-            # Set default values for any applicable custom fields
-            if cf_defaults := CustomField.objects.get_defaults_for_model(model):
-                for component in components:
-                    component.custom_field_data = cf_defaults
-            model.objects.bulk_create(components)
-            # Manually send the post_save signal for each of the newly created components
-            for component in components:
-                post_save.send(
-                    sender=model,
-                    instance=component,
-                    created=True,
-                    raw=False,
-                    using='default',
-                    update_fields=None
-                )
-        else:
-            for obj in queryset:
-                component = obj.instantiate(device=self)
-                # Set default values for any applicable custom fields
-                if cf_defaults := CustomField.objects.get_defaults_for_model(model):
-                    component.custom_field_data = cf_defaults
-                component.save()
-
     def save(self, *args, **kwargs):
         is_new = not bool(self.pk)
 
@@ -938,22 +907,10 @@ class Device(
 
         super().save(*args, **kwargs)
 
-        # If this is a new Device, instantiate all the related components per the DeviceType definition
-        if is_new:
-            self._instantiate_components(self.device_type.consoleporttemplates.all())
-            self._instantiate_components(self.device_type.consoleserverporttemplates.all())
-            self._instantiate_components(self.device_type.powerporttemplates.all())
-            self._instantiate_components(self.device_type.poweroutlettemplates.all())
-            self._instantiate_components(self.device_type.interfacetemplates.all())
-            self._instantiate_components(self.device_type.rearporttemplates.all())
-            self._instantiate_components(self.device_type.frontporttemplates.all())
-            # Disable bulk_create to accommodate MPTT
-            self._instantiate_components(self.device_type.modulebaytemplates.all(), bulk_create=False)
-            self._instantiate_components(self.device_type.devicebaytemplates.all())
-            # Disable bulk_create to accommodate MPTT
-            self._instantiate_components(self.device_type.inventoryitemtemplates.all(), bulk_create=False)
-            # Interface bridges have to be set after interface instantiation
-            update_interface_bridges(self, self.device_type.interfacetemplates.all())
+        # If this is a new Device, instantiate all the related components per the DeviceType definition (unless
+        # deferred to be instantiated along with those of other new devices)
+        if is_new and not defer_device_components(self):
+            instantiate_device_components([self])
 
         # Update Site and Rack assignment for any child Devices
         devices = Device.objects.filter(parent_bay__device=self)
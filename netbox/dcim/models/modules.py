@@ -12,6 +12,7 @@ from dcim.utils import update_interface_bridges
 from extras.models import ConfigContextModel, CustomField
 from netbox.models import PrimaryModel
 from netbox.models.features import ImageAttachmentsMixin
+from netbox.signals import post_bulk_create
 from netbox.models.mixins import WeightMixin
 from utilities.jsonschema import validate_schema
 from utilities.string import title
@@ -329,16 +330,8 @@ class Module(PrimaryModel, ConfigContextModel):
 
             if component_model is not ModuleBay:
                 component_model.objects.bulk_create(create_instances)
-                # Emit the post_save signal for each newly created object
-                for component in create_instances:
-                    post_save.send(
-                        sender=component_model,
-                        instance=component,
-                        created=True,
-                        raw=False,
-                        using='default',
-                        update_fields=None
-                    )
+                # Emit the post_bulk_create signal for the newly created objects
+                post_bulk_create.send(sender=component_model, instances=create_instances)
             else:
                 # ModuleBays must be saved individually for MPTT
                 for instance in create_instances:
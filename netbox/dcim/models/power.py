@@ -4,6 +4,8 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from dcim.choices import *
+from dcim.power import get_powerfeed_draws, get_powerpanel_draws
+from dcim.querysets import PowerDrawQuerySet
 from netbox.config import ConfigItem
 from netbox.models import PrimaryModel
 from netbox.models.features import ContactsMixin, ImageAttachmentsMixin
@@ -40,6 +42,8 @@ class PowerPanel(ContactsMixin, ImageAttachmentsMixin, PrimaryModel):
         db_collation="natural_sort"
     )
 
+    objects = PowerDrawQuerySet.as_manager()
+
     prerequisite_models = (
         'dcim.Site',
     )
@@ -58,6 +62,17 @@ class PowerPanel(ContactsMixin, ImageAttachmentsMixin, PrimaryModel):
     def __str__(self):
         return self.name
 
+    def get_power_draw(self):
+        """
+        Return the combined allocated and maximum power draw (in VA) of all PowerFeeds of this PowerPanel, along with
+        the total power available from these feeds.
+        """
+        # Return the value retrieved by annotate_power_draws(), if any
+        if hasattr(self, '_power_draw'):
+            return self._power_draw
+
+        return get_powerpanel_draws([self])[self.pk]
+
     def clean(self):
         super().clean()
 
@@ -143,6 +158,8 @@ class PowerFeed(PrimaryModel, PathEndpoint, CabledObjectModel):
         null=True
     )
 
+    objects = PowerDrawQuerySet.as_manager()
+
     clone_fields = (
         'power_panel', 'rack', 'status', 'type', 'mark_connected', 'supply', 'phase', 'voltage', 'amperage',
         'max_utilization', 'tenant',
@@ -165,6 +182,17 @@ class PowerFeed(PrimaryModel, PathEndpoint, CabledObjectModel):
     def __str__(self):
         return self.name
 
+    def get_power_draw(self):
+        """
+        Return the combined allocated and maximum power draw (in VA), child PowerOutlet count, and per-leg aggregates of
+        the PowerPorts connected to this PowerFeed, or None if it is not connected to a PowerPort.
+        """
+        # Return the value retrieved by annotate_power_draws(), if any
+        if hasattr(self, '_power_draw'):
+            return self._power_draw
+
+        return get_powerfeed_draws([self])[self.pk]
+
     def clean(self):
         super().clean()
 
@@ -12,6 +12,8 @@ from django.utils.translation import gettext_lazy as _
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.power import get_powerfeed_draws
+from dcim.querysets import RackQuerySet
 from dcim.svg import RackElevationSVG
 from netbox.choices import ColorChoices
 from netbox.models import OrganizationalModel, PrimaryModel
@@ -20,7 +22,6 @@ from netbox.models.features import ContactsMixin, ImageAttachmentsMixin
 from utilities.conversion import to_grams
 from utilities.data import array_to_string, drange
 from utilities.fields import ColorField
-from .device_components import PowerPort
 from .devices import Device, Module
 from .power import PowerFeed
 
@@ -333,6 +334,8 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         related_query_name='rack'
     )
 
+    objects = RackQuerySet.as_manager()
+
     clone_fields = (
         'site', 'location', 'tenant', 'status', 'role', 'form_factor', 'width', 'airflow', 'u_height', 'desc_units',
         'outer_width', 'outer_height', 'outer_depth', 'outer_unit', 'mounting_depth', 'weight', 'max_weight',
@@ -607,6 +610,10 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         Determine the utilization rate of the rack and return it as a percentage. Occupied and reserved units both count
         as utilized.
         """
+        # Return the value calculated by annotate_rack_utilization(), if any
+        if hasattr(self, '_utilization'):
+            return self._utilization
+
         # Determine unoccupied units
         total_units = len(list(self.units))
         available_units = self.get_available_units(u_height=0.5, ignore_excluded_devices=True)
@@ -626,20 +633,18 @@ class Rack(ContactsMixin, ImageAttachmentsMixin, RackBase):
         """
         Determine the utilization rate of power in the rack and return it as a percentage.
         """
+        # Return the value calculated by annotate_rack_utilization(), if any
+        if hasattr(self, '_power_utilization'):
+            return self._power_utilization
+
         powerfeeds = PowerFeed.objects.filter(rack=self)
         available_power_total = sum(pf.available_power for pf in powerfeeds)
         if not available_power_total:
             return 0
 
-        powerports = []
-        for powerfeed in powerfeeds:
-            powerports.extend([
-                peer for peer in powerfeed.link_peers if isinstance(peer, PowerPort)
-            ])
-
-        allocated_draw = sum([
-            powerport.get_power_draw()['allocated'] for powerport in powerports
-        ])
+        allocated_draw = sum(
+            draw['allocated'] for draw in get_powerfeed_draws(powerfeeds).values() if draw is not None
+        )
 
         return round(allocated_draw / available_power_total * 100, 1)
 
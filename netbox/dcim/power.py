@@ -0,0 +1,256 @@
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+
+from .choices import PowerFeedPhaseChoices, PowerOutletFeedLegChoices
+from .constants import POWER_DRAW_CACHE_TIMEOUT
+
+__all__ = (
+    'annotate_power_draws',
+    'calculate_power_draws',
+    'get_power_draw_cache_key',
+    'get_power_draws',
+    'get_powerfeed_draws',
+    'get_powerpanel_draws',
+    'invalidate_power_draws',
+)
+
+
+def get_power_draw_cache_key(pk):
+    return f'power_draw:{pk}'
+
+
+def _get_opposite_cable_end(cable_end):
+    return 'B' if cable_end == 'A' else 'A'
+
+
+def _sum_power_draws(draws):
+    """
+    Combine the power draws of several PowerPorts (e.g. all those connected to a PowerFeed).
+    """
+    total = {
+        'allocated': 0,
+        'maximum': 0,
+        'outlet_count': 0,
+        'legs': [],
+    }
+    legs = {}
+    for draw in draws:
+        for key in ('allocated', 'maximum', 'outlet_count'):
+            total[key] += draw[key]
+        for leg in draw['legs']:
+            if leg['name'] not in legs:
+                legs[leg['name']] = {**leg}
+                total['legs'].append(legs[leg['name']])
+            else:
+                for key in ('allocated', 'maximum', 'outlet_count'):
+                    legs[leg['name']][key] += leg[key]
+    return total
+
+
+def calculate_power_draws(pks):
+    """
+    Calculate the allocated and maximum power draw (in VA) and child PowerOutlet count of each specified PowerPort,
+    along with the per-leg aggregates for PowerPorts fed by a three-phase PowerFeed. Returns a dictionary mapping each
+    PowerPort ID to its power draw in the form returned by PowerPort.get_power_draw().
+
+    All PowerPorts, their PowerOutlets, and the PowerPorts connected to these outlets are retrieved in bulk, so the
+    number of queries is fixed regardless of the number of PowerPorts.
+    """
+    CableTermination = apps.get_model('dcim', 'CableTermination')
+    PowerFeed = apps.get_model('dcim', 'PowerFeed')
+    PowerOutlet = apps.get_model('dcim', 'PowerOutlet')
+    PowerPort = apps.get_model('dcim', 'PowerPort')
+
+    draws = {}
+    aggregating_ports = {}  # Ports without manually defined draws, mapped to their cable & cable end
+    powerports = PowerPort.objects.filter(pk__in=pks).order_by().values_list(
+        'pk', 'allocated_draw', 'maximum_draw', 'cable_id', 'cable_end'
+    )
+    for pk, allocated_draw, maximum_draw, cable_id, cable_end in powerports:
+        draws[pk] = {
+            'allocated': allocated_draw or 0,
+            'maximum': maximum_draw or 0,
+            'outlet_count': 0,
+            'legs': [],
+        }
+        if allocated_draw is None and maximum_draw is None:
+            aggregating_ports[pk] = (cable_id, cable_end)
+    if not draws:
+        return draws
+
+    # Count the child PowerOutlets of each port, and map the far end of each connected outlet to its port & feed leg
+    outlet_counts = defaultdict(lambda: defaultdict(int))
+    outlet_peers = defaultdict(list)
+    poweroutlets = PowerOutlet.objects.filter(power_port__in=draws).order_by().values_list(
+        'power_port_id', 'feed_leg', 'cable_id', 'cable_end'
+    )
+    for power_port_id, feed_leg, cable_id, cable_end in poweroutlets:
+        draws[power_port_id]['outlet_count'] += 1
+        outlet_counts[power_port_id][feed_leg] += 1
+        if power_port_id in aggregating_ports and cable_id:
+            outlet_peers[(cable_id, _get_opposite_cable_end(cable_end))].append((power_port_id, feed_leg))
+
+    if not aggregating_ports:
+        return draws
+
+    # Identify the ports fed by a three-phase PowerFeed, which is the only link peer of the port
+    link_peers = defaultdict(list)
+    port_cables = {cable_id: pk for pk, (cable_id, cable_end) in aggregating_ports.items() if cable_id}
+    if port_cables:
+        terminations = CableTermination.objects.filter(cable__in=port_cables).order_by().values_list(
+            'cable_id', 'cable_end', 'termination_type__model', 'termination_id'
+        )
+        for cable_id, cable_end, termination_model, termination_id in terminations:
+            pk = port_cables[cable_id]
+            if cable_end != aggregating_ports[pk][1]:
+                link_peers[pk].append((termination_model, termination_id))
+    powerfeeds = {
+        peers[0][1]: pk for pk, peers in link_peers.items() if len(peers) == 1 and peers[0][0] == 'powerfeed'
+    }
+    three_phase_ports = {
+        powerfeeds[powerfeed_id] for powerfeed_id in PowerFeed.objects.filter(
+            pk__in=powerfeeds, phase=PowerFeedPhaseChoices.PHASE_3PHASE
+        ).values_list('pk', flat=True)
+    } if powerfeeds else set()
+
+    # Aggregate the draw of all ports connected to the outlets of each aggregating port (overall and per feed leg)
+    downstream_ports = defaultdict(set)
+    if outlet_peers:
+        peer_ports = PowerPort.objects.filter(cable__in={cable_id for cable_id, _ in outlet_peers}).order_by()
+        for pk, cable_id, cable_end, allocated_draw, maximum_draw in peer_ports.values_list(
+            'pk', 'cable_id', 'cable_end', 'allocated_draw', 'maximum_draw'
+        ):
+            for power_port_id, feed_leg in outlet_peers.get((cable_id, cable_end), []):
+                downstream_ports[(power_port_id, None)].add((pk, allocated_draw or 0, maximum_draw or 0))
+                downstream_ports[(power_port_id, feed_leg)].add((pk, allocated_draw or 0, maximum_draw or 0))
+
+    for pk in aggregating_ports:
+        draws[pk]['allocated'] = sum(port[1] for port in downstream_ports[(pk, None)])
+        draws[pk]['maximum'] = sum(port[2] for port in downstream_ports[(pk, None)])
+        if pk in three_phase_ports:
+            draws[pk]['legs'] = [
+                {
+                    'name': leg_name,
+                    'allocated': sum(port[1] for port in downstream_ports[(pk, leg)]),
+                    'maximum': sum(port[2] for port in downstream_ports[(pk, leg)]),
+                    'outlet_count': outlet_counts[pk][leg],
+                }
+                for leg, leg_name in PowerOutletFeedLegChoices
+            ]
+
+    return draws
+
+
+def get_power_draws(pks):
+    """
+    Return the power draw of each specified PowerPort, keyed by ID. Power draws are retrieved from the cache where
+    possible; any others are calculated in bulk and cached until invalidated by a change to the power topology.
+    """
+    keys = {get_power_draw_cache_key(pk): pk for pk in pks}
+    draws = {keys[key]: draw for key, draw in cache.get_many(keys).items()}
+
+    if missing := [pk for pk in keys.values() if pk not in draws]:
+        calculated = calculate_power_draws(missing)
+        draws.update(calculated)
+        # Draws calculated within a transaction may reflect changes which are later rolled back, so cache them only
+        # if calculated from committed data
+        if calculated and not connection.in_atomic_block:
+            cache.set_many(
+                {get_power_draw_cache_key(pk): draw for pk, draw in calculated.items()},
+                POWER_DRAW_CACHE_TIMEOUT
+            )
+
+    return draws
+
+
+def invalidate_power_draws(pks):
+    """
+    Remove the cached power draws of the specified PowerPorts.
+    """
+    if pks := [pk for pk in pks if pk is not None]:
+        cache.delete_many([get_power_draw_cache_key(pk) for pk in pks])
+
+
+def get_powerfeed_draws(powerfeeds):
+    """
+    Return the combined power draw of the PowerPorts connected to each given PowerFeed, keyed by ID. PowerFeeds which
+    are not connected to a PowerPort map to None.
+    """
+    PowerPort = apps.get_model('dcim', 'PowerPort')
+
+    feed_cable_ends = {
+        powerfeed.cable_id: (powerfeed.pk, powerfeed.cable_end) for powerfeed in powerfeeds if powerfeed.cable_id
+    }
+    powerfeed_ports = defaultdict(list)
+    if feed_cable_ends:
+        powerports = PowerPort.objects.filter(cable__in=feed_cable_ends).order_by().values_list(
+            'pk', 'cable_id', 'cable_end'
+        )
+        for pk, cable_id, cable_end in powerports:
+            powerfeed_id, feed_cable_end = feed_cable_ends[cable_id]
+            if cable_end != feed_cable_end:
+                powerfeed_ports[powerfeed_id].append(pk)
+
+    draws = get_power_draws({pk for pks in powerfeed_ports.values() for pk in pks})
+
+    return {
+        powerfeed.pk: _sum_power_draws(
+            draws[pk] for pk in powerfeed_ports[powerfeed.pk] if pk in draws
+        ) if powerfeed_ports[powerfeed.pk] else None
+        for powerfeed in powerfeeds
+    }
+
+
+def get_powerpanel_draws(powerpanels):
+    """
+    Return the combined allocated and maximum power draw of all PowerFeeds of each given PowerPanel, along with the
+    total power available from these feeds, keyed by ID.
+    """
+    PowerFeed = apps.get_model('dcim', 'PowerFeed')
+
+    powerfeeds = list(PowerFeed.objects.filter(power_panel__in=powerpanels).only(
+        'pk', 'power_panel', 'available_power', 'cable', 'cable_end'
+    ).order_by())
+    powerfeed_draws = get_powerfeed_draws(powerfeeds)
+
+    draws = {
+        powerpanel.pk: {'allocated': 0, 'maximum': 0, 'available': 0} for powerpanel in powerpanels
+    }
+    for powerfeed in powerfeeds:
+        draw = draws[powerfeed.power_panel_id]
+        draw['available'] += powerfeed.available_power
+        if powerfeed_draw := powerfeed_draws[powerfeed.pk]:
+            draw['allocated'] += powerfeed_draw['allocated']
+            draw['maximum'] += powerfeed_draw['maximum']
+
+    return draws
+
+
+def annotate_power_draws(instances):
+    """
+    Retrieve the power draws of many PowerPorts, PowerFeeds, or PowerPanels at once, caching the result on each
+    instance for use by get_power_draw().
+
+    :param instances: An iterable of PowerPort, PowerFeed, or PowerPanel instances (all of the same type)
+    """
+    instances = [
+        instance for instance in instances if instance.pk is not None and not hasattr(instance, '_power_draw')
+    ]
+    if not instances:
+        return
+
+    model_name = instances[0]._meta.model_name
+    if model_name == 'powerport':
+        draws = get_power_draws([instance.pk for instance in instances])
+    elif model_name == 'powerfeed':
+        draws = get_powerfeed_draws(instances)
+    elif model_name == 'powerpanel':
+        draws = get_powerpanel_draws(instances)
+    else:
+        raise TypeError(f"Cannot calculate the power draw of {instances[0]._meta.verbose_name_plural}")
+
+    for instance in instances:
+        instance._power_draw = draws.get(instance.pk)
@@ -0,0 +1,62 @@
+from django.db.models.query import ModelIterable
+
+from utilities.querysets import RestrictedQuerySet
+
+__all__ = (
+    'PowerDrawQuerySet',
+    'RackQuerySet',
+)
+
+
+class PowerDrawQuerySet(RestrictedQuerySet):
+    """
+    QuerySet for PowerFeeds and PowerPanels.
+    """
+    _annotate_power_draw = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._annotate_power_draw = self._annotate_power_draw
+        return clone
+
+    def _fetch_all(self):
+        annotate = self._result_cache is None and self._annotate_power_draw
+        super()._fetch_all()
+        if annotate and self._iterable_class is ModelIterable:
+            from .power import annotate_power_draws
+            annotate_power_draws(self._result_cache)
+
+    def annotate_power_draw(self):
+        """
+        Retrieve the power draw of all objects in bulk when the QuerySet is evaluated, rather than once per object when
+        calling get_power_draw().
+        """
+        clone = self._chain()
+        clone._annotate_power_draw = True
+        return clone
+
+
+class RackQuerySet(RestrictedQuerySet):
+    _annotate_utilization = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._annotate_utilization = self._annotate_utilization
+        return clone
+
+    def _fetch_all(self):
+        annotate = self._result_cache is None and self._annotate_utilization
+        super()._fetch_all()
+        if annotate and self._iterable_class is ModelIterable:
+            from .utils import annotate_rack_utilization
+            annotate_rack_utilization(self._result_cache)
+
+    def annotate_utilization(self):
+        """
+        Calculate the space and power utilization of all Racks in bulk when the QuerySet is evaluated, rather than once
+        per Rack when calling get_utilization() and get_power_utilization(). Only the Racks actually retrieved (e.g. a
+        single page) are considered.
+        """
+        clone = self._chain()
+        clone._annotate_utilization = True
+        return clone
@@ -1,14 +1,21 @@
 import logging
+from functools import partial
 
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 
+from netbox.signals import post_bulk_create
+
 from .choices import CableEndChoices, LinkStatusChoices
 from .models import (
-    Cable, CablePath, CableTermination, Device, FrontPort, PathEndpoint, PowerPanel, Rack, Location, VirtualChassis,
+    Cable, CablePath, CableTermination, Device, DeviceBay, DeviceRole, DeviceType, FrontPort, Manufacturer,
+    PathEndpoint, PowerFeed, PowerOutlet, PowerPanel, PowerPort, Rack, RackReservation, Location, VirtualChassis,
 )
 from .models.cables import trace_paths
-from .utils import create_cablepath, rebuild_paths
+from .power import invalidate_power_draws
+from .utils import create_cablepath, invalidate_rack_elevations, rebuild_paths
 
 
 #
@@ -113,8 +120,7 @@ def retrace_cable_paths(instance, **kwargs):
     """
     When a Cable is deleted, check for and update its connected endpoints
     """
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance):
-        cablepath.retrace()
+    rebuild_paths([instance])
 
 
 @receiver(post_delete, sender=CableTermination)
@@ -138,6 +144,131 @@ def extend_rearport_cable_paths(instance, created, raw, **kwargs):
     When a new FrontPort is created, add it to any CablePaths which end at its corresponding RearPort.
     """
     if created and not raw:
-        rearport = instance.rear_port
-        for cablepath in CablePath.objects.filter(_nodes__contains=rearport):
-            cablepath.retrace()
+        rebuild_paths([instance.rear_port])
+
+
+@receiver(post_bulk_create, sender=FrontPort)
+def extend_bulk_rearport_cable_paths(instances, **kwargs):
+    """
+    When FrontPorts are created in bulk, add them to any CablePaths which end at their corresponding RearPorts.
+    """
+    rebuild_paths([instance.rear_port for instance in instances])
+
+
+#
+# Power draw
+#
+
+def _invalidate_power_draws(pks):
+    invalidate_power_draws(pks)
+    transaction.on_commit(partial(invalidate_power_draws, pks))
+
+
+@receiver((post_save, post_delete), sender=PowerPort)
+def invalidate_powerport_power_draw(instance, **kwargs):
+    """
+    Invalidate the cached power draw of a PowerPort and of any PowerPort feeding it via a PowerOutlet.
+    """
+    pks = {instance.pk}
+    if instance.cable_id:
+        pks.update(PowerOutlet.objects.filter(cable=instance.cable_id).values_list('power_port_id', flat=True))
+    _invalidate_power_draws(pks)
+
+
+@receiver((post_save, post_delete), sender=PowerOutlet)
+def invalidate_poweroutlet_power_draw(instance, **kwargs):
+    """
+    Invalidate the cached power draw of a PowerOutlet's current and prior PowerPort.
+    """
+    pks = {instance.power_port_id}
+    if snapshot := getattr(instance, '_prechange_snapshot', None):
+        pks.add(snapshot.get('power_port'))
+    _invalidate_power_draws(pks)
+
+
+@receiver(post_bulk_create, sender=PowerOutlet)
+def invalidate_bulk_poweroutlet_power_draw(instances, **kwargs):
+    """
+    Invalidate the cached power draws of the PowerPorts of PowerOutlets created in bulk.
+    """
+    _invalidate_power_draws({instance.power_port_id for instance in instances})
+
+
+@receiver(post_save, sender=PowerFeed)
+def invalidate_powerfeed_power_draw(instance, created, **kwargs):
+    """
+    Invalidate the cached power draw of any PowerPort connected to a PowerFeed (which depends on its phase).
+    """
+    if not created and instance.cable_id:
+        _invalidate_power_draws(set(PowerPort.objects.filter(cable=instance.cable_id).values_list('pk', flat=True)))
+
+
+@receiver(post_delete, sender=CableTermination)
+def invalidate_cabletermination_power_draw(instance, **kwargs):
+    """
+    Invalidate the cached power draws affected by the removal of a PowerPort or PowerOutlet from a Cable.
+    """
+    termination_type = ContentType.objects.get_for_id(instance.termination_type_id)
+    if termination_type.model == 'powerport':
+        pks = {instance.termination_id}
+        pks.update(PowerOutlet.objects.filter(cable=instance.cable_id).values_list('power_port_id', flat=True))
+    elif termination_type.model == 'poweroutlet':
+        pks = set(PowerOutlet.objects.filter(pk=instance.termination_id).values_list('power_port_id', flat=True))
+    else:
+        return
+    _invalidate_power_draws(pks)
+
+
+#
+# Rack elevations
+#
+
+def _invalidate_rack_elevations(rack_ids):
+    invalidate_rack_elevations(rack_ids)
+    transaction.on_commit(partial(invalidate_rack_elevations, rack_ids))
+
+
+@receiver((post_save, post_delete), sender=Rack)
+def invalidate_rack_elevation(instance, **kwargs):
+    """
+    Invalidate the cached elevations of a Rack when it is modified.
+    """
+    _invalidate_rack_elevations({instance.pk})
+
+
+@receiver((post_save, post_delete), sender=Device)
+@receiver((post_save, post_delete), sender=RackReservation)
+def invalidate_rack_object_elevation(instance, **kwargs):
+    """
+    Invalidate the cached elevations of the current and prior Rack of a Device or RackReservation.
+    """
+    rack_ids = {instance.rack_id}
+    if snapshot := getattr(instance, '_prechange_snapshot', None):
+        rack_ids.add(snapshot.get('rack'))
+    _invalidate_rack_elevations(rack_ids)
+
+
+@receiver((post_save, post_delete), sender=DeviceBay)
+def invalidate_devicebay_elevation(instance, **kwargs):
+    """
+    Invalidate the cached elevations of the Rack holding a parent Device, whose rendering reflects its child Devices.
+    """
+    _invalidate_rack_elevations(set(Device.objects.filter(pk=instance.device_id).values_list('rack_id', flat=True)))
+
+
+@receiver(post_save, sender=DeviceType)
+@receiver(post_save, sender=DeviceRole)
+@receiver(post_save, sender=Manufacturer)
+def invalidate_device_attribute_elevations(sender, instance, created, **kwargs):
+    """
+    Invalidate the cached elevations of all Racks holding Devices of a modified DeviceType, DeviceRole, or Manufacturer.
+    """
+    if created:
+        return
+    lookup = {
+        DeviceType: 'device_type',
+        DeviceRole: 'role',
+        Manufacturer: 'device_type__manufacturer',
+    }[sender]
+    rack_ids = Device.objects.filter(**{lookup: instance, 'rack__isnull': False}).values_list('rack_id', flat=True)
+    _invalidate_rack_elevations(set(rack_ids))
@@ -1,4 +1,5 @@
 import decimal
+import hashlib
 import svgwrite
 from svgwrite.container import Hyperlink
 from svgwrite.image import Image
@@ -7,7 +8,9 @@ from svgwrite.shapes import Rect
 from svgwrite.text import Text
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import FieldError
+from django.db import connection
 from django.db.models import Q
 from django.template.defaultfilters import floatformat
 from django.urls import reverse
@@ -16,7 +19,8 @@ from django.utils.http import urlencode
 from netbox.config import get_config
 from utilities.data import array_to_ranges
 from utilities.html import foreground_color
-from dcim.constants import RACK_ELEVATION_BORDER_WIDTH
+from dcim.constants import RACK_ELEVATION_BORDER_WIDTH, RACK_ELEVATION_CACHE_TIMEOUT
+from dcim.utils import get_rack_elevation_version
 
 
 __all__ = (
@@ -101,6 +105,7 @@ class RackElevationSVG:
         self.permitted_device_ids = permitted_devices.values_list('pk', flat=True)
 
         # Determine device(s) to highlight within the elevation (if any)
+        self.highlight_params = [tuple(param) for param in highlight_params or []]
         self.highlight_devices = []
         if highlight_params:
             q = Q()
@@ -323,6 +328,51 @@ class RackElevationSVG:
                 # Devices which the user does not have permission to view are rendered only as unavailable space
                 self.drawing.add(Rect(device_coords, device_size, class_='blocked'))
 
+    def get_cache_key(self, face):
+        """
+        Return the key under which the rendered elevation of the specified rack face is cached. The key reflects the
+        current version of the rack's contents, the drawing parameters, and the set of devices viewable by the user.
+        """
+        params = (
+            settings.RELEASE.full_version,
+            face,
+            self.unit_width,
+            self.unit_height,
+            self.legend_width,
+            self.margin_width,
+            self.include_images,
+            self.base_url,
+            sorted(self.highlight_params),
+            sorted(self.permitted_device_ids),
+        )
+        digest = hashlib.sha256(repr(params).encode()).hexdigest()
+        version = get_rack_elevation_version(self.rack.pk)
+
+        return f'rack_elevation:{self.rack.pk}:{version}:{digest}'
+
+    def get_etag(self, face):
+        """
+        Return an entity tag identifying the rendered elevation of the specified rack face.
+        """
+        return '"{}"'.format(hashlib.sha256(self.get_cache_key(face).encode()).hexdigest()[:32])
+
+    def render_cached(self, face):
+        """
+        Return an SVG document representing a rack elevation as a string, retrieving it from the cache if possible.
+        """
+        cache_key = self.get_cache_key(face)
+        if (svg := cache.get(cache_key)) is not None:
+            return svg
+
+        svg = self.render(face).tostring()
+
+        # An elevation rendered within a transaction may reflect changes which are later rolled back, so cache it only
+        # if rendered from committed data
+        if not connection.in_atomic_block:
+            cache.set(cache_key, svg, RACK_ELEVATION_CACHE_TIMEOUT)
+
+        return svg
+
     def render(self, face):
         """
         Return an SVG document representing a rack elevation.
@@ -3,6 +3,7 @@ import django_tables2 as tables
 from django_tables2.utils import Accessor
 
 from dcim.models import Rack, RackReservation, RackRole, RackType
+from dcim.utils import annotate_rack_utilization
 from netbox.tables import NetBoxTable, columns
 from tenancy.tables import ContactsColumnMixin, TenancyColumnsMixin
 from .template_code import OUTER_UNIT, WEIGHT
@@ -200,6 +201,15 @@ class RackTable(TenancyColumnsMixin, ContactsColumnMixin, NetBoxTable):
             'device_count', 'get_utilization',
         )
 
+    def paginate(self, *args, **kwargs):
+        super().paginate(*args, **kwargs)
+
+        # Calculate utilization for all racks on the current page at once
+        if any(
+            name in self.columns and self.columns[name].visible for name in ('get_utilization', 'get_power_utilization')
+        ):
+            annotate_rack_utilization(self.page.object_list.data)
+
 
 #
 # Rack reservations
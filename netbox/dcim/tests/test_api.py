@@ -1,6 +1,10 @@
+import io
 import json
+import tarfile
 
+from django.db import connection
 from django.test import override_settings, tag
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext as _
 from rest_framework import status
@@ -462,6 +466,29 @@ class RackTest(APIViewTestCases.APIViewTestCase):
         self.assertHttpStatus(response, status.HTTP_200_OK)
         self.assertEqual(response.get('Content-Type'), 'image/svg+xml')
 
+    def test_get_rack_elevation_svg_conditional(self):
+        """
+        GET a single rack elevation in SVG format, specifying the ETag of a previous response.
+        """
+        rack = Rack.objects.first()
+        self.add_permissions('dcim.view_rack')
+        url = '{}?render=svg'.format(reverse('dcim-api:rack-elevation', kwargs={'pk': rack.pk}))
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        etag = response.get('ETag')
+        self.assertIsNotNone(etag)
+
+        # The elevation has not changed
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+
+        # Installing a device in the rack changes the elevation
+        create_test_device('Device 1', site=rack.site, rack=rack, position=1, face=DeviceFaceChoices.FACE_FRONT)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotEqual(response.get('ETag'), etag)
+
 
 class RackReservationTest(APIViewTestCases.APIViewTestCase):
     model = RackReservation
@@ -1455,6 +1482,39 @@ class DeviceTest(APIViewTestCases.APIViewTestCase):
 
         self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
 
+    def test_bulk_create_components(self):
+        """
+        Check that the components of devices created in bulk are instantiated together, retrieving the component
+        templates of each device type only once.
+        """
+        device_type = DeviceType.objects.get(slug='device-type-2')
+        interface_template = InterfaceTemplate.objects.create(
+            device_type=device_type, name='Interface 1', type=InterfaceTypeChoices.TYPE_1GE_FIXED
+        )
+        InterfaceTemplate.objects.create(
+            device_type=device_type, name='Interface 2', type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+            bridge=interface_template
+        )
+        InventoryItemTemplate.objects.create(device_type=device_type, name='Inventory Item 1')
+
+        self.add_permissions('dcim.add_device')
+        url = reverse('dcim-api:device-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, self.create_data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(
+            len([q for q in queries if q['sql'].startswith('SELECT') and 'FROM "dcim_interfacetemplate"' in q['sql']]),
+            1
+        )
+
+        for device in Device.objects.filter(pk__in=[d['id'] for d in response.data]):
+            self.assertEqual(device.interface_count, 2)
+            self.assertEqual(device.inventory_item_count, 1)
+            self.assertEqual(
+                Interface.objects.get(device=device, name='Interface 2').bridge,
+                Interface.objects.get(device=device, name='Interface 1')
+            )
+
     def test_render_config(self):
         configtemplate = ConfigTemplate.objects.create(
             name='Config Template 1',
@@ -1471,6 +1531,48 @@ class DeviceTest(APIViewTestCases.APIViewTestCase):
         self.assertHttpStatus(response, status.HTTP_200_OK)
         self.assertEqual(response.data['content'], f'Config for device {device.name}')
 
+    @override_settings(RENDER_CONFIG_WORKERS=1)
+    def test_render_configs(self):
+        configtemplate = ConfigTemplate.objects.create(
+            name='Config Template 1',
+            template_code='Config for device {{ device.name }}',
+            file_extension='txt'
+        )
+
+        devices = list(Device.objects.all()[:2])
+        for device in devices:
+            device.config_template = configtemplate
+            device.save()
+
+        self.add_permissions('dcim.add_device')
+        url = reverse('dcim-api:device-list') + f'render-configs/?id={devices[0].pk}&id={devices[1].pk}'
+
+        # Render as newline-delimited JSON
+        response = self.client.post(url, {}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        results = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(
+            sorted(result['content'] for result in results),
+            sorted(f'Config for device {device.name}' for device in devices)
+        )
+
+        # Render as a tar archive
+        response = self.client.post(f'{url}&format=tar', {}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        with tarfile.open(fileobj=io.BytesIO(b''.join(response.streaming_content))) as tar:
+            self.assertEqual(sorted(tar.getnames()), sorted(f'{device.name}.txt' for device in devices))
+            member = tar.extractfile(f'{devices[0].name}.txt')
+            self.assertEqual(member.read().decode(), f'Config for device {devices[0].name}')
+
+        # A false value for the background flag renders the configurations inline
+        response = self.client.post(f'{url}&background=false', {}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), len(devices))
+
+        # An invalid value for the background flag is rejected
+        response = self.client.post(f'{url}&background=foo', {}, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
 
 class ModuleTest(APIViewTestCases.APIViewTestCase):
     model = Module
@@ -4,7 +4,7 @@ from circuits.models import *
 from dcim.choices import LinkStatusChoices
 from dcim.models import *
 from dcim.svg import CableTraceSVG
-from dcim.utils import object_to_path_node
+from dcim.utils import create_cablepaths, object_to_path_node
 from utilities.exceptions import AbortRequest
 
 
@@ -17,6 +17,7 @@ class CablePathTestCase(TestCase):
         2XX: Test different cable topologies
         3XX: Test responses to changes in existing objects
         4XX: Test to exclude specific cable topologies
+        5XX: Test bulk tracing of paths
     """
     @classmethod
     def setUpTestData(cls):
@@ -2421,6 +2422,136 @@ class CablePathTestCase(TestCase):
             is_active=True
         )
 
+    def test_304_extend_paths_via_existing_multiposition_rear_ports(self):
+        """
+        [IF1] --C1-- [FP1:1] [RP1] --C3-- [RP2] [FP2:1] --C4-- [IF3]
+        [IF2] --C2-- [FP1:2]                    [FP2:2] --C5-- [IF4]
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        interface3 = Interface.objects.create(device=self.device, name='Interface 3')
+        interface4 = Interface.objects.create(device=self.device, name='Interface 4')
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=2)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=2)
+        frontport1_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:1', rear_port=rearport1, rear_port_position=1
+        )
+        frontport1_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:2', rear_port=rearport1, rear_port_position=2
+        )
+        frontport2_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2:1', rear_port=rearport2, rear_port_position=1
+        )
+        frontport2_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2:2', rear_port=rearport2, rear_port_position=2
+        )
+
+        # Create cables 1-3
+        cable1 = Cable(a_terminations=[interface1], b_terminations=[frontport1_1])
+        cable1.save()
+        cable2 = Cable(a_terminations=[interface2], b_terminations=[frontport1_2])
+        cable2.save()
+        cable3 = Cable(a_terminations=[rearport1], b_terminations=[rearport2], status=LinkStatusChoices.STATUS_PLANNED)
+        cable3.save()
+        path1 = self.assertPathExists(
+            (interface1, cable1, frontport1_1, rearport1, cable3, rearport2, frontport2_1),
+            is_complete=False,
+            is_active=False
+        )
+        path2 = self.assertPathExists(
+            (interface2, cable2, frontport1_2, rearport1, cable3, rearport2, frontport2_2),
+            is_complete=False,
+            is_active=False
+        )
+        self.assertEqual(CablePath.objects.count(), 2)
+
+        # Create cables 4 and 5; existing paths should be extended in place
+        cable4 = Cable(a_terminations=[frontport2_1], b_terminations=[interface3])
+        cable4.save()
+        cable5 = Cable(a_terminations=[frontport2_2], b_terminations=[interface4])
+        cable5.save()
+        self.assertEqual(
+            self.assertPathExists(
+                (interface1, cable1, frontport1_1, rearport1, cable3, rearport2, frontport2_1, cable4, interface3),
+                is_complete=True,
+                is_active=False
+            ).pk,
+            path1.pk
+        )
+        self.assertEqual(
+            self.assertPathExists(
+                (interface2, cable2, frontport1_2, rearport1, cable3, rearport2, frontport2_2, cable5, interface4),
+                is_complete=True,
+                is_active=False
+            ).pk,
+            path2.pk
+        )
+        self.assertEqual(CablePath.objects.count(), 4)
+
+        # Change cable 3's status to "connected"
+        cable3 = Cable.objects.get(pk=cable3.pk)
+        cable3.status = LinkStatusChoices.STATUS_CONNECTED
+        cable3.save()
+        self.assertPathExists(
+            (interface1, cable1, frontport1_1, rearport1, cable3, rearport2, frontport2_1, cable4, interface3),
+            is_complete=True,
+            is_active=True
+        )
+        self.assertPathExists(
+            (interface4, cable5, frontport2_2, rearport2, cable3, rearport1, frontport1_2, cable2, interface2),
+            is_complete=True,
+            is_active=True
+        )
+        self.assertEqual(CablePath.objects.count(), 4)
+
+    def test_305_retrace_from_asymmetric_prefix(self):
+        """
+        [IF1] --C1-- [FP1] [RP1] --C2-- [RP3] [FP3] --C3-- [IF2]
+                     [FP2] [RP2]
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=1)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=1)
+        rearport3 = RearPort.objects.create(device=self.device, name='Rear Port 3', positions=1)
+        frontport1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1', rear_port=rearport1, rear_port_position=1
+        )
+        frontport2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2', rear_port=rearport2, rear_port_position=1
+        )
+        frontport3 = FrontPort.objects.create(
+            device=self.device, name='Front Port 3', rear_port=rearport3, rear_port_position=1
+        )
+
+        # Create cables 1-3
+        cable1 = Cable(a_terminations=[interface1], b_terminations=[frontport1, frontport2])
+        cable1.save()
+        cable2 = Cable(a_terminations=[rearport1], b_terminations=[rearport3])
+        cable2.save()
+        cable3 = Cable(a_terminations=[frontport3], b_terminations=[interface2])
+        cable3.save()
+        path = self.assertPathExists(
+            (
+                interface1, cable1, (frontport1, frontport2), (rearport1, rearport2), cable2, rearport3, frontport3,
+                cable3, interface2,
+            ),
+            is_split=True
+        )
+
+        # Retracing from cable 3 must retain the split status of the preceding asymmetric hop
+        Cable.objects.filter(pk=cable3.pk).update(status=LinkStatusChoices.STATUS_PLANNED)
+        path.retrace_from({object_to_path_node(cable3)})
+        expected = CablePath.objects.get(pk=path.pk)
+        expected.retrace()
+        path.refresh_from_db()
+        self.assertEqual(path.path, expected.path)
+        self.assertEqual(path.is_complete, expected.is_complete)
+        self.assertEqual(path.is_active, expected.is_active)
+        self.assertEqual(path.is_split, expected.is_split)
+        self.assertTrue(path.is_split)
+        self.assertFalse(path.is_active)
+
     def test_401_exclude_midspan_devices(self):
         """
         [IF1] --C1-- [FP1][Test Device][RP1] --C2-- [RP2][Test Device][FP2] --C3-- [IF2]
@@ -2510,3 +2641,68 @@ class CablePathTestCase(TestCase):
             is_active=True
         )
         self.assertEqual(CablePath.objects.count(), 0)
+
+    def test_501_bulk_trace_matches_individual_trace(self):
+        """
+        [IF1] --C1-- [FP1:1] [RP1] --C3-- [RP2] [FP2:1] --C4-- [IF3]
+        [IF2] --C2-- [FP1:2]                    [FP2:2] --C5-- [CT1] [CT2] --> Site
+        [IF4] --C6-- [CT3] [CT4] --> Provider Network
+        [IF5] --C7-- [IF6]
+                     [IF7]
+        [IF8]
+        """
+        interfaces = [
+            Interface.objects.create(device=self.device, name=f'Interface {i}') for i in range(1, 9)
+        ]
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=2)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=2)
+        frontport1_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:1', rear_port=rearport1, rear_port_position=1
+        )
+        frontport1_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1:2', rear_port=rearport1, rear_port_position=2
+        )
+        frontport2_1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2:1', rear_port=rearport2, rear_port_position=1
+        )
+        frontport2_2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2:2', rear_port=rearport2, rear_port_position=2
+        )
+        providernetwork = ProviderNetwork.objects.create(name='Provider Network 1', provider=self.circuit.provider)
+        circuit2 = Circuit.objects.create(provider=self.circuit.provider, type=self.circuit.type, cid='Circuit 2')
+        circuittermination1 = CircuitTermination.objects.create(
+            circuit=self.circuit, termination=self.site, term_side='A'
+        )
+        CircuitTermination.objects.create(circuit=self.circuit, termination=self.site, term_side='Z')
+        circuittermination3 = CircuitTermination.objects.create(circuit=circuit2, termination=self.site, term_side='A')
+        CircuitTermination.objects.create(circuit=circuit2, termination=providernetwork, term_side='Z')
+
+        for a_terminations, b_terminations, status in (
+            ([interfaces[0]], [frontport1_1], LinkStatusChoices.STATUS_CONNECTED),
+            ([interfaces[1]], [frontport1_2], LinkStatusChoices.STATUS_CONNECTED),
+            ([rearport1], [rearport2], LinkStatusChoices.STATUS_PLANNED),
+            ([frontport2_1], [interfaces[2]], LinkStatusChoices.STATUS_CONNECTED),
+            ([frontport2_2], [circuittermination1], LinkStatusChoices.STATUS_CONNECTED),
+            ([interfaces[3]], [circuittermination3], LinkStatusChoices.STATUS_CONNECTED),
+            ([interfaces[4]], [interfaces[5], interfaces[6]], LinkStatusChoices.STATUS_CONNECTED),
+        ):
+            Cable(a_terminations=a_terminations, b_terminations=b_terminations, status=status).save()
+
+        # Record the paths traced individually, then delete them and trace all origins in bulk
+        origins = [Interface.objects.get(pk=interface.pk) for interface in interfaces]
+        expected = {}
+        for origin in origins:
+            if cp := CablePath.from_origin([origin]):
+                expected[origin.pk] = (cp.path, cp.is_complete, cp.is_active, cp.is_split)
+        self.assertEqual(len(expected), 7)
+        CablePath.objects.all().delete()
+
+        create_cablepaths([[origin] for origin in origins])
+        self.assertEqual(CablePath.objects.count(), 7)
+        for origin in origins:
+            origin.refresh_from_db()
+            if origin.pk not in expected:
+                self.assertPathIsNotSet(origin)
+                continue
+            cp = origin._path
+            self.assertEqual((cp.path, cp.is_complete, cp.is_active, cp.is_split), expected[origin.pk])
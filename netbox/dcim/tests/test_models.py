@@ -1,13 +1,22 @@
 from django.core.exceptions import ValidationError
+from unittest.mock import patch
+
+from django.db import connection
 from django.test import tag, TestCase
+from django.test.utils import CaptureQueriesContext
 
 from circuits.models import *
 from core.models import ObjectType
 from dcim.choices import *
+from dcim.constants import RACK_ELEVATION_DEFAULT_LEGEND_WIDTH, RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
 from dcim.models import *
+from dcim.power import invalidate_power_draws
+from dcim.svg import RackElevationSVG
+from dcim.utils import instantiate_device_components, invalidate_rack_elevations
 from extras.models import CustomField
 from netbox.choices import WeightUnitChoices
 from tenancy.models import Tenant
+from users.models import User
 from utilities.data import drange
 from virtualization.models import Cluster, ClusterType
 
@@ -368,6 +377,84 @@ class RackTestCase(TestCase):
         rack.refresh_from_db()
         self.assertEqual(rack.get_utilization(), 1 / 42 * 100)
 
+    def test_annotate_utilization(self):
+        site = Site.objects.first()
+        rack = Rack.objects.first()
+        role = DeviceRole.objects.first()
+        device_types = DeviceType.objects.order_by('model')
+
+        # Occupy 3.5U with devices and reserve another 2U
+        devices = (
+            Device(name='Device 1', role=role, device_type=device_types[0], site=site, rack=rack, position=1),
+            Device(name='Device 2', role=role, device_type=device_types[0], site=site, rack=rack, position=2),
+            Device(name='Device 3', role=role, device_type=device_types[0], site=site, rack=rack, position=3),
+            Device(name='Device 4', role=role, device_type=device_types[2], site=site, rack=rack, position=20),
+        )
+        for device in devices:
+            device.save()
+        RackReservation.objects.create(rack=rack, units=[10, 11], user=User.objects.create(username='User 1'))
+
+        # Connect two power feeds to a power port with an allocated draw, and to a power port without which feeds
+        # another power port via a power outlet
+        powerpanel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        powerfeeds = (
+            PowerFeed.objects.create(power_panel=powerpanel, rack=rack, name='Power Feed 1'),
+            PowerFeed.objects.create(power_panel=powerpanel, rack=rack, name='Power Feed 2'),
+        )
+        powerports = (
+            PowerPort.objects.create(device=devices[0], name='Power Port 1', allocated_draw=100, maximum_draw=200),
+            PowerPort.objects.create(device=devices[1], name='Power Port 2'),
+            PowerPort.objects.create(device=devices[2], name='Power Port 3', allocated_draw=50, maximum_draw=100),
+        )
+        poweroutlet = PowerOutlet.objects.create(device=devices[1], name='Power Outlet 1', power_port=powerports[1])
+        Cable(a_terminations=[powerfeeds[0]], b_terminations=[powerports[0]]).save()
+        Cable(a_terminations=[powerfeeds[1]], b_terminations=[powerports[1]]).save()
+        Cable(a_terminations=[poweroutlet], b_terminations=[powerports[2]]).save()
+
+        rack = Rack.objects.get(pk=rack.pk)
+        self.assertEqual(rack.get_utilization(), 5.5 / 42 * 100)
+        self.assertEqual(rack.get_power_utilization(), round(150 / 2880 * 100, 1))
+
+        # Calculate utilization in bulk
+        racks = list(Rack.objects.annotate_utilization())
+        self.assertEqual(racks[0]._utilization, rack.get_utilization())
+        self.assertEqual(racks[0]._power_utilization, rack.get_power_utilization())
+        with self.assertNumQueries(0):
+            racks[0].get_utilization()
+            racks[0].get_power_utilization()
+
+    def test_elevation_svg_cache(self):
+        rack = Rack.objects.first()
+        self.addCleanup(invalidate_rack_elevations, [rack.pk])
+
+        def render_elevation():
+            elevation = RackElevationSVG(
+                rack,
+                legend_width=RACK_ELEVATION_DEFAULT_LEGEND_WIDTH,
+                margin_width=RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
+            )
+            return elevation.render_cached(DeviceFaceChoices.FACE_FRONT)
+
+        # Cache rendered elevations even though each test runs within a transaction
+        with patch('dcim.svg.racks.connection', in_atomic_block=False):
+            svg = render_elevation()
+
+            # Only the devices in the rack are retrieved to render the elevation again
+            with self.assertNumQueries(1):
+                self.assertEqual(render_elevation(), svg)
+
+            # Installing a device in the rack invalidates the cached elevation
+            Device.objects.create(
+                name='Device 1',
+                role=DeviceRole.objects.first(),
+                device_type=DeviceType.objects.first(),
+                site=rack.site,
+                rack=rack,
+                position=1,
+                face=DeviceFaceChoices.FACE_FRONT
+            )
+            self.assertNotEqual(render_elevation(), svg)
+
 
 class DeviceTestCase(TestCase):
 
@@ -551,6 +638,73 @@ class DeviceTestCase(TestCase):
         )
         self.assertEqual(inventoryitem.cf['cf1'], 'foo')
 
+    def test_instantiate_device_components(self):
+        """
+        Check that the components of many Devices are instantiated in bulk, with a fixed number of queries.
+        """
+        device_type = DeviceType.objects.first()
+        interface_template = InterfaceTemplate.objects.get(device_type=device_type)
+        InterfaceTemplate.objects.create(
+            device_type=device_type,
+            name='Interface 2',
+            type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+            bridge=interface_template
+        )
+        parent_item_template = InventoryItemTemplate.objects.get(device_type=device_type)
+        InventoryItemTemplate.objects.create(
+            device_type=device_type,
+            parent=parent_item_template,
+            name='Inventory Item 2',
+            component=interface_template
+        )
+        InventoryItemTemplate.objects.create(device_type=device_type, name='Inventory Item 3')
+
+        def create_devices(names):
+            devices = Device.objects.bulk_create([
+                Device(
+                    site=Site.objects.first(),
+                    device_type=device_type,
+                    role=DeviceRole.objects.first(),
+                    name=name
+                ) for name in names
+            ])
+            with CaptureQueriesContext(connection) as queries:
+                instantiate_device_components(devices)
+            return devices, len(queries)
+
+        devices, query_count = create_devices(['Test Device 1', 'Test Device 2', 'Test Device 3'])
+        self.assertEqual(create_devices(['Test Device 4'])[1], query_count)
+
+        for device in devices:
+            device.refresh_from_db()
+            self.assertEqual(device.interface_count, 2)
+            self.assertEqual(device.front_port_count, 1)
+            self.assertEqual(device.module_bay_count, 1)
+            self.assertEqual(device.inventory_item_count, 3)
+
+            # Check component references
+            interface1 = Interface.objects.get(device=device, name='Interface 1')
+            self.assertEqual(Interface.objects.get(device=device, name='Interface 2').bridge, interface1)
+            self.assertEqual(PowerOutlet.objects.get(device=device).power_port.device, device)
+            self.assertEqual(FrontPort.objects.get(device=device).rear_port.device, device)
+
+            # Check the InventoryItem tree
+            item1 = InventoryItem.objects.get(device=device, name='Inventory Item 1')
+            item2 = InventoryItem.objects.get(device=device, name='Inventory Item 2')
+            self.assertEqual(item2.parent, item1)
+            self.assertEqual(item2.component, interface1)
+            self.assertEqual(list(item1.get_descendants()), [item2])
+            self.assertEqual(item1.cf['cf1'], 'foo')
+
+        # Each ModuleBay and each root InventoryItem forms its own tree
+        self.assertEqual(
+            len(set(ModuleBay.objects.values_list('tree_id', flat=True))), ModuleBay.objects.count()
+        )
+        self.assertEqual(
+            len(set(InventoryItem.objects.filter(parent__isnull=True).values_list('tree_id', flat=True))),
+            InventoryItem.objects.filter(parent__isnull=True).count()
+        )
+
     def test_multiple_unnamed_devices(self):
 
         device1 = Device(
@@ -796,6 +950,127 @@ class ModuleBayTestCase(TestCase):
         pass
 
 
+class PowerDrawTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        devices = (
+            Device(name='PDU 1', device_type=device_type, role=role, site=site),
+            Device(name='Device 1', device_type=device_type, role=role, site=site),
+            Device(name='Device 2', device_type=device_type, role=role, site=site),
+        )
+        Device.objects.bulk_create(devices)
+
+        cls.powerpanel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        cls.powerfeeds = (
+            PowerFeed.objects.create(
+                power_panel=cls.powerpanel, name='Power Feed 1', phase=PowerFeedPhaseChoices.PHASE_3PHASE
+            ),
+            PowerFeed.objects.create(power_panel=cls.powerpanel, name='Power Feed 2'),
+        )
+
+        # A PDU fed by a three-phase power feed supplies two devices via outlets on legs A and B
+        cls.powerports = (
+            PowerPort.objects.create(device=devices[0], name='Power Port 1'),
+            PowerPort.objects.create(device=devices[1], name='Power Port 2', allocated_draw=100, maximum_draw=200),
+            PowerPort.objects.create(device=devices[2], name='Power Port 3', allocated_draw=50, maximum_draw=80),
+        )
+        cls.poweroutlets = (
+            PowerOutlet.objects.create(
+                device=devices[0], name='Power Outlet 1', power_port=cls.powerports[0],
+                feed_leg=PowerOutletFeedLegChoices.FEED_LEG_A
+            ),
+            PowerOutlet.objects.create(
+                device=devices[0], name='Power Outlet 2', power_port=cls.powerports[0],
+                feed_leg=PowerOutletFeedLegChoices.FEED_LEG_B
+            ),
+            PowerOutlet.objects.create(
+                device=devices[0], name='Power Outlet 3', power_port=cls.powerports[0],
+                feed_leg=PowerOutletFeedLegChoices.FEED_LEG_A
+            ),
+        )
+        Cable(a_terminations=[cls.powerfeeds[0]], b_terminations=[cls.powerports[0]]).save()
+        Cable(a_terminations=[cls.poweroutlets[0]], b_terminations=[cls.powerports[1]]).save()
+        Cable(a_terminations=[cls.poweroutlets[1]], b_terminations=[cls.powerports[2]]).save()
+
+    def setUp(self):
+        # Cache calculated power draws even though each test runs within a transaction
+        patcher = patch('dcim.power.connection', in_atomic_block=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(invalidate_power_draws, [powerport.pk for powerport in self.powerports])
+
+    def test_power_draw(self):
+        self.assertEqual(self.powerports[0].get_power_draw(), {
+            'allocated': 150,
+            'maximum': 280,
+            'outlet_count': 3,
+            'legs': [
+                {'name': 'A', 'allocated': 100, 'maximum': 200, 'outlet_count': 2},
+                {'name': 'B', 'allocated': 50, 'maximum': 80, 'outlet_count': 1},
+                {'name': 'C', 'allocated': 0, 'maximum': 0, 'outlet_count': 0},
+            ],
+        })
+        self.assertEqual(self.powerports[1].get_power_draw(), {
+            'allocated': 100,
+            'maximum': 200,
+            'outlet_count': 0,
+            'legs': [],
+        })
+
+        # Power draws are rolled up to power feeds and power panels
+        powerfeed = PowerFeed.objects.get(pk=self.powerfeeds[0].pk)
+        self.assertEqual(powerfeed.get_power_draw(), self.powerports[0].get_power_draw())
+        self.assertIsNone(self.powerfeeds[1].get_power_draw())
+        self.assertEqual(self.powerpanel.get_power_draw(), {
+            'allocated': 150,
+            'maximum': 280,
+            'available': self.powerfeeds[0].available_power + self.powerfeeds[1].available_power,
+        })
+
+        # Retrieve power draws in bulk
+        power_draw = powerfeed.get_power_draw()
+        powerfeeds = list(PowerFeed.objects.annotate_power_draw())
+        with self.assertNumQueries(0):
+            self.assertEqual(powerfeeds[0].get_power_draw(), power_draw)
+
+    def test_power_draw_invalidation(self):
+        powerport = self.powerports[0]
+        self.assertEqual(powerport.get_power_draw()['allocated'], 150)
+        with self.assertNumQueries(0):
+            powerport.get_power_draw()
+
+        # Change the draw of a downstream power port
+        downstream_powerport = PowerPort.objects.get(pk=self.powerports[1].pk)
+        downstream_powerport.allocated_draw = 120
+        downstream_powerport.save()
+        self.assertEqual(powerport.get_power_draw()['allocated'], 170)
+
+        # Move a power outlet to another feed leg
+        poweroutlet = PowerOutlet.objects.get(pk=self.poweroutlets[1].pk)
+        poweroutlet.feed_leg = PowerOutletFeedLegChoices.FEED_LEG_C
+        poweroutlet.save()
+        self.assertEqual(powerport.get_power_draw()['legs'][2]['allocated'], 50)
+
+        # Disconnect a downstream power port
+        PowerPort.objects.get(pk=self.powerports[2].pk).cable.delete()
+        self.assertEqual(powerport.get_power_draw()['allocated'], 120)
+
+        # Change the phase of the power feed
+        powerfeed = PowerFeed.objects.get(pk=self.powerfeeds[0].pk)
+        powerfeed.phase = PowerFeedPhaseChoices.PHASE_SINGLE
+        powerfeed.save()
+        self.assertEqual(powerport.get_power_draw()['legs'], [])
+
+        # Add a power outlet
+        PowerOutlet.objects.create(device=powerport.device, name='Power Outlet 4', power_port=powerport)
+        self.assertEqual(powerport.get_power_draw()['outlet_count'], 4)
+
+
 class CableTestCase(TestCase):
 
     @classmethod
@@ -1,5 +1,6 @@
 import json
 from decimal import Decimal
+from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 import yaml
@@ -9,6 +10,7 @@ from netaddr import EUI
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.exceptions import UnsupportedCablePath
 from dcim.models import *
 from ipam.models import ASN, RIR, VLAN, VRF
 from netbox.choices import CSVDelimiterChoices, ImportFormatChoices, WeightUnitChoices
@@ -3308,6 +3310,26 @@ class CableTestCase(
 
         return data
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_bulk_import_unsupported_cable_path(self):
+        """
+        Check that an unsupported CablePath encountered while importing cables aborts the import cleanly.
+        """
+        self.add_permissions('dcim.add_cable')
+        initial_count = Cable.objects.count()
+        data = {
+            'data': self._get_csv_data(),
+            'format': ImportFormatChoices.CSV,
+            'csv_delimiter': CSVDelimiterChoices.AUTO,
+        }
+
+        with patch('dcim.tracing.CablePathTracer.trace', side_effect=UnsupportedCablePath('Unsupported path')):
+            response = self.client.post(self._get_url('bulk_import'), data)
+
+        self.assertHttpStatus(response, 200)
+        self.assertIn('Unsupported path', str(response.content))
+        self.assertEqual(Cable.objects.count(), initial_count)
+
 
 class VirtualChassisTestCase(ViewTestCases.PrimaryObjectViewTestCase):
     model = VirtualChassis
@@ -0,0 +1,306 @@
+import itertools
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+
+from dcim.choices import LinkStatusChoices
+from dcim.models import Cable, CablePath, CableTermination, FrontPort, RearPort
+from dcim.utils import compile_path_node
+
+__all__ = (
+    'CablePathTracer',
+)
+
+
+class Trace:
+    """
+    The in-progress state of a single path being traced by CablePathTracer.
+    """
+    def __init__(self, origins):
+        self.origins = origins
+        self.termination = origins[0]
+        self.path = []
+        self.position_stack = []
+        self.is_complete = False
+        self.is_active = True
+        self.is_split = False
+        self.done = False
+        self.fallback = False
+
+    def finish(self, **kwargs):
+        for attr, value in kwargs.items():
+            setattr(self, attr, value)
+        self.done = True
+
+    def to_cablepath(self):
+        return CablePath(
+            path=self.path,
+            is_complete=self.is_complete,
+            is_active=self.is_active,
+            is_split=self.is_split
+        )
+
+
+class CablePathTracer:
+    """
+    Trace CablePaths for many origins at once. Rather than following each path to completion in turn (as
+    CablePath.from_origin() does), all in-progress paths are advanced together one hop at a time, resolving the
+    links, cable terminations, and far-end objects for the entire frontier with a handful of bulk queries per hop.
+    FrontPorts and RearPorts are loaded once per device and cached for the lifetime of the tracer.
+
+    Paths which consist of a single termination at every step are traced in bulk. Any path which fans out to (or
+    originates from) multiple terminations, or which traverses a wireless link, is handed off to
+    CablePath.from_origin() to ensure identical results.
+    """
+    def __init__(self):
+        self._frontports_by_position = {}
+        self._rearports = {}
+        self._devices = set()
+
+    @staticmethod
+    def _node(obj):
+        return compile_path_node(ContentType.objects.get_for_model(obj).pk, obj.pk)
+
+    def trace(self, origins):
+        """
+        Trace paths from each of the given sets of originating terminations. Returns a list of (origins, CablePath)
+        tuples, where CablePath is None if no path exists for the origin(s). CablePaths are not saved.
+
+        :param origins: An iterable of lists of termination objects, each representing the origin(s) of a path
+        """
+        traces = [Trace(list(terminations)) for terminations in origins if terminations]
+
+        # Paths originating from multiple terminations are always traced individually
+        for trace in traces:
+            if len(trace.origins) > 1:
+                trace.finish(fallback=True)
+
+        frontier = [trace for trace in traces if not trace.done]
+        while frontier:
+            self._advance(frontier)
+            frontier = [trace for trace in frontier if not trace.done]
+
+        results = []
+        for trace in traces:
+            if trace.fallback:
+                results.append((trace.origins, CablePath.from_origin(trace.origins)))
+            elif trace.path:
+                results.append((trace.origins, trace.to_cablepath()))
+            else:
+                results.append((trace.origins, None))
+
+        return results
+
+    def save(self, results, batch_size=None):
+        """
+        Save the CablePaths returned by trace() using bulk_create(), and record a reference to each new CablePath on
+        its originating object(s).
+        """
+        cable_paths = [cp for _, cp in results if cp is not None]
+        for cp in cable_paths:
+            cp._nodes = list(itertools.chain(*cp.path))
+        CablePath.objects.bulk_create(cable_paths, batch_size=batch_size)
+
+        origins_by_model = defaultdict(list)
+        for origins, cp in results:
+            if cp is None:
+                continue
+            for origin in origins:
+                origin._path_id = cp.pk
+                origins_by_model[type(origin)].append(origin)
+        for model, objects in origins_by_model.items():
+            model.objects.bulk_update(objects, ['_path'], batch_size=batch_size)
+
+        return cable_paths
+
+    def _advance(self, frontier):
+        """
+        Advance each Trace in the frontier by one hop (near-end termination, link, far-end termination).
+        """
+        # Step 1: Record the near-end termination
+        for trace in frontier:
+            trace.path.append([self._node(trace.termination)])
+
+        # Step 2: Determine the attached links. Wireless links are traced individually.
+        for trace in frontier:
+            termination = trace.termination
+            if getattr(termination, 'cable_id', None) is None:
+                if getattr(termination, 'wireless_link_id', None) is not None:
+                    trace.finish(fallback=True)
+                elif len(trace.path) == 1:
+                    # No link is attached to the origin, so no path exists
+                    trace.finish(path=[])
+                else:
+                    trace.finish()
+        frontier = [trace for trace in frontier if not trace.done]
+        if not frontier:
+            return
+
+        cable_ids = {trace.termination.cable_id for trace in frontier}
+        cable_statuses = dict(Cable.objects.filter(pk__in=cable_ids).values_list('pk', 'status'))
+        cable_terminations = defaultdict(list)
+        for ct in CableTermination.objects.filter(cable_id__in=cable_ids):
+            cable_terminations[ct.cable_id].append(ct)
+
+        # Steps 4-6: Record the link and find the far-end CableTermination
+        cable_type = ContentType.objects.get_for_model(Cable)
+        far_ends = {}
+        for trace in frontier:
+            termination = trace.termination
+            termination_type = ContentType.objects.get_for_model(termination)
+            terminations = cable_terminations[termination.cable_id]
+            local = [
+                ct for ct in terminations
+                if ct.termination_type_id == termination_type.pk and ct.termination_id == termination.pk
+            ]
+            if termination.cable_id not in cable_statuses or not local:
+                # Inconsistent data; defer to the standard tracer
+                trace.finish(fallback=True)
+                continue
+
+            trace.path.append([compile_path_node(cable_type.pk, termination.cable_id)])
+            if cable_statuses[termination.cable_id] != LinkStatusChoices.STATUS_CONNECTED:
+                trace.is_active = False
+
+            cable_end = 'A' if local[0].cable_end == 'B' else 'B'
+            remote = [ct for ct in terminations if ct.cable_end == cable_end]
+            if len(remote) > 1:
+                trace.finish(fallback=True)
+            elif not remote:
+                trace.path.append([])
+                trace.finish()
+            else:
+                far_ends[trace] = remote[0]
+        frontier = [trace for trace in frontier if not trace.done]
+        if not frontier:
+            return
+
+        # Step 7: Resolve and record the far-end termination objects
+        objects = self._get_termination_objects(far_ends.values())
+        remote_terminations = {}
+        for trace in frontier:
+            ct = far_ends[trace]
+            remote = objects.get((ct.termination_type_id, ct.termination_id))
+            if remote is None:
+                trace.finish(fallback=True)
+                continue
+            trace.path.append([compile_path_node(ct.termination_type_id, ct.termination_id)])
+            remote_terminations[trace] = remote
+        frontier = [trace for trace in frontier if not trace.done]
+
+        # Step 8: Determine the next-hop termination
+        self._load_device_ports({
+            remote.device_id for remote in remote_terminations.values() if type(remote) in (FrontPort, RearPort)
+        })
+        circuit_peers = self._get_circuit_peers([
+            remote for remote in remote_terminations.values() if self._is_circuittermination(remote)
+        ])
+        for trace in frontier:
+            remote = remote_terminations[trace]
+
+            if type(remote) is FrontPort:
+                # Follow FrontPorts to their corresponding RearPorts
+                rear_port = self._rearports[remote.rear_port_id]
+                if rear_port.positions > 1:
+                    trace.position_stack.append([remote.rear_port_position])
+                trace.termination = rear_port
+
+            elif type(remote) is RearPort:
+                if remote.positions == 1:
+                    position = 1
+                elif trace.position_stack:
+                    positions = trace.position_stack.pop()
+                    if len(positions) > 1:
+                        trace.finish(fallback=True)
+                        continue
+                    position = positions[0]
+                else:
+                    # No position indicated: path has split, so we stop at the RearPort
+                    trace.finish(is_split=True)
+                    continue
+                front_port = self._frontports_by_position.get((remote.pk, position))
+                if front_port is None:
+                    trace.finish()
+                    continue
+                trace.termination = front_port
+
+            elif self._is_circuittermination(remote):
+                # Follow a CircuitTermination to its corresponding CircuitTermination (A to Z or vice versa)
+                peer = circuit_peers.get((remote.circuit_id, 'Z' if remote.term_side == 'A' else 'A'))
+                if peer is None:
+                    trace.finish()
+                elif peer._provider_network_id:
+                    # Circuit terminates to a ProviderNetwork
+                    trace.path.extend([
+                        [self._node(peer)],
+                        [compile_path_node(self._providernetwork_type.pk, peer._provider_network_id)],
+                    ])
+                    trace.finish(is_complete=True)
+                elif peer.termination_id and not peer.cable_id:
+                    # Circuit terminates to a Region/Site/etc.
+                    trace.path.extend([
+                        [self._node(peer)],
+                        [compile_path_node(peer.termination_type_id, peer.termination_id)],
+                    ])
+                    trace.finish()
+                else:
+                    trace.termination = peer
+
+            else:
+                trace.finish(is_complete=True)
+
+    @staticmethod
+    def _get_termination_objects(cable_terminations):
+        """
+        Return a mapping of (ContentType ID, object ID) to termination object for the given CableTerminations.
+        """
+        object_ids = defaultdict(set)
+        for ct in cable_terminations:
+            object_ids[ct.termination_type_id].add(ct.termination_id)
+
+        objects = {}
+        for ct_id, pks in object_ids.items():
+            model = ContentType.objects.get_for_id(ct_id).model_class()
+            for obj in model.objects.filter(pk__in=pks):
+                objects[(ct_id, obj.pk)] = obj
+
+        return objects
+
+    def _load_device_ports(self, device_ids):
+        """
+        Cache all FrontPorts and RearPorts belonging to the specified devices, if not already loaded.
+        """
+        device_ids = set(device_ids) - self._devices
+        if not device_ids:
+            return
+        for rear_port in RearPort.objects.filter(device_id__in=device_ids):
+            self._rearports[rear_port.pk] = rear_port
+        for front_port in FrontPort.objects.filter(device_id__in=device_ids):
+            self._frontports_by_position[(front_port.rear_port_id, front_port.rear_port_position)] = front_port
+        self._devices |= device_ids
+
+    @staticmethod
+    def _is_circuittermination(obj):
+        from circuits.models import CircuitTermination
+        return type(obj) is CircuitTermination
+
+    @property
+    def _providernetwork_type(self):
+        from circuits.models import ProviderNetwork
+        return ContentType.objects.get_for_model(ProviderNetwork)
+
+    @staticmethod
+    def _get_circuit_peers(circuit_terminations):
+        """
+        Return a mapping of (circuit ID, term side) to CircuitTermination for all terminations belonging to the
+        circuits of the given CircuitTerminations.
+        """
+        from circuits.models import CircuitTermination
+
+        circuit_ids = {ct.circuit_id for ct in circuit_terminations}
+        if not circuit_ids:
+            return {}
+        return {
+            (ct.circuit_id, ct.term_side): ct
+            for ct in CircuitTermination.objects.filter(circuit_id__in=circuit_ids)
+        }
@@ -1,6 +1,26 @@
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Max
+from django_pglocks import advisory_lock
+
+from netbox.constants import ADVISORY_LOCK_KEYS
+from netbox.signals import post_bulk_create
+from utilities.counters import coalesced_counters
+from utilities.data import drange
+from utilities.exceptions import AbortRequest
+from .constants import DEVICE_COMPONENT_TEMPLATE_MODELS
+from .exceptions import UnsupportedCablePath
+from .power import get_powerfeed_draws
+
+_deferred_origins = ContextVar('deferred_cablepath_origins', default=None)
+_deferred_devices = ContextVar('deferred_device_components', default=None)
 
 
 def compile_path_node(ct_id, object_id):
@@ -39,24 +59,85 @@ def create_cablepath(terminations):
     """
     from dcim.models import CablePath
 
+    if defer_cablepath(terminations):
+        return
+
     cp = CablePath.from_origin(terminations)
     if cp:
         cp.save()
 
 
+def create_cablepaths(origins, batch_size=None):
+    """
+    Create CablePaths for many sets of originating nodes at once, tracing all paths together and saving them in bulk.
+
+    :param origins: Iterable of lists of CableTermination objects, one list per path
+    :param batch_size: Maximum number of objects to create or update per query
+    """
+    from dcim.tracing import CablePathTracer
+
+    tracer = CablePathTracer()
+    return tracer.save(tracer.trace(origins), batch_size=batch_size)
+
+
+@contextmanager
+def deferred_cablepaths():
+    """
+    Defer the creation of CablePaths for newly cabled path endpoints until the end of the block, then create them all
+    at once using create_cablepaths(). CablePaths are not created if an exception is raised within the block.
+    AbortRequest is raised if any path cannot be traced.
+    """
+    token = _deferred_origins.set({})
+    try:
+        yield
+        if origins := list(_deferred_origins.get().values()):
+            # Reload the originating objects, as their cable assignments may have changed since being queued
+            object_ids = defaultdict(set)
+            for terminations in origins:
+                for t in terminations:
+                    object_ids[type(t)].add(t.pk)
+            objects = {
+                (model, obj.pk): obj for model, pks in object_ids.items() for obj in model.objects.filter(pk__in=pks)
+            }
+            try:
+                create_cablepaths([
+                    [objects[(type(t), t.pk)] for t in terminations if (type(t), t.pk) in objects]
+                    for terminations in origins
+                ])
+            except UnsupportedCablePath as e:
+                raise AbortRequest(e)
+    finally:
+        _deferred_origins.reset(token)
+
+
+def defer_cablepath(terminations):
+    """
+    Queue the creation of a CablePath from the specified set of nodes if within a deferred_cablepaths() block. Returns
+    True if the path has been queued.
+    """
+    origins = _deferred_origins.get()
+    if origins is None:
+        return False
+    origins[tuple(object_to_path_node(t) for t in terminations)] = list(terminations)
+    return True
+
+
 def rebuild_paths(terminations):
     """
-    Rebuild all CablePaths which traverse the specified nodes.
+    Rebuild all CablePaths which traverse the specified nodes. Each path is retraced only from the first hop involving
+    one of the nodes, and paths which continue from the same hop share a single trace of the remainder.
     """
     from dcim.models import CablePath
 
-    for obj in terminations:
-        cable_paths = CablePath.objects.filter(_nodes__contains=obj)
+    nodes = {object_to_path_node(obj) for obj in terminations}
+    if not nodes:
+        return
+    cable_paths = CablePath.objects.filter(_nodes__overlap=list(nodes))
 
-        with transaction.atomic():
-            for cp in cable_paths:
-                cp.delete()
-                create_cablepath(cp.origins)
+    suffix_cache = {}
+    with transaction.atomic():
+        for cp in cable_paths:
+            cp.retrace_from(nodes, suffix_cache=suffix_cache)
 
 
 def update_interface_bridges(device, interface_templates, module=None):
@@ -76,3 +157,229 @@ def update_interface_bridges(device, interface_templates, module=None):
             )
             interface.full_clean()
             interface.save()
+
+
+def _get_next_tree_id(model):
+    """
+    Return the next unused MPTT tree ID for the given model.
+    """
+    return (model.objects.aggregate(Max('tree_id'))['tree_id__max'] or 0) + 1
+
+
+def instantiate_device_components(devices):
+    """
+    Instantiate the components of many newly created Devices at once, per the component templates of their
+    DeviceTypes. The templates of each DeviceType are retrieved only once, and each type of component is created for
+    all devices with a single bulk_create() (or one per tree level, for InventoryItems).
+
+    References among the new components (such as the PowerPort of a PowerOutlet, or an Interface's bridge) are
+    resolved in memory, and the MPTT attributes of ModuleBays and InventoryItems are computed up front. Rather than
+    post_save for each new component, post_bulk_create is sent once for each type of component created.
+
+    :param devices: An iterable of saved Device instances
+    """
+    CustomField = apps.get_model('extras', 'CustomField')
+    Interface = apps.get_model('dcim', 'Interface')
+
+    devices = list(devices)
+    device_type_ids = {device.device_type_id for device in devices}
+
+    # Maps each template model, template ID, and device ID to the component created
+    components = {}
+
+    def get_component(template_model, template_id, device):
+        if template_id is None:
+            return None
+        return components[(template_model, template_id, device.pk)]
+
+    with coalesced_counters():
+        created = {}
+        for template_model_name in DEVICE_COMPONENT_TEMPLATE_MODELS:
+            template_model = apps.get_model('dcim', template_model_name)
+            model = template_model.component_model
+            templates = defaultdict(list)
+            for template in template_model.objects.filter(device_type__in=device_type_ids):
+                templates[template.device_type_id].append(template)
+
+            # Resolve any other components to which each new component refers
+            for device in devices:
+                for template in templates[device.device_type_id]:
+                    if template_model_name == 'poweroutlettemplate':
+                        component = template.instantiate(
+                            device=device,
+                            power_port=get_component(
+                                apps.get_model('dcim', 'PowerPortTemplate'), template.power_port_id, device
+                            )
+                        )
+                    elif template_model_name == 'frontporttemplate':
+                        component = template.instantiate(
+                            device=device,
+                            rear_port=get_component(
+                                apps.get_model('dcim', 'RearPortTemplate'), template.rear_port_id, device
+                            )
+                        )
+                    elif template_model_name == 'inventoryitemtemplate':
+                        component_template_model = ContentType.objects.get_for_id(
+                            template.component_type_id
+                        ).model_class() if template.component_type_id else None
+                        component = template.instantiate(
+                            device=device,
+                            parent=get_component(template_model, template.parent_id, device),
+                            component=get_component(component_template_model, template.component_id, device)
+                        )
+                    else:
+                        component = template.instantiate(device=device)
+                    components[(template_model, template.pk, device.pk)] = component
+            instances = [
+                components[(template_model, template.pk, device.pk)]
+                for device in devices for template in templates[device.device_type_id]
+            ]
+            if not instances:
+                continue
+
+            # Set default values for any applicable custom fields
+            if cf_defaults := CustomField.objects.get_defaults_for_model(model):
+                for component in instances:
+                    component.custom_field_data = cf_defaults
+
+            if template_model_name == 'modulebaytemplate':
+                # Each device-level ModuleBay forms its own tree
+                with advisory_lock(ADVISORY_LOCK_KEYS['modulebay']):
+                    tree_id = _get_next_tree_id(model)
+                    for component in instances:
+                        component.tree_id, component.lft, component.rght, component.level = tree_id, 1, 2, 0
+                        tree_id += 1
+                    model.objects.bulk_create(instances)
+            elif template_model_name == 'inventoryitemtemplate':
+                # Each tree of InventoryItems mirrors the tree of templates from which it was created
+                with advisory_lock(ADVISORY_LOCK_KEYS['inventoryitem']):
+                    tree_id = _get_next_tree_id(model)
+                    tree_ids = {}
+                    for device in devices:
+                        for template in templates[device.device_type_id]:
+                            if (device.pk, template.tree_id) not in tree_ids:
+                                tree_ids[(device.pk, template.tree_id)] = tree_id
+                                tree_id += 1
+                            component = components[(template_model, template.pk, device.pk)]
+                            component.tree_id = tree_ids[(device.pk, template.tree_id)]
+                            component.lft, component.rght = template.lft, template.rght
+                            component.level = template.level
+                    # Create parent items before their children
+                    for level in sorted({component.level for component in instances}):
+                        model.objects.bulk_create([component for component in instances if component.level == level])
+            else:
+                model.objects.bulk_create(instances)
+            created[model] = instances
+
+            # Interface bridges have to be set after interface instantiation
+            if template_model_name == 'interfacetemplate':
+                bridged_interfaces = []
+                for device in devices:
+                    for template in templates[device.device_type_id]:
+                        if template.bridge_id:
+                            interface = components[(template_model, template.pk, device.pk)]
+                            interface.bridge = components[(template_model, template.bridge_id, device.pk)]
+                            bridged_interfaces.append(interface)
+                Interface.objects.bulk_update(bridged_interfaces, ['bridge'])
+
+        for model, instances in created.items():
+            post_bulk_create.send(sender=model, instances=instances)
+
+
+@contextmanager
+def deferred_device_components():
+    """
+    Defer the instantiation of components for newly created Devices until the end of the block, then instantiate the
+    components of all such devices at once using instantiate_device_components(). Components are not instantiated if
+    an exception is raised within the block.
+    """
+    token = _deferred_devices.set([])
+    try:
+        yield
+        if devices := _deferred_devices.get():
+            instantiate_device_components(devices)
+    finally:
+        _deferred_devices.reset(token)
+
+
+def defer_device_components(device):
+    """
+    Queue the instantiation of components for a new Device if within a deferred_device_components() block. Returns
+    True if the device has been queued.
+    """
+    devices = _deferred_devices.get()
+    if devices is None:
+        return False
+    devices.append(device)
+    return True
+
+
+def annotate_rack_utilization(racks):
+    """
+    Calculate the space and power utilization of many Racks at once, caching the results on each instance for use by
+    get_utilization() and get_power_utilization(). All related objects are retrieved with a fixed number of queries,
+    regardless of the number of racks.
+
+    :param racks: An iterable of Rack instances
+    """
+    Device = apps.get_model('dcim', 'Device')
+    PowerFeed = apps.get_model('dcim', 'PowerFeed')
+    RackReservation = apps.get_model('dcim', 'RackReservation')
+
+    racks = {
+        rack.pk: rack for rack in racks if rack.pk is not None and not hasattr(rack, '_utilization')
+    }
+    if not racks:
+        return
+
+    # Space utilization: Count the (half) units occupied by devices or reserved
+    occupied_units = defaultdict(set)
+    devices = Device.objects.filter(
+        rack__in=racks, position__gte=1
+    ).exclude(
+        device_type__exclude_from_utilization=True
+    ).order_by().values_list('rack_id', 'position', 'device_type__u_height')
+    for rack_id, position, u_height in devices:
+        occupied_units[rack_id].update(drange(position, position + u_height, 0.5))
+    reservations = RackReservation.objects.filter(rack__in=racks).order_by().values_list('rack_id', 'units')
+    for rack_id, units in reservations:
+        for u in units:
+            occupied_units[rack_id].update(drange(u, u + 1, 0.5))
+
+    for rack in racks.values():
+        units = set(rack.units)
+        rack._utilization = float(len(units & occupied_units[rack.pk])) / len(units) * 100
+
+    # Power utilization: Sum the allocated draw of the power ports connected to each rack's power feeds
+    powerfeeds = list(PowerFeed.objects.filter(rack__in=racks).only(
+        'pk', 'rack', 'available_power', 'cable', 'cable_end'
+    ).order_by())
+    powerfeed_draws = get_powerfeed_draws(powerfeeds)
+    available_power = defaultdict(int)
+    allocated_draw = defaultdict(int)
+    for powerfeed in powerfeeds:
+        available_power[powerfeed.rack_id] += powerfeed.available_power
+        if draw := powerfeed_draws[powerfeed.pk]:
+            allocated_draw[powerfeed.rack_id] += draw['allocated']
+
+    for rack in racks.values():
+        if available_power[rack.pk]:
+            rack._power_utilization = round(allocated_draw[rack.pk] / available_power[rack.pk] * 100, 1)
+        else:
+            rack._power_utilization = 0
+
+
+def get_rack_elevation_version(rack_id):
+    """
+    Return the current version of the given Rack's contents for the purpose of caching rendered elevations. Cached
+    elevations from any prior version are ignored.
+    """
+    return cache.get_or_set(f'rack_elevation_version:{rack_id}', lambda: uuid.uuid4().hex, None)
+
+
+def invalidate_rack_elevations(rack_ids):
+    """
+    Invalidate the cached elevations of the specified Racks by discarding their current versions.
+    """
+    if rack_ids := {rack_id for rack_id in rack_ids if rack_id is not None}:
+        cache.delete_many([f'rack_elevation_version:{rack_id}' for rack_id in rack_ids])
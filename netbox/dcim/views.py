@@ -34,6 +34,8 @@ from wireless.models import WirelessLAN
 from . import filtersets, forms, tables
 from .choices import DeviceFaceChoices, InterfaceModeChoices
 from .models import *
+from .power import annotate_power_draws
+from .utils import deferred_cablepaths
 
 CABLE_TERMINATION_TYPES = {
     'dcim.consoleport': ConsolePort,
@@ -752,7 +754,7 @@ class RackTypeBulkDeleteView(generic.BulkDeleteView):
 
 @register_model_view(Rack, 'list', path='', detail=False)
 class RackListView(generic.ObjectListView):
-    queryset = Rack.objects.annotate(
+    queryset = Rack.objects.annotate_utilization().annotate(
         device_count=count_related(Device, 'rack')
     )
     filterset = filtersets.RackFilterSet
@@ -2132,8 +2134,13 @@ class DeviceView(generic.ObjectView):
         else:
             vc_members = []
 
+        # Retrieve the power draw of all power ports at once
+        powerports = list(instance.powerports.all())
+        annotate_power_draws(powerports)
+
         return {
             'vc_members': vc_members,
+            'powerports': powerports,
             'svg_extra': f'highlight=id:{instance.pk}'
         }
 
@@ -3595,6 +3602,11 @@ class CableBulkImportView(generic.BulkImportView):
     queryset = Cable.objects.all()
     model_form = forms.CableImportForm
 
+    def create_and_update_objects(self, form, request):
+        # Trace the paths for all newly connected endpoints together once all cables have been saved
+        with deferred_cablepaths():
+            return super().create_and_update_objects(form, request)
+
 
 @register_model_view(Cable, 'bulk_edit', path='edit', detail=False)
 class CableBulkEditView(generic.BulkEditView):
@@ -1,10 +1,16 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from jinja2.exceptions import TemplateError
 from rest_framework.decorators import action
+from rest_framework.fields import BooleanField
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.status import HTTP_202_ACCEPTED, HTTP_400_BAD_REQUEST
 
-from netbox.api.renderers import TextRenderer
+from core.api.serializers import JobSerializer
+from extras.configtemplates import render_config_templates, stream_ndjson, stream_tar
+from extras.jobs import RenderConfigsJob
+from netbox.api.renderers import NDJSONRenderer, TarRenderer, TextRenderer
 from .serializers import ConfigTemplateSerializer
 
 __all__ = (
@@ -27,12 +33,16 @@ class ConfigContextQuerySetMixin:
         If the `brief` query param equates to True or the `exclude` query param
         includes `config_context` as a value, return the base queryset.
 
+        If config contexts are materialized, return the base queryset, as the stored data will be used.
+
         Else, return the queryset annotated with config context data
         """
         queryset = super().get_queryset()
         request = self.get_serializer_context()['request']
         if self.brief or 'config_context' in request.query_params.get('exclude', []):
             return queryset
+        if settings.MATERIALIZE_CONFIG_CONTEXTS:
+            return queryset
         return queryset.annotate_config_context_data()
 
 
@@ -83,3 +93,33 @@ class RenderConfigMixin(ConfigTemplateRenderMixin):
         context_data.update({object_type: instance})
 
         return self.render_configtemplate(request, configtemplate, context_data)
+
+    @action(
+        detail=False, methods=['post'], url_path='render-configs', renderer_classes=[NDJSONRenderer, TarRenderer]
+    )
+    def render_configs(self, request):
+        """
+        Resolve and render the preferred ConfigTemplate for all objects matching the specified filters. Results are
+        streamed as newline-delimited JSON, or as a tar archive if requested. If the `background` parameter is set,
+        rendering is instead performed by a background job, which is returned.
+        """
+        queryset = self.filter_queryset(self.queryset)
+        context = dict(request.data.items())
+
+        if BooleanField().to_internal_value(request.query_params.get('background', False)):
+            job = RenderConfigsJob.enqueue(
+                user=request.user,
+                model=queryset.model._meta.label_lower,
+                pks=list(queryset.values_list('pk', flat=True)),
+                context=context
+            )
+            serializer = JobSerializer(job, context={'request': request})
+            return Response(serializer.data, status=HTTP_202_ACCEPTED)
+
+        results = render_config_templates(queryset, context=context)
+        if request.accepted_renderer.format == 'tar':
+            response = StreamingHttpResponse(stream_tar(results), content_type='application/x-tar')
+            response['Content-Disposition'] = f'attachment; filename="{queryset.model._meta.model_name}-configs.tar"'
+            return response
+
+        return StreamingHttpResponse(stream_ndjson(results), content_type='application/x-ndjson')
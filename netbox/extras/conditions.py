@@ -64,6 +64,14 @@ class Condition:
         self.eval_func = getattr(self, f'eval_{op}')
         self.negate = negate
 
+        # Precompute the attribute path and any regular expression, as a Condition may be evaluated many times
+        self.path = attr.split('.')
+        if op == self.REGEX:
+            try:
+                self.pattern = re.compile(value)
+            except re.error as e:
+                raise ValueError(_("Invalid regular expression: {value}").format(value=e)) from e
+
     def eval(self, data):
         """
         Evaluate the provided data to determine whether it matches the condition.
@@ -75,7 +83,7 @@ class Condition:
             return dict.get(obj, key)
 
         try:
-            value = functools.reduce(_get, self.attr.split('.'), data)
+            value = functools.reduce(_get, self.path, data)
         except TypeError:
             # Invalid key path
             value = None
@@ -118,7 +126,7 @@ class Condition:
     # Regular expressions
 
     def eval_regex(self, value):
-        return re.match(self.value, value) is not None
+        return self.pattern.match(value) is not None
 
 
 class ConditionSet:
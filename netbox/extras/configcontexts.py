@@ -0,0 +1,221 @@
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django_rq import get_queue
+from mptt.models import MPTTModel
+
+from netbox.context import config_context_queue
+from utilities.data import deepmerge
+from utilities.rqworker import get_queue_for_model
+
+__all__ = (
+    'enqueue_config_context_dependents',
+    'enqueue_config_context_objects',
+    'enqueue_config_context_update',
+    'flush_config_context_queue',
+    'get_config_context_objects',
+    'process_config_context_queue',
+    'update_config_contexts',
+)
+
+# Models which store their merged config context data
+CONFIG_CONTEXT_MODELS = (
+    'dcim.device',
+    'virtualization.virtualmachine',
+)
+
+# Maps each ConfigContext assignment to the corresponding Device/VirtualMachine lookup, and whether the assigned
+# objects form a hierarchy (in which case all descendants are matched as well)
+CONFIG_CONTEXT_ASSIGNMENTS = {
+    'regions': ('site__region__in', True),
+    'site_groups': ('site__group__in', True),
+    'sites': ('site__in', False),
+    'locations': ('location__in', False),
+    'device_types': ('device_type__in', False),
+    'roles': ('role__in', True),
+    'platforms': ('platform__in', False),
+    'cluster_types': ('cluster__type__in', False),
+    'cluster_groups': ('cluster__group__in', False),
+    'clusters': ('cluster__in', False),
+    'tenant_groups': ('tenant__group__in', False),
+    'tenants': ('tenant__in', False),
+    'tags': ('tags__in', False),
+}
+
+# Assignments which apply only to Devices
+DEVICE_ASSIGNMENTS = ('locations', 'device_types')
+
+# Maps related models to the fields which affect the ConfigContexts applicable to Devices and VirtualMachines, and the
+# lookup of the objects affected. (Moving a Location, Rack, or Cluster to a different Site updates the site of its
+# Devices or VirtualMachines in bulk, without triggering their post_save signals.)
+CONFIG_CONTEXT_DEPENDENCIES = {
+    'dcim.region': (('parent',), 'site__region__in'),
+    'dcim.sitegroup': (('parent',), 'site__group__in'),
+    'dcim.site': (('region', 'group'), 'site__in'),
+    'dcim.location': (('site',), 'location__in'),
+    'dcim.rack': (('site', 'location'), 'rack__in'),
+    'dcim.devicerole': (('parent',), 'role__in'),
+    'tenancy.tenant': (('group',), 'tenant__in'),
+    'virtualization.cluster': (('type', 'group', '_site'), 'cluster__in'),
+}
+
+# Related models upon which only Devices depend
+DEVICE_DEPENDENCIES = ('dcim.location', 'dcim.rack')
+
+
+def get_config_context_objects(config_context):
+    """
+    Return the IDs of all Devices and VirtualMachines matched by the given ConfigContext's assignments, keyed by model
+    label. Whether the ConfigContext is active is disregarded.
+    """
+    filters = {}
+    for name, (lookup, is_tree) in CONFIG_CONTEXT_ASSIGNMENTS.items():
+        assigned = getattr(config_context, name).all()
+        if not assigned:
+            continue
+        if is_tree:
+            assigned = assigned.model.objects.get_queryset_descendants(assigned, include_self=True)
+        filters[name] = (lookup, list(assigned.values_list('pk', flat=True)))
+
+    objects = {}
+    for label in CONFIG_CONTEXT_MODELS:
+        model = apps.get_model(label)
+        if model._meta.model_name != 'device' and any(name in filters for name in DEVICE_ASSIGNMENTS):
+            # Location & DeviceType assignments can never match a VirtualMachine
+            objects[label] = set()
+            continue
+        queryset = model.objects.filter(**{lookup: pks for lookup, pks in filters.values()})
+        objects[label] = set(queryset.values_list('pk', flat=True))
+
+    return objects
+
+
+def enqueue_config_context_update(model, pks):
+    """
+    Queue the stored config context data of the specified objects for recomputation once the current request's changes
+    have been committed. If no queue is active (e.g. outside of a request), the update is scheduled immediately.
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS or not pks:
+        return
+
+    label = model._meta.label_lower
+    queue = config_context_queue.get()
+    if queue is not None:
+        queue.setdefault(label, set()).update(pks)
+    else:
+        transaction.on_commit(partial(flush_config_context_queue, {label: set(pks)}))
+
+
+def enqueue_config_context_objects(config_context, created=False):
+    """
+    Queue all objects to which the given ConfigContext applies for recomputation, both as it is currently assigned and
+    as it will be assigned once the current request's changes have been committed. The latter is resolved when the
+    queue is flushed.
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS:
+        return
+
+    queue = config_context_queue.get()
+    pending = queue.get('extras.configcontext', set()) if queue is not None else set()
+
+    # Match objects against the ConfigContext's current assignments only once per request
+    if not created and config_context.pk not in pending:
+        for label, pks in get_config_context_objects(config_context).items():
+            enqueue_config_context_update(apps.get_model(label), pks)
+
+    enqueue_config_context_update(config_context._meta.model, {config_context.pk})
+
+
+def enqueue_config_context_dependents(instance):
+    """
+    Queue all objects which depend on the given related object (e.g. a Site) for recomputation, if any of its attributes
+    affecting the applicable ConfigContexts have changed.
+    """
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS:
+        return
+
+    label = instance._meta.label_lower
+    fields, lookup = CONFIG_CONTEXT_DEPENDENCIES[label]
+    snapshot = getattr(instance, '_prechange_snapshot', None)
+    if snapshot is not None and all(snapshot.get(field) == getattr(instance, f'{field}_id') for field in fields):
+        return
+
+    # Moving a nested object affects all of its descendants as well
+    if isinstance(instance, MPTTModel):
+        related_objects = instance.get_descendants(include_self=True)
+    else:
+        related_objects = [instance]
+
+    for model_label in CONFIG_CONTEXT_MODELS:
+        model = apps.get_model(model_label)
+        if model._meta.model_name != 'device' and label in DEVICE_DEPENDENCIES:
+            continue
+        pks = model.objects.filter(**{lookup: related_objects}).values_list('pk', flat=True)
+        enqueue_config_context_update(model, set(pks))
+
+
+def flush_config_context_queue(queue):
+    """
+    Invalidate the stored config context data of all queued objects, and hand off the queue to a background worker for
+    recomputation. Until then, the config context data of these objects is compiled from the applicable
+    ConfigContexts as needed.
+    """
+    from extras.models import ConfigContext
+
+    # Resolve any queued ConfigContexts to the objects to which they now apply
+    if config_context_pks := queue.pop('extras.configcontext', None):
+        for config_context in ConfigContext.objects.filter(pk__in=config_context_pks):
+            for label, pks in get_config_context_objects(config_context).items():
+                queue.setdefault(label, set()).update(pks)
+
+    queue = {label: pks for label, pks in queue.items() if pks}
+    if not queue:
+        return
+
+    for label, pks in queue.items():
+        apps.get_model(label).objects.filter(pk__in=pks).update(_config_context=None)
+
+    rq_queue = get_queue(get_queue_for_model('configcontext'))
+    rq_queue.enqueue('extras.configcontexts.process_config_context_queue', queue)
+
+
+def process_config_context_queue(queue):
+    """
+    Background task for processing a config context queue handed off by flush_config_context_queue().
+    """
+    for label, pks in queue.items():
+        update_config_contexts(apps.get_model(label), pks)
+
+
+def update_config_contexts(model, pks=None, chunk_size=1000):
+    """
+    Compile and store the merged config context data for the specified objects of the given model (or for all
+    objects, if no IDs are specified). Only objects with changed data are updated. Returns the number of objects
+    updated.
+    """
+    queryset = model.objects.all()
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+
+    updated_count = 0
+    for i in range(0, len(pks), chunk_size):
+        instances = model.objects.filter(
+            pk__in=pks[i:i + chunk_size]
+        ).only('pk', '_config_context').annotate_config_context_data()
+
+        updated = []
+        for instance in instances:
+            data = {}
+            for context in instance.config_context_data or []:
+                data = deepmerge(data, context)
+            if data != instance._config_context:
+                instance._config_context = data
+                updated.append(instance)
+
+        model.objects.bulk_update(updated, ['_config_context'])
+        updated_count += len(updated)
+
+    return updated_count
@@ -0,0 +1,171 @@
+import io
+import json
+import tarfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+__all__ = (
+    'render_config_templates',
+    'serialize_render_result',
+    'stream_ndjson',
+    'stream_tar',
+)
+
+
+def _render(instance, configtemplate, context):
+    """
+    Render the given ConfigTemplate for a Device or VirtualMachine. Returns a tuple of the rendered output and an error
+    message (if rendering failed).
+    """
+    object_type = instance._meta.model_name
+    if configtemplate is None:
+        return None, _('No config template found for this {object_type}.').format(object_type=object_type)
+
+    context_data = instance.get_config_context()
+    context_data.update(context)
+    context_data.update({object_type: instance})
+
+    try:
+        return configtemplate.render(context=context_data), None
+    except Exception as e:
+        return None, _('An error occurred while rendering the template: {error}').format(error=e)
+
+
+def _render_batch(batch, context):
+    try:
+        return [
+            (instance, configtemplate, *_render(instance, configtemplate, context))
+            for instance, configtemplate in batch
+        ]
+    finally:
+        # Close any database connections opened by this worker thread
+        connections.close_all()
+
+
+def render_config_templates(queryset, context=None, workers=None, batch_size=50):
+    """
+    Render the preferred ConfigTemplate of each Device or VirtualMachine in the given queryset. For each object in
+    order, yields a tuple of the object, its ConfigTemplate, the rendered output, and an error message (if rendering
+    failed).
+
+    Config context data for all objects is retrieved in bulk, and each ConfigTemplate is fetched only once. If more than
+    one worker is specified (RENDER_CONFIG_WORKERS by default), batches of objects are rendered concurrently by a pool
+    of threads.
+
+    Args:
+        queryset: The Devices or VirtualMachines to render
+        context: Additional context data to pass to each template
+        workers: The number of worker threads to use for rendering
+        batch_size: The number of objects rendered per batch
+    """
+    context = context or {}
+    workers = workers or settings.RENDER_CONFIG_WORKERS
+
+    queryset = queryset.select_related('config_template', 'role__config_template', 'platform__config_template')
+    if not settings.MATERIALIZE_CONFIG_CONTEXTS:
+        queryset = queryset.annotate_config_context_data()
+
+    # Resolve the ConfigTemplate for each object, reusing a single instance of each template
+    templates = {}
+
+    def get_batches():
+        iterator = queryset.iterator(chunk_size=batch_size * workers)
+        while batch := list(islice(iterator, batch_size)):
+            for i, instance in enumerate(batch):
+                configtemplate = instance.get_config_template()
+                if configtemplate is not None:
+                    if configtemplate.pk not in templates:
+                        # Retrieve any DataFile once, prior to rendering
+                        if configtemplate.data_file:
+                            configtemplate.data_file.source
+                        templates[configtemplate.pk] = configtemplate
+                    configtemplate = templates[configtemplate.pk]
+                batch[i] = (instance, configtemplate)
+            yield batch
+
+    if workers == 1:
+        for batch in get_batches():
+            for instance, configtemplate in batch:
+                yield instance, configtemplate, *_render(instance, configtemplate, context)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Limit the number of pending batches to bound the memory consumed by rendered output
+        pending = deque()
+        for batch in get_batches():
+            pending.append(executor.submit(_render_batch, batch, context))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def serialize_render_result(instance, configtemplate, output, error):
+    """
+    Return a JSON-serializable representation of a result yielded by render_config_templates().
+    """
+    data = {
+        'id': instance.pk,
+        'name': instance.name,
+        'configtemplate': {
+            'id': configtemplate.pk,
+            'name': configtemplate.name,
+        } if configtemplate else None,
+    }
+    if error:
+        data['error'] = error
+    else:
+        data['content'] = output
+    return data
+
+
+def stream_ndjson(results):
+    """
+    Stream the results of render_config_templates() as newline-delimited JSON.
+    """
+    for result in results:
+        yield json.dumps(serialize_render_result(*result)) + '\n'
+
+
+def stream_tar(results):
+    """
+    Stream the results of render_config_templates() as a tar archive containing a file for each object. The output of
+    any object which failed to render is replaced with a file containing the error message (with the extension
+    ".error").
+    """
+    buffer = io.BytesIO()
+    filenames = set()
+    mtime = timezone.now().timestamp()
+
+    with tarfile.open(fileobj=buffer, mode='w|') as tar:
+        for instance, configtemplate, output, error in results:
+            name = str(instance.name or instance.pk).replace('/', '_')
+            if name in filenames:
+                name = f'{name}-{instance.pk}'
+            filenames.add(name)
+
+            if error:
+                filename, content = f'{name}.error', error
+            elif configtemplate.file_extension:
+                filename, content = f'{name}.{configtemplate.file_extension}', output
+            else:
+                filename, content = name, output
+
+            content = content.encode()
+            tarinfo = tarfile.TarInfo(name=filename)
+            tarinfo.size = len(content)
+            tarinfo.mtime = mtime
+            tar.addfile(tarinfo, io.BytesIO(content))
+
+            # Hand off any archive data written so far
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
@@ -21,6 +21,11 @@ WEBHOOK_EVENT_TYPES = {
     JOB_ERRORED: 'job_ended',
 }
 
+# EventRules
+EVENT_RULES_CACHE_VERSION_KEY = 'event_rules_version'
+# Seconds for which each process relies on its last-read version of the event rules index
+EVENT_RULES_CACHE_VERSION_TTL = 1
+
 # Dashboard
 DEFAULT_DASHBOARD = [
     {
@@ -1,8 +1,10 @@
 import logging
+import threading
 from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
 from django.utils import timezone
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext as _
@@ -13,14 +15,97 @@ from netbox.config import get_config
 from netbox.constants import RQ_QUEUE_DEFAULT
 from netbox.registry import registry
 from users.models import User
-from utilities.api import get_serializer_for_model
+from utilities.api import get_prefetches_for_serializer, get_serializer_for_model
 from utilities.rqworker import get_rq_retry
 from utilities.serialization import serialize_object
 from .choices import EventRuleActionChoices
 from .models import EventRule
+from .utils import get_event_rules_cache_version, invalidate_event_rules_cache
 
 logger = logging.getLogger('netbox.events_processor')
 
+# The maximum number of webhook deliveries handed off to each dispatcher job
+WEBHOOK_DISPATCH_CHUNK_SIZE = 1000
+
+# Process-wide index of enabled EventRules, along with the version for which it was built
+_event_rules_index = (None, {})
+_event_rules_lock = threading.Lock()
+
+# The index version assigned by the most recent change to EventRules made by each thread, which may not yet have been
+# committed (or may have been rolled back)
+_event_rules_pending = threading.local()
+
+
+def invalidate_event_rules_index():
+    """
+    Invalidate the event rules index of all processes, both immediately and once the current transaction (if any) has
+    been committed, in case the index was rebuilt with the prior state in the meantime. Until then, the current thread
+    does not share the index of other threads.
+    """
+    _event_rules_pending.version = invalidate_event_rules_cache()
+    transaction.on_commit(invalidate_event_rules_cache)
+
+
+def _build_event_rules_index():
+    index = defaultdict(lambda: defaultdict(list))
+    event_rules = EventRule.objects.filter(enabled=True).prefetch_related('object_types', 'action_object')
+    for event_rule in event_rules:
+        try:
+            event_rule.get_condition_set()
+        except ValueError as e:
+            # Skip any rule with invalid conditions, rather than failing to process events for all objects
+            logger.error(f"Ignoring event rule {event_rule} with invalid conditions: {e}")
+            continue
+        for object_type in event_rule.object_types.all():
+            for event_type in event_rule.event_types:
+                index[object_type.pk][event_type].append(event_rule)
+    return {k: dict(v) for k, v in index.items()}
+
+
+def get_event_rules_index():
+    """
+    Return an index of all enabled EventRules, mapping each object type ID to a dictionary of event types and their
+    applicable rules. The index is built once per process (with the conditions and action object of each rule loaded
+    in advance) and rebuilt whenever an EventRule or action object has been modified.
+    """
+    global _event_rules_index
+
+    version = get_event_rules_cache_version()
+
+    # Within a transaction which has modified EventRules, the index must reflect those changes, which may yet be rolled
+    # back. Build it for the current transaction only.
+    if connection.in_atomic_block and getattr(_event_rules_pending, 'version', None) == version:
+        return _build_event_rules_index()
+
+    if _event_rules_index[0] == version:
+        return _event_rules_index[1]
+
+    with _event_rules_lock:
+        if _event_rules_index[0] == version:
+            return _event_rules_index[1]
+
+        # The index is retained for the version read before it was built. Any change committed in the meantime assigns
+        # a new version.
+        _event_rules_index = (version, _build_event_rules_index())
+
+    return _event_rules_index[1]
+
+
+def get_event_rules(object_type, event_type):
+    """
+    Return all enabled EventRules for the given object type and event type.
+    """
+    if object_type is None:
+        return []
+    return get_event_rules_index().get(object_type.pk, {}).get(event_type, [])
+
+
+def has_event_rules(object_type):
+    """
+    Return True if any enabled EventRule applies to the given object type.
+    """
+    return object_type.pk in get_event_rules_index()
+
 
 def serialize_for_event(instance):
     """
@@ -52,8 +137,7 @@ def get_snapshots(instance, event_type):
 
 def enqueue_event(queue, instance, user, request_id, event_type):
     """
-    Enqueue a serialized representation of a created/updated/deleted object for the processing of
-    events once the request has completed.
+    Enqueue a created/updated/deleted object for the processing of events once the request has completed.
     """
     # Determine whether this type of object supports event rules
     app_label = instance._meta.app_label
@@ -61,28 +145,75 @@ def enqueue_event(queue, instance, user, request_id, event_type):
     if model_name not in registry['model_features']['event_rules'].get(app_label, []):
         return
 
+    # Skip objects to which no EventRules apply, unless additional event pipelines have been configured
+    object_type = ContentType.objects.get_for_model(instance)
+    if settings.EVENTS_PIPELINE == ['extras.events.process_event_queue'] and not has_event_rules(object_type):
+        return
+
     assert instance.pk is not None
     key = f'{app_label}.{model_name}:{instance.pk}'
-    if key in queue:
-        queue[key]['data'] = serialize_for_event(instance)
-        queue[key]['snapshots']['postchange'] = get_snapshots(instance, event_type)['postchange']
-        # If the object is being deleted, update any prior "update" event to "delete"
-        if event_type == OBJECT_DELETED:
-            queue[key]['event_type'] = event_type
-    else:
+    if key not in queue:
         queue[key] = {
-            'object_type': ContentType.objects.get_for_model(instance),
+            'object_type': object_type,
             'object_id': instance.pk,
             'event_type': event_type,
-            'data': serialize_for_event(instance),
-            'snapshots': get_snapshots(instance, event_type),
+            'data': None,
+            'snapshots': {
+                'prechange': getattr(instance, '_prechange_snapshot', None),
+                'postchange': None,
+            },
             'username': user.username,
             'request_id': request_id
         }
+    elif event_type == OBJECT_DELETED:
+        # If the object is being deleted, update any prior "update" event to "delete"
+        queue[key]['event_type'] = event_type
+
+    # Serialization of created and updated objects is deferred until the queue is flushed (see serialize_events()).
+    # A deleted object must be serialized while it still exists.
+    if event_type == OBJECT_DELETED:
+        queue[key]['data'] = serialize_for_event(instance)
+        queue[key]['snapshots']['postchange'] = None
+
+
+def serialize_events(events):
+    """
+    Complete the serialized data and postchange snapshots of all queued events for which serialization has been
+    deferred. The objects of each type are retrieved in bulk (along with their related objects) and serialized once.
+    Events for objects which no longer exist, or to which no EventRules apply (unless additional event pipelines have
+    been configured), are discarded. Returns the list of remaining events.
+    """
+    filter_events = settings.EVENTS_PIPELINE == ['extras.events.process_event_queue']
+    deferred_events = defaultdict(dict)
+    for event in events:
+        if event['data'] is not None:
+            continue
+        if filter_events and not get_event_rules(event['object_type'], event['event_type']):
+            continue
+        deferred_events[event['object_type']][event['object_id']] = event
 
+    for object_type, object_events in deferred_events.items():
+        model = object_type.model_class()
+        serializer_class = get_serializer_for_model(model)
+        queryset = model.objects.filter(pk__in=object_events).prefetch_related(
+            *get_prefetches_for_serializer(serializer_class)
+        )
+        for instance in queryset:
+            event = object_events[instance.pk]
+            event['data'] = serialize_for_event(instance)
+            event['snapshots']['postchange'] = get_snapshots(instance, event['event_type'])['postchange']
 
-def process_event_rules(event_rules, object_type, event_type, data, username=None, snapshots=None, request_id=None):
-    user = User.objects.get(username=username) if username else None
+    return [event for event in events if event['data'] is not None]
+
+
+def process_event_rules(event_rules, object_type, event_type, data, username=None, snapshots=None, request_id=None,
+                        deliveries=None):
+    """
+    Carry out the actions of the given EventRules for an event. If a list of webhook deliveries is passed, webhooks to
+    be sent by the concurrent dispatcher are appended to it for the caller to enqueue; otherwise, each is enqueued
+    immediately.
+    """
+    user = None
 
     for event_rule in event_rules:
 
@@ -91,7 +222,7 @@ def process_event_rules(event_rules, object_type, event_type, data, username=Non
             continue
 
         # Compile event data
-        event_data = event_rule.action_data or {}
+        event_data = {**(event_rule.action_data or {})}
         event_data.update(data)
 
         # Webhooks
@@ -117,6 +248,15 @@ def process_event_rules(event_rules, object_type, event_type, data, username=Non
             if request_id:
                 params["request_id"] = request_id
 
+            # Webhooks with a batch size greater than one are always sent by the dispatcher
+            if settings.WEBHOOK_DISPATCH_WORKERS or event_rule.action_object.batch_size > 1:
+                params.pop("retry")
+                if deliveries is not None:
+                    deliveries.append(params)
+                else:
+                    rq_queue.enqueue("extras.webhooks.send_webhooks", [params])
+                continue
+
             # Enqueue the task
             rq_queue.enqueue(
                 "extras.webhooks.send_webhook",
@@ -127,6 +267,8 @@ def process_event_rules(event_rules, object_type, event_type, data, username=Non
         elif event_rule.action_type == EventRuleActionChoices.SCRIPT:
             # Resolve the script from action parameters
             script = event_rule.action_object.python_class()
+            if user is None and username:
+                user = User.objects.get(username=username)
 
             # Enqueue a Job to record the script's execution
             from extras.jobs import ScriptJob
@@ -157,36 +299,37 @@ def process_event_queue(events):
     """
     Flush a list of object representation to RQ for EventRule processing.
     """
-    events_cache = defaultdict(dict)
+    deliveries = []
 
     for event in events:
-        event_type = event['event_type']
-        object_type = event['object_type']
-
-        # Cache applicable Event Rules
-        if object_type not in events_cache[event_type]:
-            events_cache[event_type][object_type] = EventRule.objects.filter(
-                event_types__contains=[event['event_type']],
-                object_types=object_type,
-                enabled=True
-            )
-        event_rules = events_cache[event_type][object_type]
+        event_rules = get_event_rules(event['object_type'], event['event_type'])
+        if not event_rules:
+            continue
 
         process_event_rules(
             event_rules=event_rules,
-            object_type=object_type,
+            object_type=event['object_type'],
             event_type=event['event_type'],
             data=event['data'],
             username=event['username'],
             snapshots=event['snapshots'],
-            request_id=event['request_id']
+            request_id=event['request_id'],
+            deliveries=deliveries
         )
 
+    # Hand off webhooks to the concurrent dispatcher in chunks
+    if deliveries:
+        rq_queue = get_queue(get_config().QUEUE_MAPPINGS.get('webhook', RQ_QUEUE_DEFAULT))
+        for i in range(0, len(deliveries), WEBHOOK_DISPATCH_CHUNK_SIZE):
+            rq_queue.enqueue("extras.webhooks.send_webhooks", deliveries[i:i + WEBHOOK_DISPATCH_CHUNK_SIZE])
+
 
 def flush_events(events):
     """
     Flush a list of object representations to RQ for event processing.
     """
+    if events:
+        events = serialize_events(events)
     if events:
         for name in settings.EVENTS_PIPELINE:
             try:
@@ -2,10 +2,12 @@ import logging
 import traceback
 from contextlib import ExitStack
 
+from django.apps import apps
 from django.db import transaction
 from django.utils.translation import gettext as _
 
 from core.signals import clear_events
+from extras.configtemplates import render_config_templates, serialize_render_result
 from extras.models import Script as ScriptModel
 from netbox.jobs import JobRunner
 from netbox.registry import registry
@@ -107,3 +109,18 @@ class ScriptJob(JobRunner):
                 self.run_script(script, request, data, commit)
         else:
             self.run_script(script, request, data, commit)
+
+
+class RenderConfigsJob(JobRunner):
+    """
+    Render the preferred ConfigTemplate for a set of Devices or VirtualMachines, saving the results as the job's data.
+    """
+
+    class Meta:
+        name = 'Render Configs'
+
+    def run(self, model, pks, context=None, *args, **kwargs):
+        queryset = apps.get_model(model).objects.filter(pk__in=pks)
+        self.job.data = [
+            serialize_render_result(*result) for result in render_config_templates(queryset, context=context)
+        ]
@@ -1,9 +1,48 @@
+import multiprocessing
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from extras.models import CachedValue
 from netbox.registry import registry
-from netbox.search.backends import search_backend
+from netbox.search.backends import CachedValueSearchBackend, search_backend
+
+STAGING_TABLE = f'{CachedValue._meta.db_table}_staging'
+COPY_COLUMNS = ('id', 'timestamp', 'object_type_id', 'object_id', 'field', 'type', 'value', 'weight')
+
+
+def index_chunk(label, pk_min, pk_max):
+    """
+    Cache all objects of the specified model having a primary key within [pk_min, pk_max) by streaming their cached
+    values into the staging table using COPY. (pk_max may be None to indicate no upper bound.) Returns the number of
+    values written.
+    """
+    indexer = registry['search'][label]
+
+    queryset = indexer.model.objects.filter(pk__gte=pk_min)
+    if pk_max is not None:
+        queryset = queryset.filter(pk__lt=pk_max)
+
+    # Compile the chunk's values up front: the connection cannot fetch rows while a COPY is in progress
+    values = list(search_backend.get_cached_values(queryset, indexer))
+
+    timestamp = timezone.now()
+    with connection.cursor() as cursor:
+        sql = f'COPY {connection.ops.quote_name(STAGING_TABLE)} ({", ".join(COPY_COLUMNS)}) FROM STDIN'
+        with cursor.copy(sql) as copy:
+            for value in values:
+                copy.write_row((
+                    value.id, timestamp, value.object_type_id, value.object_id, value.field, value.type,
+                    str(value.value), value.weight
+                ))
+
+    return len(values)
 
 
 class Command(BaseCommand):
@@ -21,6 +60,19 @@ class Command(BaseCommand):
             action='store_true',
             help="For each model, reindex objects only if no cache entries already exist"
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help="Rebuild the cache in a staging table using the specified number of worker processes, replacing the "
+                 "existing cache only once complete"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            dest='batch_size',
+            help="Number of objects indexed by each worker task (default: 10000)"
+        )
 
     def _get_indexers(self, *model_names):
         indexers = {}
@@ -59,17 +111,182 @@ class Command(BaseCommand):
 
         return indexers
 
-    def handle(self, *model_labels, **kwargs):
+    def _get_chunks(self, model, batch_size):
+        """
+        Divide the objects of a model into consecutive ranges of primary keys, each containing up to batch_size objects.
+        Yields two-tuples of (first PK, next chunk's first PK or None).
+        """
+        pks = model.objects.order_by('pk').values_list('pk', flat=True)
+        start = pks.first()
+        while start is not None:
+            end = next(iter(pks.filter(pk__gte=start)[batch_size:batch_size + 1]), None)
+            yield start, end
+            start = end
 
-        # Determine which models to reindex
-        indexers = self._get_indexers(*model_labels)
-        if not indexers:
-            raise CommandError(_("No indexers found!"))
-        self.stdout.write(f'Reindexing {len(indexers)} models.')
+    def _create_staging_table(self):
+        table = connection.ops.quote_name(CachedValue._meta.db_table)
+        staging_table = connection.ops.quote_name(STAGING_TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {staging_table}')
+            # Indexes and foreign keys are added once the table has been populated
+            cursor.execute(f'CREATE TABLE {staging_table} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+
+    def _drop_staging_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {connection.ops.quote_name(STAGING_TABLE)}')
+
+    def _replace_table(self):
+        """
+        Replace the live cache table with the populated staging table. All indexes and constraints of the live table
+        are first recreated on the staging table (under temporary names), so that the live table remains searchable
+        until it is swapped out within a single transaction.
+        """
+        table = CachedValue._meta.db_table
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')",
+                [table]
+            )
+            constraints = cursor.fetchall()
+            cursor.execute(
+                'SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s',
+                [table]
+            )
+            indexes = cursor.fetchall()
+
+            # Build all indexes on the staging table. Indexes backing a primary key or unique constraint are
+            # attached to their constraints when the tables are swapped.
+            renames = {}
+            for i, (name, definition) in enumerate(indexes):
+                temp_name = f'{STAGING_TABLE}_{i}'
+                cursor.execute(re.sub(
+                    r'^(CREATE (?:UNIQUE )?INDEX) \S+ ON (?:ONLY )?\S+ ',
+                    lambda m: f'{m.group(1)} {qn(temp_name)} ON {qn(STAGING_TABLE)} ',
+                    definition
+                ))
+                renames[name] = temp_name
+
+            with transaction.atomic():
+                cursor.execute(f'DROP TABLE {qn(table)}')
+                cursor.execute(f'ALTER TABLE {qn(STAGING_TABLE)} RENAME TO {qn(table)}')
+                for name, contype, definition in constraints:
+                    if contype in ('p', 'u'):
+                        cursor.execute(
+                            f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} '
+                            f'{"PRIMARY KEY" if contype == "p" else "UNIQUE"} USING INDEX {qn(renames.pop(name))}'
+                        )
+                    else:
+                        # Defer validation of foreign keys to avoid holding a lock on the table
+                        cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition} NOT VALID')
+                for name, temp_name in renames.items():
+                    cursor.execute(f'ALTER INDEX {qn(temp_name)} RENAME TO {qn(name)}')
+
+            for name, contype, definition in constraints:
+                if contype == 'f':
+                    cursor.execute(f'ALTER TABLE {qn(table)} VALIDATE CONSTRAINT {qn(name)}')
+
+    def _replace_object_types(self, content_types):
+        """
+        Replace the cached values for the specified object types with those in the staging table.
+        """
+        table = connection.ops.quote_name(CachedValue._meta.db_table)
+        staging_table = connection.ops.quote_name(STAGING_TABLE)
+        with transaction.atomic():
+            CachedValue.objects.filter(object_type__in=content_types)._raw_delete(using=connection.alias)
+            with connection.cursor() as cursor:
+                cursor.execute(f'INSERT INTO {table} SELECT * FROM {staging_table}')
+
+    def _catch_up(self, indexers, since):
+        """
+        Re-cache any objects which have been created, modified, or deleted since the specified time. Values cached for
+        these objects by concurrent requests were written to the live table, and are lost when it is replaced.
+        Returns the number of objects re-cached.
+        """
+        queue = {}
+        for model in indexers:
+            label = f'{model._meta.app_label}.{model._meta.model_name}'
+            object_type = ContentType.objects.get_for_model(model)
 
+            # Objects created or modified during the rebuild (for models which record modification times)
+            pks = set()
+            if any(field.name == 'last_updated' for field in model._meta.concrete_fields):
+                pks.update(model.objects.filter(last_updated__gte=since).values_list('pk', flat=True))
+
+            # Objects deleted during the rebuild (processing the queue removes their cached values)
+            pks.update(
+                CachedValue.objects.filter(object_type=object_type).exclude(
+                    object_id__in=model.objects.values('pk')
+                ).values_list('object_id', flat=True).distinct()
+            )
+
+            if pks:
+                queue[label] = pks
+
+        search_backend.process_queue(queue)
+        return sum(len(pks) for pks in queue.values())
+
+    def _reindex_staged(self, indexers, workers, batch_size, partial=False):
+        """
+        Rebuild the search cache for the specified models in a staging table, sharding each model by ranges of
+        primary keys across a pool of worker processes. The existing cache remains in use until it is replaced.
+        Objects changed while the rebuild runs are re-cached once the staging table has been swapped in. (Changes to
+        models which do not record a last_updated time are not caught up, other than deletions.)
+        """
+        started = timezone.now()
+        labels = {model: f'{model._meta.app_label}.{model._meta.model_name}' for model in indexers}
+        tasks = [
+            (labels[model], start, end)
+            for model in indexers
+            for start, end in self._get_chunks(model, batch_size)
+        ]
+        self.stdout.write(f'Indexing models ({len(tasks)} tasks across {workers} workers)... ', ending='')
+        self.stdout.flush()
+
+        self._create_staging_table()
+        counts = defaultdict(int)
+        try:
+            if workers > 1:
+                # Close database connections so that they are not shared with the forked worker processes
+                connections.close_all()
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as executor:
+                    futures = {executor.submit(index_chunk, *task): task[0] for task in tasks}
+                    for future in as_completed(futures):
+                        counts[futures[future]] += future.result()
+            else:
+                for task in tasks:
+                    counts[task[0]] += index_chunk(*task)
+            self.stdout.write('Done.')
+
+            self.stdout.write('Replacing cached values... ', ending='')
+            self.stdout.flush()
+            if partial:
+                self._replace_object_types([ContentType.objects.get_for_model(model) for model in indexers])
+            else:
+                self._replace_table()
+            self.stdout.write('Done.')
+        finally:
+            self._drop_staging_table()
+
+        self.stdout.write('Re-caching objects changed during rebuild... ', ending='')
+        self.stdout.flush()
+        self.stdout.write(f'{self._catch_up(indexers, started)} objects re-cached.')
+
+        for label in labels.values():
+            if i := counts[label]:
+                self.stdout.write(f'  {label}: {i} entries cached.')
+            else:
+                self.stdout.write(f'  {label}: No objects found.')
+
+    def _reindex(self, indexers, lazy=False, partial=False):
+        """
+        Clear and rebuild the search cache for the specified models in place.
+        """
         # Clear cached values for the specified models (if not being lazy)
-        if not kwargs['lazy']:
-            if model_labels:
+        if not lazy:
+            if partial:
                 content_types = [ContentType.objects.get_for_model(model) for model in indexers.keys()]
             else:
                 content_types = None
@@ -87,7 +304,7 @@ class Command(BaseCommand):
             self.stdout.write(f'  {app_label}.{model_name}... ', ending='')
             self.stdout.flush()
 
-            if kwargs['lazy']:
+            if lazy:
                 content_type = ContentType.objects.get_for_model(model)
                 if cached_count := search_backend.count(object_types=[content_type]):
                     self.stdout.write(f'Skipping (found {cached_count} existing).')
@@ -99,6 +316,31 @@ class Command(BaseCommand):
             else:
                 self.stdout.write('No objects found.')
 
+    def handle(self, *model_labels, **kwargs):
+
+        # Determine which models to reindex
+        indexers = self._get_indexers(*model_labels)
+        if not indexers:
+            raise CommandError(_("No indexers found!"))
+        self.stdout.write(f'Reindexing {len(indexers)} models.')
+
+        # Rebuild the cache out of place
+        if kwargs['workers'] is not None:
+            if kwargs['lazy']:
+                raise CommandError(_("The --lazy and --workers options are mutually exclusive."))
+            if kwargs['workers'] < 1 or kwargs['batch_size'] < 1:
+                raise CommandError(_("The number of workers and batch size must be positive integers."))
+            if not isinstance(search_backend, CachedValueSearchBackend):
+                raise CommandError(_("The --workers option is supported only by CachedValue-based search backends."))
+            self._reindex_staged(
+                indexers,
+                workers=kwargs['workers'],
+                batch_size=kwargs['batch_size'],
+                partial=bool(model_labels)
+            )
+        else:
+            self._reindex(indexers, lazy=kwargs['lazy'], partial=bool(model_labels))
+
         msg = 'Completed.'
         if total_count := search_backend.size:
             msg += f' Total entries: {total_count}'
@@ -0,0 +1,23 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from extras.configcontexts import CONFIG_CONTEXT_MODELS, update_config_contexts
+
+
+class Command(BaseCommand):
+    help = "Compile and store the merged config context data of all devices and virtual machines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, dest='chunk_size',
+            help="Number of objects to update at once (default: 1000)"
+        )
+
+    def handle(self, *model_names, **options):
+        for label in CONFIG_CONTEXT_MODELS:
+            model = apps.get_model(label)
+            self.stdout.write(f'Updating {model.objects.count()} {model._meta.verbose_name_plural}...')
+            count = update_config_contexts(model, chunk_size=options['chunk_size'])
+            self.stdout.write(f'Updated {count} {model._meta.verbose_name_plural}')
+
+        self.stdout.write(self.style.SUCCESS('Finished.'))
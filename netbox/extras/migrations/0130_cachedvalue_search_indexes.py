@@ -0,0 +1,32 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0129_fix_script_paths'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='cachedvalue',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('value'), name='gin_trgm_ops'
+                ),
+                name='extras_cachedvalue_value_trgm'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='cachedvalue',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector('value', config='simple'),
+                name='extras_cachedvalue_value_fts'
+            ),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from functools import cache
+
 from django.apps import apps
 from django.conf import settings
 from django.core.validators import ValidationError
@@ -167,9 +169,25 @@ class ConfigContextModel(models.Model):
         )
     )
 
+    # Attributes which determine the ConfigContexts applicable to an object
+    config_context_fields = ('site', 'location', 'device_type', 'role', 'platform', 'cluster', 'tenant')
+
     class Meta:
         abstract = True
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Save the original assignments to detect any changes affecting the applicable ConfigContexts
+        self._original_config_context_assignments = self.get_config_context_assignments()
+
+    def serialize_object(self, exclude=None):
+        # Omit any stored config context data, which is derived from the applicable ConfigContexts
+        return super().serialize_object(exclude=[*(exclude or []), '_config_context'])
+
+    def get_config_context_assignments(self):
+        return tuple(self.__dict__.get(f'{field}_id') for field in self.config_context_fields)
+
     def get_config_context(self):
         """
         Compile all config data, overwriting lower-weight values with higher-weight values where a collision occurs.
@@ -177,7 +195,10 @@ class ConfigContextModel(models.Model):
         """
         data = {}
 
-        if not hasattr(self, 'config_context_data'):
+        if settings.MATERIALIZE_CONFIG_CONTEXTS and getattr(self, '_config_context', None) is not None:
+            # Use the stored merge of all applicable config contexts
+            config_context_data = [self._config_context]
+        elif not hasattr(self, 'config_context_data'):
             # The annotation is not available, so we fall back to manually querying for the config context objects
             config_context_data = ConfigContext.objects.get_for_object(self, aggregate_data=True) or []
         else:
@@ -207,6 +228,25 @@ class ConfigContextModel(models.Model):
 # Config templates
 #
 
+@cache
+def get_models_context():
+    """
+    Return a mapping of all registered models by app, for inclusion in the context of rendered ConfigTemplates. This is
+    compiled only once, as the model registry does not change after initialization.
+    """
+    _context = dict()
+    for app, model_names in registry['models'].items():
+        _context.setdefault(app, {})
+        for model_name in model_names:
+            try:
+                model = apps.get_registered_model(app, model_name)
+                _context[app][model.__name__] = model
+            except LookupError:
+                pass
+
+    return _context
+
+
 class ConfigTemplate(
     RenderTemplateMixin, SyncedDataMixin, CustomLinksMixin, ExportTemplatesMixin, TagsMixin, ChangeLoggedModel
 ):
@@ -239,15 +279,9 @@ class ConfigTemplate(
     sync_data.alters_data = True
 
     def get_context(self, context=None, queryset=None):
-        _context = dict()
-        for app, model_names in registry['models'].items():
-            _context.setdefault(app, {})
-            for model_name in model_names:
-                try:
-                    model = apps.get_registered_model(app, model_name)
-                    _context[app][model.__name__] = model
-                except LookupError:
-                    pass
+        _context = {
+            app: dict(models) for app, models in get_models_context().items()
+        }
 
         # Apply the provided context data, if any
         if context is not None:
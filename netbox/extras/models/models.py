@@ -4,7 +4,7 @@ import urllib.parse
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.postgres.fields import ArrayField
-from django.core.validators import ValidationError
+from django.core.validators import MinValueValidator, ValidationError
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
@@ -142,7 +142,18 @@ class EventRule(CustomFieldsMixin, ExportTemplatesMixin, TagsMixin, ChangeLogged
         if not self.conditions:
             return True
 
-        return ConditionSet(self.conditions).eval(data)
+        return self.get_condition_set().eval(data)
+
+    def get_condition_set(self):
+        """
+        Return the compiled ConditionSet for the event rule's conditions. This is reused for as long as the
+        conditions remain unchanged.
+        """
+        conditions, condition_set = getattr(self, '_condition_set', (None, None))
+        if condition_set is None or conditions != self.conditions:
+            condition_set = ConditionSet(self.conditions) if self.conditions else None
+            self._condition_set = (self.conditions, condition_set)
+        return condition_set
 
 
 class Webhook(CustomFieldsMixin, ExportTemplatesMixin, TagsMixin, ChangeLoggedModel):
@@ -225,6 +236,15 @@ class Webhook(CustomFieldsMixin, ExportTemplatesMixin, TagsMixin, ChangeLoggedMo
             "The specific CA certificate file to use for SSL verification. Leave blank to use the system defaults."
         )
     )
+    batch_size = models.PositiveSmallIntegerField(
+        verbose_name=_('batch size'),
+        default=1,
+        validators=(MinValueValidator(1),),
+        help_text=_(
+            "The maximum number of events to include in a single request. If greater than one, the context data of "
+            "each event is conveyed in a list named <code>events</code>."
+        )
+    )
     events = GenericRelation(
         EventRule,
         content_type_field='action_object_type',
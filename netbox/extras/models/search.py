@@ -1,6 +1,9 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 from netbox.search.utils import get_indexer
@@ -57,6 +60,9 @@ class CachedValue(models.Model):
         verbose_name_plural = _('cached values')
         indexes = (
             models.Index(fields=('object_type', 'object_id'), name='extras_cachedvalue_object'),
+            # Used by FullTextSearchBackend for partial matches and full-text searches
+            GinIndex(OpClass(Upper('value'), name='gin_trgm_ops'), name='extras_cachedvalue_value_trgm'),
+            GinIndex(SearchVector('value', config='simple'), name='extras_cachedvalue_value_fts'),
         )
 
     def __str__(self):
@@ -1,12 +1,16 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from core.events import *
 from core.models import ObjectType
 from core.signals import job_end, job_start
-from extras.events import process_event_rules
-from extras.models import EventRule, Notification, Subscription
+from extras.configcontexts import (
+    CONFIG_CONTEXT_DEPENDENCIES, CONFIG_CONTEXT_MODELS, enqueue_config_context_dependents,
+    enqueue_config_context_objects, enqueue_config_context_update,
+)
+from extras.events import get_event_rules, invalidate_event_rules_index, process_event_rules
+from extras.models import ConfigContext, EventRule, Notification, Script, Subscription, Webhook
 from netbox.config import get_config
 from netbox.registry import registry
 from netbox.signals import post_clean
@@ -89,20 +93,78 @@ def validate_assigned_tags(sender, instance, action, model, pk_set, **kwargs):
             raise AbortRequest(f"Tag {tag} cannot be assigned to {ct.model} objects.")
 
 
+#
+# Config contexts
+#
+
+@receiver((post_save, pre_delete), sender=ConfigContext)
+def handle_config_context_changed(sender, instance, **kwargs):
+    """
+    Queue all objects to which a created, modified, or deleted ConfigContext applies for config context recomputation.
+    """
+    enqueue_config_context_objects(instance, created=kwargs.get('created', False))
+
+
+@receiver(m2m_changed)
+def handle_config_context_assignments_changed(sender, instance, action, **kwargs):
+    """
+    Queue all objects to which a ConfigContext applied prior to a change in its assignments for config context
+    recomputation. (Objects to which it applies afterward are resolved once the queue is flushed.)
+    """
+    if isinstance(instance, ConfigContext) and action.startswith('pre_'):
+        enqueue_config_context_objects(instance)
+
+
+@receiver(post_save)
+def handle_config_context_dependency_changed(sender, instance, created, raw=False, **kwargs):
+    """
+    Queue a Device or VirtualMachine for config context recomputation if any of its attributes affecting the
+    applicable ConfigContexts have changed, or all objects depending on a related object (such as a Site) which has
+    been moved.
+    """
+    if raw:
+        return
+
+    if sender._meta.label_lower in CONFIG_CONTEXT_MODELS:
+        assignments = instance.get_config_context_assignments()
+        if created or assignments != instance._original_config_context_assignments:
+            enqueue_config_context_update(sender, {instance.pk})
+        instance._original_config_context_assignments = assignments
+    elif not created and sender._meta.label_lower in CONFIG_CONTEXT_DEPENDENCIES:
+        enqueue_config_context_dependents(instance)
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def handle_config_context_tags_changed(sender, instance, action, **kwargs):
+    """
+    Queue a Device or VirtualMachine for config context recomputation when its assigned tags change.
+    """
+    if instance._meta.label_lower in CONFIG_CONTEXT_MODELS and action.startswith('post_'):
+        enqueue_config_context_update(type(instance), {instance.pk})
+
+
 #
 # Event rules
 #
 
+@receiver((post_save, post_delete), sender=EventRule)
+@receiver((post_save, post_delete), sender=Webhook)
+@receiver((post_save, post_delete), sender=Script)
+@receiver(m2m_changed, sender=EventRule.object_types.through)
+def clear_event_rules_cache(sender, **kwargs):
+    """
+    Invalidate the event rules index of all processes when an EventRule or action object is modified.
+    """
+    if kwargs.get('action', 'post_').startswith('post_'):
+        invalidate_event_rules_index()
+
+
 @receiver(job_start)
 def process_job_start_event_rules(sender, **kwargs):
     """
     Process event rules for jobs starting.
     """
-    event_rules = EventRule.objects.filter(
-        event_types__contains=[JOB_STARTED],
-        enabled=True,
-        object_types=sender.object_type
-    )
+    event_rules = get_event_rules(sender.object_type, JOB_STARTED)
     username = sender.user.username if sender.user else None
     process_event_rules(
         event_rules=event_rules,
@@ -118,11 +180,7 @@ def process_job_end_event_rules(sender, **kwargs):
     """
     Process event rules for jobs terminating.
     """
-    event_rules = EventRule.objects.filter(
-        event_types__contains=[JOB_COMPLETED],
-        enabled=True,
-        object_types=sender.object_type
-    )
+    event_rules = get_event_rules(sender.object_type, JOB_COMPLETED)
     username = sender.user.username if sender.user else None
     process_event_rules(
         event_rules=event_rules,
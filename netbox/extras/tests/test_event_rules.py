@@ -1,10 +1,12 @@
 import json
+import time
 import uuid
 from unittest.mock import patch
 
 import django_rq
+from django.core.exceptions import ValidationError
 from django.http import HttpResponse
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from django.urls import reverse
 from requests import Session
 from rest_framework import status
@@ -12,11 +14,13 @@ from rest_framework import status
 from core.events import *
 from core.models import ObjectType
 from dcim.choices import SiteStatusChoices
-from dcim.models import Site
+from dcim.models import Region, Site
 from extras.choices import EventRuleActionChoices
-from extras.events import enqueue_event, flush_events, serialize_for_event
+from extras import events
+from extras.events import enqueue_event, flush_events, get_event_rules, serialize_for_event
 from extras.models import EventRule, Tag, Webhook
-from extras.webhooks import generate_signature, send_webhook
+from extras.utils import get_event_rules_cache_version, invalidate_event_rules_cache
+from extras.webhooks import generate_signature, send_webhook, send_webhooks
 from netbox.context_managers import event_tracking
 from utilities.testing import APITestCase
 
@@ -110,6 +114,110 @@ class EventRuleTest(APITestCase):
         # Evaluate the conditions (status='active')
         self.assertTrue(event_rule.eval_conditions(data))
 
+    def test_get_event_rules(self):
+        """
+        Check that the event rules index reflects changes to EventRules.
+        """
+        site_type = ObjectType.objects.get_for_model(Site)
+        event_rule = EventRule.objects.get(name='Event Rule 1')
+        self.assertEqual(get_event_rules(site_type, OBJECT_CREATED), [event_rule])
+        self.assertEqual(get_event_rules(site_type, JOB_STARTED), [])
+
+        event_rule.enabled = False
+        event_rule.save()
+        self.assertEqual(get_event_rules(site_type, OBJECT_CREATED), [])
+
+    def test_get_event_rules_invalid_conditions(self):
+        """
+        Check that an EventRule with invalid conditions is excluded from the index, without affecting other rules.
+        """
+        site_type = ObjectType.objects.get_for_model(Site)
+        EventRule.objects.filter(name='Event Rule 1').update(
+            conditions={'attr': 'name', 'value': '[a-z', 'op': 'regex'}
+        )
+        invalidate_event_rules_cache()
+        # Discard the index built from the modified rule once it has been rolled back
+        self.addCleanup(invalidate_event_rules_cache)
+
+        self.assertEqual(get_event_rules(site_type, OBJECT_CREATED), [])
+        self.assertEqual(get_event_rules(site_type, OBJECT_UPDATED), [EventRule.objects.get(name='Event Rule 2')])
+
+        # The invalid rule is rejected upon validation
+        with self.assertRaises(ValidationError):
+            EventRule.objects.get(name='Event Rule 1').full_clean()
+
+    def test_get_event_rules_cache_version(self):
+        """
+        Check that the event rules index version is read from the shared cache only periodically, and that changes made
+        by the current process are seen immediately.
+        """
+        version = invalidate_event_rules_cache()
+        self.addCleanup(invalidate_event_rules_cache)
+        with patch('extras.utils.cache') as cache:
+            for _ in range(5):
+                self.assertEqual(get_event_rules_cache_version(), version)
+            cache.get_or_set.assert_not_called()
+
+            # Once the local version has expired, it is read from the cache again
+            cache.get_or_set.return_value = 'new-version'
+            with patch('extras.utils.time.monotonic', return_value=time.monotonic() + 60):
+                self.assertEqual(get_event_rules_cache_version(), 'new-version')
+            cache.get_or_set.assert_called_once()
+
+            self.assertNotEqual(invalidate_event_rules_cache(), 'new-version')
+            self.assertNotEqual(get_event_rules_cache_version(), 'new-version')
+
+    def test_get_event_rules_in_transaction(self):
+        """
+        Check that the event rules index is shared within a transaction, unless the transaction has modified EventRules.
+        """
+        site_type = ObjectType.objects.get_for_model(Site)
+        event_rule = EventRule.objects.get(name='Event Rule 1')
+        invalidate_event_rules_cache()
+
+        # The index is built only once
+        with self.assertNumQueries(3):
+            for _ in range(5):
+                self.assertEqual(get_event_rules(site_type, OBJECT_CREATED), [event_rule])
+
+        # Changes to EventRules within the current transaction are reflected, but not shared
+        event_rule.enabled = False
+        event_rule.save()
+        self.assertEqual(get_event_rules(site_type, OBJECT_CREATED), [])
+        self.assertNotEqual(events._event_rules_index[0], get_event_rules_cache_version())
+
+    @override_settings(EVENTS_PIPELINE=['extras.events.process_event_queue'])
+    def test_enqueue_event_without_event_rules(self):
+        """
+        Check that no event is queued for an object to which no EventRules apply.
+        """
+        events_queue = {}
+        region = Region.objects.create(name='Region 1', slug='region-1')
+        enqueue_event(events_queue, instance=region, user=self.user, request_id=uuid.uuid4(), event_type=OBJECT_CREATED)
+        self.assertEqual(events_queue, {})
+
+    def test_deferred_serialization(self):
+        """
+        Check that queued objects are serialized once, reflecting their final state, when the queue is flushed.
+        """
+        events_queue = {}
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        enqueue_event(events_queue, instance=site, user=self.user, request_id=uuid.uuid4(), event_type=OBJECT_CREATED)
+        site.name = 'Site 2'
+        site.save()
+        enqueue_event(events_queue, instance=site, user=self.user, request_id=uuid.uuid4(), event_type=OBJECT_UPDATED)
+        self.assertIsNone(events_queue[f'dcim.site:{site.pk}']['data'])
+
+        with patch('extras.events.serialize_for_event', wraps=serialize_for_event) as mock_serialize:
+            flush_events(list(events_queue.values()))
+        self.assertEqual(mock_serialize.call_count, 1)
+
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.kwargs['event_type'], OBJECT_CREATED)
+        self.assertEqual(job.kwargs['data']['name'], 'Site 2')
+        self.assertEqual(job.kwargs['snapshots']['postchange']['name'], 'Site 2')
+
     def test_single_create_process_eventrule(self):
         """
         Check that creating an object with an applicable EventRule queues a background task for the rule's action.
@@ -390,6 +498,48 @@ class EventRuleTest(APITestCase):
         with patch.object(Session, 'send', dummy_send):
             send_webhook(**job.kwargs)
 
+    def test_send_webhooks_batched(self):
+        webhook = Webhook.objects.get(name='Webhook 1')
+        webhook.batch_size = 2
+        webhook.save()
+
+        def dummy_send(_, request, **kwargs):
+            """
+            A dummy implementation of Session.send() which records each request.
+            """
+            sent_requests.append(request)
+            return HttpResponse()
+
+        # Enqueue events for three new Sites
+        webhooks_queue = {}
+        for i in range(1, 4):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_event(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                event_type=OBJECT_CREATED
+            )
+        flush_events(list(webhooks_queue.values()))
+
+        # Verify that a single dispatcher job was queued for all events
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.func_name, 'extras.webhooks.send_webhooks')
+        self.assertEqual(len(job.args[0]), 3)
+
+        # Process the job and verify that the events were sent in two batches
+        sent_requests = []
+        with patch.object(Session, 'send', dummy_send):
+            send_webhooks(*job.args, **job.kwargs)
+        self.assertEqual(len(sent_requests), 2)
+        bodies = sorted((json.loads(request.body) for request in sent_requests), key=lambda body: len(body['events']))
+        self.assertEqual([event['data']['name'] for event in bodies[0]['events']], ['Site 3'])
+        self.assertEqual([event['data']['name'] for event in bodies[1]['events']], ['Site 1', 'Site 2'])
+        for request in sent_requests:
+            self.assertEqual(request.headers['X-Hook-Signature'], generate_signature(request.body, webhook.secret))
+
     def test_duplicate_triggers(self):
         """
         Test for erroneous duplicate event triggers resulting from saving an object multiple times
@@ -2,13 +2,18 @@ import tempfile
 from pathlib import Path
 
 from django.forms import ValidationError
-from django.test import tag, TestCase
+from django.test import override_settings, tag, TestCase
 
 from core.models import DataSource, ObjectType
-from dcim.models import Device, DeviceRole, DeviceType, Location, Manufacturer, Platform, Region, Site, SiteGroup
+from dcim.models import (
+    Device, DeviceRole, DeviceType, Location, Manufacturer, Platform, Rack, Region, Site, SiteGroup,
+)
+from extras.configcontexts import get_config_context_objects, update_config_contexts
 from extras.models import ConfigContext, ConfigTemplate, Tag
+from netbox.context import config_context_queue
 from tenancy.models import Tenant, TenantGroup
 from utilities.exceptions import AbortRequest
+from utilities.jinja2 import compile_template
 from virtualization.models import Cluster, ClusterGroup, ClusterType, VirtualMachine
 
 
@@ -517,6 +522,86 @@ class ConfigContextTest(TestCase):
         self.assertEqual(ConfigContext.objects.get_for_object(device).count(), 2)
         self.assertEqual(device.get_config_context(), annotated_queryset[0].get_config_context())
 
+    @override_settings(MATERIALIZE_CONFIG_CONTEXTS=True)
+    def test_materialized_config_context(self):
+        device = Device.objects.first()
+        context1 = ConfigContext.objects.create(name='context 1', weight=100, data={'a': 1, 'b': 2})
+        context2 = ConfigContext.objects.create(name='context 2', weight=200, data={'b': 3})
+        context2.regions.add(Region.objects.first())
+        context3 = ConfigContext.objects.create(name='context 3', weight=300, data={'b': 4})
+        context3.platforms.add(Platform.objects.first())
+
+        # Objects are matched by each ConfigContext's assignments
+        self.assertEqual(get_config_context_objects(context2), {
+            'dcim.device': {device.pk},
+            'virtualization.virtualmachine': set(),
+        })
+        self.assertEqual(get_config_context_objects(context3)['dcim.device'], set())
+
+        # Only objects with changed data are updated
+        self.assertEqual(update_config_contexts(Device), 1)
+        self.assertEqual(update_config_contexts(Device, [device.pk]), 0)
+        device.refresh_from_db()
+        self.assertEqual(device._config_context, {'a': 1, 'b': 3})
+
+        # The stored data is used in place of the source contexts
+        ConfigContext.objects.filter(pk=context1.pk).update(data={'a': 10})
+        device.local_context_data = {'c': 5}
+        self.assertEqual(device.get_config_context(), {'a': 1, 'b': 3, 'c': 5})
+
+        # Changes affecting the applicable ConfigContexts queue the affected objects for recomputation
+        token = config_context_queue.set({})
+        try:
+            device.save()
+            self.assertEqual(config_context_queue.get(), {})
+            device.platform = Platform.objects.first()
+            device.save()
+            context3.platforms.clear()
+            queue = config_context_queue.get()
+        finally:
+            config_context_queue.reset(token)
+        self.assertEqual(queue, {
+            'dcim.device': {device.pk},
+            'extras.configcontext': {context3.pk},
+        })
+
+    @override_settings(MATERIALIZE_CONFIG_CONTEXTS=True)
+    def test_materialized_config_context_site_change(self):
+        device = Device.objects.first()
+        site2 = Site.objects.create(name='Site 2', slug='site-2')
+        rack = Rack.objects.create(name='Rack 1', site=device.site, location=device.location)
+        device.rack = rack
+        device.save()
+        context = ConfigContext.objects.create(name='context 1', weight=100, data={'a': 1})
+        context.sites.add(device.site)
+
+        # Moving a Rack to a different Site invalidates the stored data of its Devices
+        update_config_contexts(Device)
+        rack.snapshot()
+        rack.site = site2
+        rack.location = None
+        with self.captureOnCommitCallbacks(execute=True):
+            rack.save()
+        device.refresh_from_db()
+        self.assertEqual(device.site, site2)
+        self.assertIsNone(device._config_context)
+        self.assertEqual(device.get_config_context(), {})
+
+        # Moving a Location to a different Site invalidates the stored data of its Devices
+        context.sites.set([site2])
+        location = Location.objects.create(name='Location 2', slug='location-2', site=site2)
+        Rack.objects.filter(pk=rack.pk).update(location=location)
+        Device.objects.filter(pk=device.pk).update(location=location)
+        update_config_contexts(Device)
+        location.snapshot()
+        location.site = Site.objects.get(name='Site 1')
+        with self.captureOnCommitCallbacks(execute=True):
+            location.save()
+        device.refresh_from_db()
+        self.assertEqual(device.site, location.site)
+        self.assertIsNone(device._config_context)
+        self.assertEqual(device.get_config_context(), {})
+
     def test_valid_local_context_data(self):
         device = Device.objects.first()
         device.local_context_data = None
@@ -606,3 +691,14 @@ class ConfigTemplateTest(TestCase):
     @tag('regression')
     def test_config_template_with_data_source_nested_templates(self):
         self.assertEqual(self.BASE_TEMPLATE, self.main_config_template.render({}))
+
+    def test_config_template_cached(self):
+        config_template = ConfigTemplate(name='Template', template_code='Cached {{ foo }}')
+        self.assertEqual(config_template.render({'foo': 1}), 'Cached 1')
+        hits = compile_template.cache_info().hits
+        self.assertEqual(config_template.render({'foo': 2}), 'Cached 2')
+        self.assertEqual(compile_template.cache_info().hits, hits + 1)
+
+        # Changes to the template code are reflected
+        config_template.template_code = 'Changed {{ foo }}'
+        self.assertEqual(config_template.render({'foo': 3}), 'Changed 3')
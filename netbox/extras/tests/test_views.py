@@ -362,14 +362,15 @@ class WebhookTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             'payload_url': 'http://example.com/?x',
             'http_method': 'GET',
             'http_content_type': 'application/foo',
+            'batch_size': 10,
             'description': 'My webhook',
         }
 
         cls.csv_data = (
-            "name,payload_url,http_method,http_content_type,description",
-            "Webhook 4,http://example.com/?4,GET,application/json,Foo",
-            "Webhook 5,http://example.com/?5,GET,application/json,Bar",
-            "Webhook 6,http://example.com/?6,GET,application/json,Baz",
+            "name,payload_url,http_method,http_content_type,batch_size,description",
+            "Webhook 4,http://example.com/?4,GET,application/json,1,Foo",
+            "Webhook 5,http://example.com/?5,GET,application/json,1,Bar",
+            "Webhook 6,http://example.com/?6,GET,application/json,10,Baz",
         )
 
         cls.csv_update_data = (
@@ -1,22 +1,31 @@
 import importlib
+import time
+import uuid
 
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.db import models
 from django.db.models import Q
 from taggit.managers import _TaggableManager
 
 from netbox.context import current_request
+from .constants import EVENT_RULES_CACHE_VERSION_KEY, EVENT_RULES_CACHE_VERSION_TTL
 from .validators import CustomValidator
 
 __all__ = (
     'SharedObjectViewMixin',
+    'get_event_rules_cache_version',
     'image_upload',
+    'invalidate_event_rules_cache',
     'is_report',
     'is_script',
     'is_taggable',
     'run_validators',
 )
 
+# The last version of the event rules index read by this process, and when it must next be read from the cache
+_event_rules_cache_version = (None, 0)
+
 
 class SharedObjectViewMixin:
 
@@ -120,3 +129,30 @@ def run_validators(instance, validators):
             raise ImproperlyConfigured(f"Invalid value for custom validator: {validator}")
 
         validator(instance, request)
+
+
+def get_event_rules_cache_version():
+    """
+    Return the current version of the event rules index. Any index built for a prior version is discarded. The version
+    is read from the shared cache at most once every EVENT_RULES_CACHE_VERSION_TTL seconds, so changes made by other
+    processes may take up to that long to be seen.
+    """
+    global _event_rules_cache_version
+
+    version, expiry = _event_rules_cache_version
+    if version is None or time.monotonic() >= expiry:
+        version = cache.get_or_set(EVENT_RULES_CACHE_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+        _event_rules_cache_version = (version, time.monotonic() + EVENT_RULES_CACHE_VERSION_TTL)
+    return version
+
+
+def invalidate_event_rules_cache():
+    """
+    Invalidate the event rules index of all processes by assigning a new version, which is returned.
+    """
+    global _event_rules_cache_version
+
+    version = uuid.uuid4().hex
+    cache.set(EVENT_RULES_CACHE_VERSION_KEY, version, None)
+    _event_rules_cache_version = (version, time.monotonic() + EVENT_RULES_CACHE_VERSION_TTL)
+    return version
@@ -1,16 +1,30 @@
 import hashlib
 import hmac
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
 
 import requests
-from django_rq import job
+from django.conf import settings
+from django_rq import get_queue, job
 from jinja2.exceptions import TemplateError
+from requests.adapters import HTTPAdapter
 
+from netbox.config import get_config
 from utilities.proxy import resolve_proxies
+from utilities.rqworker import get_queue_for_model
 from .constants import WEBHOOK_EVENT_TYPES
 
 logger = logging.getLogger('netbox.webhooks')
 
+# Persistent HTTP sessions (and their concurrency limits) for each webhook endpoint, shared by all threads within the
+# process
+_sessions = {}
+_sessions_lock = threading.Lock()
+
 
 def generate_signature(request_body, secret):
     """
@@ -24,14 +38,32 @@ def generate_signature(request_body, secret):
     return hmac_prep.hexdigest()
 
 
-@job('default')
-def send_webhook(event_rule, model_name, event_type, data, timestamp, username, request_id=None, snapshots=None):
+def get_session(url):
     """
-    Make a POST request to the defined Webhook
+    Return the persistent HTTP session used to send requests to the endpoint (scheme, host, and port) of the given
+    URL, along with a semaphore limiting the number of concurrent requests to WEBHOOK_MAX_CONNECTIONS.
     """
-    webhook = event_rule.action_object
+    url = urlsplit(url)
+    key = (url.scheme, url.netloc)
 
-    # Prepare context data for headers & body templates
+    with _sessions_lock:
+        if key not in _sessions:
+            max_connections = settings.WEBHOOK_MAX_CONNECTIONS
+            session = requests.Session()
+            # Never retain cookies, as the session is shared by all webhooks sent to the endpoint
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = (session, threading.BoundedSemaphore(max_connections))
+
+        return _sessions[key]
+
+
+def get_webhook_context(model_name, event_type, data, timestamp, username, request_id=None, snapshots=None):
+    """
+    Return the context data for rendering the headers, body, and URL of a webhook for the given event.
+    """
     context = {
         'event': WEBHOOK_EVENT_TYPES.get(event_type, event_type),
         'timestamp': timestamp,
@@ -45,6 +77,13 @@ def send_webhook(event_rule, model_name, event_type, data, timestamp, username,
             'snapshots': snapshots
         })
 
+    return context
+
+
+def prepare_webhook_request(webhook, context):
+    """
+    Render and return the HTTP request for the given Webhook, using the provided context data.
+    """
     # Build the headers for the HTTP request
     headers = {
         'Content-Type': webhook.http_content_type,
@@ -63,16 +102,12 @@ def send_webhook(event_rule, model_name, event_type, data, timestamp, username,
         raise e
 
     # Prepare the HTTP request
-    url = webhook.render_payload_url(context)
     params = {
         'method': webhook.http_method,
-        'url': url,
+        'url': webhook.render_payload_url(context),
         'headers': headers,
         'data': body.encode('utf8'),
     }
-    logger.info(
-        f"Sending {params['method']} request to {params['url']} ({context['model']} {context['event']})"
-    )
     logger.debug(params)
     try:
         prepared_request = requests.Request(**params).prepare()
@@ -84,19 +119,114 @@ def send_webhook(event_rule, model_name, event_type, data, timestamp, username,
     if webhook.secret != '':
         prepared_request.headers['X-Hook-Signature'] = generate_signature(prepared_request.body, webhook.secret)
 
-    # Send the request
-    with requests.Session() as session:
-        session.verify = webhook.ssl_verification
-        if webhook.ca_file_path:
-            session.verify = webhook.ca_file_path
-        proxies = resolve_proxies(url=url, context={'client': webhook})
-        response = session.send(prepared_request, proxies=proxies)
+    return prepared_request
+
+
+def send_webhook_request(webhook, prepared_request):
+    """
+    Send a prepared HTTP request for the given Webhook using the endpoint's persistent session. Raises
+    RequestException if the request fails or a non-2xx response is received.
+    """
+    session, semaphore = get_session(prepared_request.url)
+    verify = webhook.ca_file_path or webhook.ssl_verification
+    proxies = resolve_proxies(url=prepared_request.url, context={'client': webhook})
+
+    with semaphore:
+        response = session.send(prepared_request, verify=verify, proxies=proxies)
 
     if 200 <= response.status_code <= 299:
         logger.info(f"Request succeeded; response status {response.status_code}")
-        return f"Status {response.status_code} returned, webhook successfully processed."
+        return response
     else:
         logger.warning(f"Request failed; response status {response.status_code}: {response.content}")
         raise requests.exceptions.RequestException(
             f"Status {response.status_code} returned with content '{response.content}', webhook FAILED to process."
         )
+
+
+@job('default')
+def send_webhook(event_rule, model_name, event_type, data, timestamp, username, request_id=None, snapshots=None):
+    """
+    Make a POST request to the defined Webhook
+    """
+    webhook = event_rule.action_object
+
+    # Prepare context data for headers & body templates
+    context = get_webhook_context(model_name, event_type, data, timestamp, username, request_id, snapshots)
+
+    prepared_request = prepare_webhook_request(webhook, context)
+    logger.info(
+        f"Sending {prepared_request.method} request to {prepared_request.url} ({context['model']} {context['event']})"
+    )
+
+    # Send the request
+    response = send_webhook_request(webhook, prepared_request)
+
+    return f"Status {response.status_code} returned, webhook successfully processed."
+
+
+@job('default')
+def send_webhooks(deliveries, attempt=1):
+    """
+    Send the webhooks for a set of events concurrently, using WEBHOOK_DISPATCH_WORKERS threads. Each delivery is a
+    dictionary of the arguments accepted by send_webhook(). Events for Webhooks with a batch size greater than one are
+    grouped into as few requests as possible. Any failed deliveries are queued to be retried up to RQ_RETRY_MAX times.
+    """
+    # Group deliveries into requests
+    batches = []
+    open_batches = {}
+    for delivery in deliveries:
+        webhook = delivery['event_rule'].action_object
+        if webhook.batch_size > 1:
+            batch = open_batches.get(webhook.pk)
+            if batch is None or len(batch[1]) >= webhook.batch_size:
+                batch = open_batches[webhook.pk] = (webhook, [])
+                batches.append(batch)
+            batch[1].append(delivery)
+        else:
+            batches.append((webhook, [delivery]))
+
+    # Render all requests up front. Requests which cannot be rendered are not retried.
+    prepared_requests = []
+    errors = 0  # Number of deliveries which could not be rendered
+    for webhook, batch in batches:
+        contexts = [
+            get_webhook_context(**{k: v for k, v in delivery.items() if k != 'event_rule'}) for delivery in batch
+        ]
+        context = {'events': contexts} if webhook.batch_size > 1 else contexts[0]
+        try:
+            prepared_requests.append((webhook, batch, prepare_webhook_request(webhook, context)))
+        except (TemplateError, ValueError, requests.exceptions.RequestException):
+            errors += len(batch)
+
+    logger.info(f"Sending {len(prepared_requests)} webhook requests for {len(deliveries)} events")
+    failed = []
+    with ThreadPoolExecutor(max_workers=settings.WEBHOOK_DISPATCH_WORKERS or 1) as executor:
+        futures = [
+            (batch, executor.submit(send_webhook_request, webhook, prepared_request))
+            for webhook, batch, prepared_request in prepared_requests
+        ]
+        for batch, future in futures:
+            try:
+                future.result()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error sending webhook request: {e}")
+                failed.extend(batch)
+
+    # Queue any failed deliveries to be retried
+    config = get_config()
+    if failed and attempt <= config.RQ_RETRY_MAX:
+        interval = config.RQ_RETRY_INTERVAL
+        if type(interval) is list:
+            interval = interval[min(attempt, len(interval)) - 1]
+        logger.warning(f"Retrying {len(failed)} failed webhook deliveries in {interval} seconds")
+        get_queue(get_queue_for_model('webhook')).enqueue_in(
+            timedelta(seconds=interval), 'extras.webhooks.send_webhooks', failed, attempt=attempt + 1
+        )
+        failed = []
+    if failed or errors:
+        raise requests.exceptions.RequestException(
+            f"{len(failed) + errors} of {len(deliveries)} webhook deliveries FAILED to process."
+        )
+
+    return f"{len(prepared_requests)} webhook requests for {len(deliveries)} events successfully processed."
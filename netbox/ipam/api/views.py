@@ -1,4 +1,5 @@
 from copy import deepcopy
+from itertools import islice
 
 from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
@@ -404,13 +405,8 @@ class AvailableIPAddressesView(AvailableObjectsView):
     advisory_lock_key = 'available-ips'
 
     def get_available_objects(self, parent, limit=None):
-        # Calculate available IPs within the parent
-        ip_list = []
-        for index, ip in enumerate(parent.get_available_ips(), start=1):
-            ip_list.append(ip)
-            if index == limit:
-                break
-        return ip_list
+        # Calculate available IPs within the parent, retrieving only as many child objects as needed
+        return list(islice(parent.iter_available_ips(), limit or None))
 
     def get_extra_context(self, parent):
         return {
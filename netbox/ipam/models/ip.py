@@ -1,3 +1,5 @@
+import heapq
+
 import netaddr
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.core.exceptions import ValidationError
@@ -30,6 +32,23 @@ __all__ = (
 )
 
 
+def iter_available_ranges(first, last, occupied):
+    """
+    Yield (start, end) tuples for each contiguous run of available addresses between first and last (inclusive),
+    given an iterable of occupied (start, end) intervals ordered by start address. Intervals are consumed lazily, so
+    only those preceding the final gap returned need be retrieved.
+    """
+    cursor = first
+    for start, end in occupied:
+        if cursor > last or start > last:
+            break
+        if start > cursor:
+            yield cursor, start - 1
+        cursor = max(cursor, end + 1)
+    if cursor <= last:
+        yield cursor, last
+
+
 class GetAvailablePrefixesMixin:
 
     def get_available_prefixes(self):
@@ -404,52 +423,75 @@ class Prefix(ContactsMixin, GetAvailablePrefixesMixin, CachedScopeMixin, Primary
         else:
             return IPAddress.objects.filter(address__net_host_contained=str(self.prefix), vrf=self.vrf)
 
-    def get_available_ips(self):
+    def get_available_ip_ranges(self):
         """
-        Return all available IPs within this prefix as an IPSet.
+        Yield (start, end) integer tuples for each contiguous run of available IPs within this prefix, in order.
+        Child IP addresses and populated IP ranges are streamed from the database ordered by address, so only the
+        objects preceding the last run consumed are retrieved.
         """
-        prefix = netaddr.IPSet(self.prefix)
-        child_ips = netaddr.IPSet([
-            ip.address.ip for ip in self.get_child_ips()
-        ])
-        child_ranges = netaddr.IPSet([
-            iprange.range for iprange in self.get_child_ranges().filter(mark_populated=True)
-        ])
-        available_ips = prefix - child_ips - child_ranges
+        first, last = self.prefix.first, self.prefix.last
 
         # IPv6 /127's, pool, or IPv4 /31-/32 sets are fully usable
-        if (self.family == 6 and self.prefix.prefixlen >= 127) or self.is_pool or (
+        if not ((self.family == 6 and self.prefix.prefixlen >= 127) or self.is_pool or (
                 self.family == 4 and self.prefix.prefixlen >= 31
-        ):
-            return available_ips
-
-        if self.family == 4:
-            # For "normal" IPv4 prefixes, omit first and last addresses
-            available_ips -= netaddr.IPSet([
-                netaddr.IPAddress(self.prefix.first),
-                netaddr.IPAddress(self.prefix.last),
-            ])
-        else:
-            # For IPv6 prefixes, omit the Subnet-Router anycast address
-            # per RFC 4291
-            available_ips -= netaddr.IPSet([netaddr.IPAddress(self.prefix.first)])
+        )):
+            if self.family == 4:
+                # For "normal" IPv4 prefixes, omit first and last addresses
+                first += 1
+                last -= 1
+            else:
+                # For IPv6 prefixes, omit the Subnet-Router anycast address
+                # per RFC 4291
+                first += 1
+
+        child_ips = self.get_child_ips().order_by(
+            Cast(Host('address'), output_field=IPAddressField())
+        ).values_list('address', flat=True)
+        child_ranges = self.get_child_ranges().filter(mark_populated=True).order_by(
+            Cast(Host('start_address'), output_field=IPAddressField())
+        ).values_list('start_address', 'end_address')
+        occupied = heapq.merge(
+            ((address.ip.value, address.ip.value) for address in child_ips.iterator()),
+            ((start.ip.value, end.ip.value) for start, end in child_ranges.iterator()),
+        )
+
+        return iter_available_ranges(first, last, occupied)
 
-        return available_ips
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this prefix in order, as a netaddr.IPAddress.
+        """
+        for start, end in self.get_available_ip_ranges():
+            for value in range(start, end + 1):
+                yield netaddr.IPAddress(value, self.family)
+
+    def get_available_ips(self):
+        """
+        Return all available IPs within this prefix as an IPSet.
+        """
+        return netaddr.IPSet([
+            netaddr.IPRange(netaddr.IPAddress(start, self.family), netaddr.IPAddress(end, self.family))
+            for start, end in self.get_available_ip_ranges()
+        ])
 
     def get_first_available_ip(self):
         """
         Return the first available IP within the prefix (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        first_available_ip = next(self.iter_available_ips(), None)
+        if first_available_ip is None:
             return None
-        return '{}/{}'.format(next(available_ips.__iter__()), self.prefix.prefixlen)
+        return '{}/{}'.format(first_available_ip, self.prefix.prefixlen)
 
     def get_utilization(self):
         """
         Determine the utilization of the prefix and return it as a percentage. For Prefixes with a status of
         "container", calculate utilization based on child prefixes. For all others, count child IP addresses.
         """
+        # Return the value calculated by annotate_prefix_utilization(), if any
+        if hasattr(self, '_utilization'):
+            return self._utilization
+
         if self.mark_utilized:
             return 100
 
@@ -667,28 +709,48 @@ class IPRange(ContactsMixin, PrimaryModel):
             vrf=self.vrf
         )
 
-    def get_available_ips(self):
+    def get_available_ip_ranges(self):
         """
-        Return all available IPs within this range as an IPSet.
+        Yield (start, end) integer tuples for each contiguous run of available IPs within this range, in order. Child
+        IP addresses are streamed from the database ordered by address.
         """
         if self.mark_populated:
-            return netaddr.IPSet()
+            return iter(())
+
+        child_ips = self.get_child_ips().order_by(
+            Cast(Host('address'), output_field=IPAddressField())
+        ).values_list('address', flat=True)
+        occupied = ((address.ip.value, address.ip.value) for address in child_ips.iterator())
 
-        range = netaddr.IPRange(self.start_address.ip, self.end_address.ip)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
+        return iter_available_ranges(self.start_address.ip.value, self.end_address.ip.value, occupied)
 
-        return netaddr.IPSet(range) - child_ips
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this range in order, as a netaddr.IPAddress.
+        """
+        for start, end in self.get_available_ip_ranges():
+            for value in range(start, end + 1):
+                yield netaddr.IPAddress(value, self.family)
+
+    def get_available_ips(self):
+        """
+        Return all available IPs within this range as an IPSet.
+        """
+        return netaddr.IPSet([
+            netaddr.IPRange(netaddr.IPAddress(start, self.family), netaddr.IPAddress(end, self.family))
+            for start, end in self.get_available_ip_ranges()
+        ])
 
     @cached_property
     def first_available_ip(self):
         """
         Return the first available IP within the range (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        first_available_ip = next(self.iter_available_ips(), None)
+        if first_available_ip is None:
             return None
 
-        return '{}/{}'.format(next(available_ips.__iter__()), self.start_address.prefixlen)
+        return '{}/{}'.format(first_available_ip, self.start_address.prefixlen)
 
     @cached_property
     def utilization(self):
@@ -1,5 +1,6 @@
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.query import ModelIterable
 from django.db.models.expressions import RawSQL
 from django.db.models.functions import Round
 
@@ -33,6 +34,28 @@ class ASNRangeQuerySet(RestrictedQuerySet):
 
 
 class PrefixQuerySet(RestrictedQuerySet):
+    _annotate_utilization = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._annotate_utilization = self._annotate_utilization
+        return clone
+
+    def _fetch_all(self):
+        annotate = self._result_cache is None and self._annotate_utilization
+        super()._fetch_all()
+        if annotate and self._iterable_class is ModelIterable:
+            from .utils import annotate_prefix_utilization
+            annotate_prefix_utilization(self._result_cache)
+
+    def annotate_utilization(self):
+        """
+        Calculate the utilization of all Prefixes in bulk when the QuerySet is evaluated, rather than once per Prefix
+        when calling get_utilization(). Only the Prefixes actually retrieved (e.g. a single page) are considered.
+        """
+        clone = self._chain()
+        clone._annotate_utilization = True
+        return clone
 
     def annotate_hierarchy(self):
         """
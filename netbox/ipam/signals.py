@@ -1,29 +1,46 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from dcim.models import Device
 from virtualization.models import VirtualMachine
 from .models import IPAddress, Prefix
+from .utils import defer_prefix_hierarchy
 
 
-def update_parents_children(prefix):
+def add_to_hierarchy(prefix):
     """
-    Update depth on prefix & containing prefixes
+    Account for the addition of a prefix to the hierarchy: increment the child count of all containing prefixes and
+    the depth of all contained prefixes, then compute the depth & child count of the prefix itself.
     """
-    parents = prefix.get_parents(include_self=True).annotate_hierarchy()
-    for parent in parents:
-        parent._children = parent.hierarchy_children
-    Prefix.objects.bulk_update(parents, ['_children'], batch_size=100)
+    parents = Prefix.objects.filter(vrf_id=prefix.vrf_id, prefix__net_contains=prefix.prefix)
+    children = Prefix.objects.filter(vrf_id=prefix.vrf_id, prefix__net_contained=prefix.prefix)
 
+    parents.update(_children=F('_children') + 1)
+    # Depth counts distinct containing prefixes, so a duplicate prefix does not add a level
+    if not Prefix.objects.filter(vrf_id=prefix.vrf_id, prefix=str(prefix.prefix)).exclude(pk=prefix.pk).exists():
+        children.update(_depth=F('_depth') + 1)
 
-def update_children_depth(prefix):
+    Prefix.objects.filter(pk=prefix.pk).update(
+        _depth=parents.values('prefix').distinct().count(),
+        _children=children.count()
+    )
+
+
+def remove_from_hierarchy(vrf_id, prefix, exclude=None):
     """
-    Update children count on prefix & contained prefixes
+    Account for the removal of a prefix from the hierarchy: decrement the child count of all containing prefixes and
+    the depth of all contained prefixes. A prefix which has been moved (and will be recounted) may be excluded.
     """
-    children = prefix.get_children(include_self=True).annotate_hierarchy()
-    for child in children:
-        child._depth = child.hierarchy_depth
-    Prefix.objects.bulk_update(children, ['_depth'], batch_size=100)
+    parents = Prefix.objects.filter(vrf_id=vrf_id, prefix__net_contains=prefix).exclude(pk=exclude)
+    children = Prefix.objects.filter(vrf_id=vrf_id, prefix__net_contained=prefix).exclude(pk=exclude)
+
+    # Counts are floored at zero, as prefixes created in bulk may not have been accounted for
+    parents.update(_children=Greatest(F('_children') - 1, 0))
+    # Depth is affected only if no duplicate of the prefix remains
+    if not Prefix.objects.filter(vrf_id=vrf_id, prefix=str(prefix)).exists():
+        children.update(_depth=Greatest(F('_depth') - 1, 0))
 
 
 @receiver(post_save, sender=Prefix)
@@ -32,21 +49,21 @@ def handle_prefix_saved(instance, created, **kwargs):
     # Prefix has changed (or new instance has been created)
     if created or instance.vrf_id != instance._vrf_id or instance.prefix != instance._prefix:
 
-        update_parents_children(instance)
-        update_children_depth(instance)
+        # Defer to a full rebuild of the affected VRF(s) if enabled
+        if defer_prefix_hierarchy(instance.vrf_id) and (created or defer_prefix_hierarchy(instance._vrf_id)):
+            return
 
         # If this is not a new prefix, clean up parent/children of previous prefix
         if not created:
-            old_prefix = Prefix(vrf_id=instance._vrf_id, prefix=instance._prefix)
-            update_parents_children(old_prefix)
-            update_children_depth(old_prefix)
+            remove_from_hierarchy(instance._vrf_id, instance._prefix, exclude=instance.pk)
+        add_to_hierarchy(instance)
 
 
 @receiver(post_delete, sender=Prefix)
 def handle_prefix_deleted(instance, **kwargs):
 
-    update_parents_children(instance)
-    update_children_depth(instance)
+    if not defer_prefix_hierarchy(instance.vrf_id):
+        remove_from_hierarchy(instance.vrf_id, instance.prefix)
 
 
 @receiver(pre_delete, sender=IPAddress)
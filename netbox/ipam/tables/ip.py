@@ -4,6 +4,7 @@ from django.utils.safestring import mark_safe
 from django_tables2.utils import Accessor
 
 from ipam.models import *
+from ipam.utils import annotate_prefix_utilization
 from netbox.tables import NetBoxTable, columns
 from tenancy.tables import TenancyColumnsMixin, TenantColumn
 from .template_code import *
@@ -248,6 +249,13 @@ class PrefixTable(TenancyColumnsMixin, NetBoxTable):
             'class': lambda record: 'success' if not record.pk else '',
         }
 
+    def paginate(self, *args, **kwargs):
+        super().paginate(*args, **kwargs)
+
+        # Calculate utilization for all prefixes on the current page at once
+        if 'utilization' in self.columns and self.columns['utilization'].visible:
+            annotate_prefix_utilization(self.page.object_list.data)
+
 
 #
 # IP ranges
@@ -7,6 +7,7 @@ from utilities.data import string_to_ranges
 from dcim.models import Site, SiteGroup
 from ipam.choices import *
 from ipam.models import *
+from ipam.utils import deferred_prefix_hierarchy
 
 
 class TestAggregate(TestCase):
@@ -238,6 +239,38 @@ class TestPrefix(TestCase):
 
         self.assertEqual(available_ips, missing_ips)
 
+    def test_iter_available_ips(self):
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/28'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.1/26')),
+            IPAddress(address=IPNetwork('10.0.0.1/24')),  # Duplicate
+            IPAddress(address=IPNetwork('10.0.0.4/26')),
+            IPAddress(address=IPNetwork('10.0.0.13/26')),  # Within populated range
+        ))
+        IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.12/26'),
+            end_address=IPNetwork('10.0.0.13/26'),
+            mark_populated=True
+        )
+        available_ips = [str(ip) for ip in parent_prefix.iter_available_ips()]
+        self.assertEqual(available_ips, [
+            '10.0.0.2', '10.0.0.3', '10.0.0.5', '10.0.0.6', '10.0.0.7', '10.0.0.8', '10.0.0.9', '10.0.0.10',
+            '10.0.0.11', '10.0.0.14',
+        ])
+        self.assertEqual(parent_prefix.get_available_ips(), IPSet(available_ips))
+
+    def test_iter_available_ips_ipv6(self):
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('2001:db8::/64'))
+        IPAddress.objects.bulk_create(
+            IPAddress(address=IPNetwork(f'2001:db8::{i}/64')) for i in range(1, 5)
+        )
+        available_ips = parent_prefix.iter_available_ips()
+        self.assertEqual(
+            [str(next(available_ips)) for _ in range(3)],
+            ['2001:db8::5', '2001:db8::6', '2001:db8::7']
+        )
+        self.assertEqual(parent_prefix.get_available_ips().size, 2 ** 64 - 5)
+
     def test_get_first_available_prefix(self):
 
         prefixes = Prefix.objects.bulk_create((
@@ -305,6 +338,43 @@ class TestPrefix(TestCase):
         )
         self.assertEqual(prefix.get_utilization(), 64 / 254 * 100)  # ~25% utilization
 
+    def test_annotate_utilization(self):
+        vrf = VRF.objects.create(name='VRF 1')
+        prefixes = (
+            Prefix(prefix=IPNetwork('10.0.0.0/16'), status=PrefixStatusChoices.STATUS_CONTAINER),
+            Prefix(prefix=IPNetwork('10.0.0.0/24'), status=PrefixStatusChoices.STATUS_CONTAINER),
+            Prefix(prefix=IPNetwork('10.0.0.0/26')),
+            Prefix(prefix=IPNetwork('10.0.0.0/27')),
+            Prefix(prefix=IPNetwork('10.0.0.128/26')),
+            Prefix(prefix=IPNetwork('10.0.1.0/24'), vrf=vrf),
+            Prefix(prefix=IPNetwork('10.0.2.0/24'), mark_utilized=True),
+            Prefix(prefix=IPNetwork('2001:db8::/64')),
+        )
+        Prefix.objects.bulk_create(prefixes)
+        IPAddress.objects.bulk_create([
+            *[IPAddress(address=IPNetwork(f'10.0.0.{i}/24')) for i in range(1, 33)],
+            IPAddress(address=IPNetwork('10.0.0.1/26')),  # Duplicate
+            IPAddress(address=IPNetwork('10.0.1.1/24')),  # Global table
+            *[IPAddress(address=IPNetwork(f'10.0.1.{i}/24'), vrf=vrf) for i in range(1, 11)],
+            IPAddress(address=IPNetwork('2001:db8::1/64')),
+        ])
+        IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.17/24'),
+            end_address=IPNetwork('10.0.0.48/24'),
+            mark_utilized=True
+        )
+        IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.100/24'),
+            end_address=IPNetwork('10.0.0.109/24'),
+            mark_utilized=False
+        )
+
+        expected = {prefix.pk: prefix.get_utilization() for prefix in Prefix.objects.all()}
+        annotated = Prefix.objects.annotate_utilization()
+        with self.assertNumQueries(8):
+            utilization = {prefix.pk: prefix._utilization for prefix in annotated}
+        self.assertEqual(utilization, expected)
+
     #
     # Uniqueness enforcement tests
     #
@@ -530,6 +600,56 @@ class TestPrefixHierarchy(TestCase):
         self.assertEqual(prefixes[3]._depth, 2)
         self.assertEqual(prefixes[3]._children, 0)
 
+    def test_delete_duplicate_prefix4(self):
+        # Duplicate and then delete 10.0.0.0/16
+        duplicate = Prefix(prefix='10.0.0.0/16')
+        duplicate.save()
+        duplicate.delete()
+
+        prefixes = Prefix.objects.filter(prefix__family=4)
+        self.assertEqual(prefixes[0].prefix, IPNetwork('10.0.0.0/8'))
+        self.assertEqual(prefixes[0]._depth, 0)
+        self.assertEqual(prefixes[0]._children, 2)
+        self.assertEqual(prefixes[1].prefix, IPNetwork('10.0.0.0/16'))
+        self.assertEqual(prefixes[1]._depth, 1)
+        self.assertEqual(prefixes[1]._children, 1)
+        self.assertEqual(prefixes[2].prefix, IPNetwork('10.0.0.0/24'))
+        self.assertEqual(prefixes[2]._depth, 2)
+        self.assertEqual(prefixes[2]._children, 0)
+
+    def test_deferred_hierarchy(self):
+        vrf = VRF.objects.create(name='VRF A')
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with deferred_prefix_hierarchy():
+                Prefix(prefix='10.0.0.0/12').save()
+                Prefix(vrf=vrf, prefix='10.0.0.0/8').save()
+                Prefix(vrf=vrf, prefix='10.0.0.0/24').save()
+                Prefix.objects.filter(prefix='2001:db8::/40').delete()
+
+                # Hierarchy is not updated until the transaction has been committed
+                self.assertEqual(Prefix.objects.get(prefix='10.0.0.0/8', vrf__isnull=True)._children, 2)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertListEqual(
+            [(str(p.prefix), p._depth, p._children) for p in Prefix.objects.filter(vrf__isnull=True)],
+            [
+                ('10.0.0.0/8', 0, 3),
+                ('10.0.0.0/12', 1, 2),
+                ('10.0.0.0/16', 2, 1),
+                ('10.0.0.0/24', 3, 0),
+                ('2001:db8::/32', 0, 1),
+                ('2001:db8::/48', 1, 0),
+            ]
+        )
+        self.assertListEqual(
+            [(str(p.prefix), p._depth, p._children) for p in Prefix.objects.filter(vrf=vrf)],
+            [
+                ('10.0.0.0/8', 0, 1),
+                ('10.0.0.0/24', 1, 0),
+            ]
+        )
+
 
 class TestIPAddress(TestCase):
 
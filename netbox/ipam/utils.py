@@ -1,20 +1,32 @@
+import bisect
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 import netaddr
 
+from django.db import transaction
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
+from .choices import PrefixStatusChoices
 from .constants import *
-from .models import Prefix, VLAN
+from .models import IPAddress, IPRange, Prefix, VLAN
 
 __all__ = (
     'AvailableIPSpace',
     'add_available_vlans',
     'add_requested_prefixes',
     'annotate_ip_space',
+    'annotate_prefix_utilization',
+    'defer_prefix_hierarchy',
+    'deferred_prefix_hierarchy',
     'get_next_available_prefix',
     'rebuild_prefixes',
 )
 
+_deferred_vrfs = ContextVar('deferred_prefix_hierarchy_vrfs', default=None)
+
 
 @dataclass
 class AvailableIPSpace:
@@ -130,6 +142,88 @@ def annotate_ip_space(prefix):
     return output
 
 
+def _covered_size(intervals, first, last, exclude=None):
+    """
+    Return the number of addresses between first and last (inclusive) covered by the given list of (first, last)
+    intervals, which must be sorted by their first address. Only intervals which fall entirely within the bounds are
+    counted.
+    """
+    size = 0
+    end = first - 1
+    i = bisect.bisect_left(intervals, (first,))
+    while i < len(intervals) and intervals[i][0] <= last:
+        start, stop = intervals[i]
+        i += 1
+        if stop > last or (start, stop) == exclude:
+            continue
+        if stop > end:
+            size += stop - max(start, end + 1) + 1
+            end = stop
+    return size
+
+
+def annotate_prefix_utilization(prefixes):
+    """
+    Calculate the utilization of many Prefixes at once, caching the result on each instance for use by
+    get_utilization(). Child prefixes, IP ranges, and IP addresses are retrieved with a single query per VRF and
+    address family, and the space covered within each Prefix is summed by sweeping over the sorted child intervals.
+
+    :param prefixes: An iterable of Prefix instances
+    """
+    containers = defaultdict(list)
+    networks = defaultdict(list)
+    for prefix in prefixes:
+        if prefix.pk is None or hasattr(prefix, '_utilization'):
+            continue
+        if prefix.mark_utilized:
+            prefix._utilization = 100
+        elif prefix.status == PrefixStatusChoices.STATUS_CONTAINER:
+            containers[(prefix.vrf_id, prefix.prefix.version)].append(prefix)
+        else:
+            networks[(prefix.vrf_id, prefix.prefix.version)].append(prefix)
+
+    # Container utilization is based on child prefixes
+    for (vrf_id, family), parents in containers.items():
+        query = Q()
+        for parent in parents:
+            query |= Q(prefix__net_contained=str(parent.prefix))
+        intervals = sorted(
+            (child.first, child.last)
+            for child in Prefix.objects.filter(query, vrf_id=vrf_id).order_by().values_list('prefix', flat=True)
+        )
+        for parent in parents:
+            size = _covered_size(
+                intervals, parent.prefix.first, parent.prefix.last, exclude=(parent.prefix.first, parent.prefix.last)
+            )
+            parent._utilization = min(float(size) / parent.prefix.size * 100, 100)
+
+    # Utilization of all other prefixes is based on child IP addresses and utilized ranges
+    for (vrf_id, family), parents in networks.items():
+        ip_query = Q()
+        range_query = Q()
+        for parent in parents:
+            ip_query |= Q(address__net_host_contained=str(parent.prefix))
+            range_query |= Q(
+                start_address__net_host_contained=str(parent.prefix),
+                end_address__net_host_contained=str(parent.prefix)
+            )
+        addresses = IPAddress.objects.filter(ip_query, vrf_id=vrf_id).order_by().values_list('address', flat=True)
+        intervals = [(address.ip.value, address.ip.value) for address in addresses]
+        intervals.extend(
+            (start_address.ip.value, end_address.ip.value)
+            for start_address, end_address in IPRange.objects.filter(
+                range_query, vrf_id=vrf_id, mark_utilized=True
+            ).order_by().values_list('start_address', 'end_address')
+        )
+        intervals.sort()
+        for parent in parents:
+            size = _covered_size(intervals, parent.prefix.first, parent.prefix.last)
+            prefix_size = parent.prefix.size
+            if parent.prefix.version == 4 and parent.prefix.prefixlen < 31 and not parent.is_pool:
+                prefix_size -= 2
+            parent._utilization = min(float(size) / prefix_size * 100, 100)
+
+
 def available_vlans_from_range(vlans, vlan_group, vid_range):
     """
     Create fake records for all gaps between used VLANs
@@ -248,6 +342,37 @@ def rebuild_prefixes(vrf):
     Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
 
 
+@contextmanager
+def deferred_prefix_hierarchy():
+    """
+    Suspend the incremental maintenance of prefix depth & child counts within the block. Instead, the hierarchy of
+    each affected VRF (or the global table) is rebuilt once using rebuild_prefixes() when the current transaction is
+    committed, or at the end of the block if no transaction is active.
+    """
+    token = _deferred_vrfs.set(set())
+    try:
+        yield
+        if vrfs := _deferred_vrfs.get():
+            def rebuild():
+                for vrf in vrfs:
+                    rebuild_prefixes(vrf)
+            transaction.on_commit(rebuild)
+    finally:
+        _deferred_vrfs.reset(token)
+
+
+def defer_prefix_hierarchy(vrf):
+    """
+    Queue a rebuild of the prefix hierarchy for the specified VRF (or the global table) if within a
+    deferred_prefix_hierarchy() block. Returns True if the rebuild has been queued.
+    """
+    vrfs = _deferred_vrfs.get()
+    if vrfs is None:
+        return False
+    vrfs.add(vrf)
+    return True
+
+
 def get_next_available_prefix(ipset, prefix_size):
     """
     Given a prefix length, allocate the next available prefix from an IPSet.
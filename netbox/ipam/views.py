@@ -21,7 +21,7 @@ from . import filtersets, forms, tables
 from .choices import PrefixStatusChoices
 from .constants import *
 from .models import *
-from .utils import add_requested_prefixes, add_available_vlans, annotate_ip_space
+from .utils import add_requested_prefixes, add_available_vlans, annotate_ip_space, deferred_prefix_hierarchy
 
 
 #
@@ -667,6 +667,11 @@ class PrefixBulkImportView(generic.BulkImportView):
     queryset = Prefix.objects.all()
     model_form = forms.PrefixImportForm
 
+    def create_and_update_objects(self, form, request):
+        # Rebuild the hierarchy of each affected VRF once, rather than updating it as each prefix is saved
+        with deferred_prefix_hierarchy():
+            return super().create_and_update_objects(form, request)
+
 
 @register_model_view(Prefix, 'bulk_edit', path='edit', detail=False)
 class PrefixBulkEditView(generic.BulkEditView):
@@ -1,5 +1,11 @@
+import base64
+import binascii
+
 from django.db.models import QuerySet
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from netbox.config import get_config
 
@@ -9,12 +15,26 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Passing the `cursor` query parameter (which may be empty to request the first page) enables keyset pagination:
+    objects are ordered by primary key and each page is retrieved by seeking past the last object on the previous
+    page, rather than by counting all matching objects and applying an OFFSET. The `count` attribute of the response
+    is null in this mode.
     """
+    cursor_query_param = 'cursor'
+    cursor_query_description = _('The position from which to continue a keyset-paginated list of results.')
+    invalid_cursor_message = _('Invalid cursor')
+
     def __init__(self):
         self.default_limit = get_config().PAGINATE_COUNT
+        self.use_cursor = False
+        self.next_cursor = None
 
     def paginate_queryset(self, queryset, request, view=None):
 
+        if self.cursor_query_param in request.query_params and isinstance(queryset, QuerySet):
+            return self.paginate_queryset_by_cursor(queryset, request)
+
         if isinstance(queryset, QuerySet):
             self.count = self.get_queryset_count(queryset)
         else:
@@ -36,6 +56,45 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         else:
             return list(queryset[self.offset:])
 
+    def paginate_queryset_by_cursor(self, queryset, request):
+        """
+        Return the page of objects following the position indicated by the cursor query parameter.
+        """
+        self.use_cursor = True
+        self.count = None
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.request = request
+
+        queryset = queryset.order_by('pk')
+        if (cursor := self.decode_cursor(request.query_params[self.cursor_query_param])) is not None:
+            queryset = queryset.filter(pk__gt=cursor)
+
+        if not self.limit:
+            return list(queryset)
+
+        # Retrieve one extra object to determine whether another page follows
+        results = list(queryset[:self.limit + 1])
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_cursor = results[-1].pk
+
+        return results
+
+    def encode_cursor(self, pk):
+        return base64.urlsafe_b64encode(str(pk).encode()).decode()
+
+    def decode_cursor(self, value):
+        """
+        Decode the given cursor value to a primary key. An empty value indicates the first page.
+        """
+        if not value:
+            return None
+        try:
+            return int(base64.urlsafe_b64decode(value.encode()).decode())
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
     def get_limit(self, request):
         if self.limit_query_param:
             MAX_PAGE_SIZE = get_config().MAX_PAGE_SIZE
@@ -63,16 +122,42 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         if not self.limit:
             return None
 
+        if self.use_cursor:
+            if self.next_cursor is None:
+                return None
+            url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_cursor))
+
         return super().get_next_link()
 
     def get_previous_link(self):
 
-        # Pagination has been disabled
-        if not self.limit:
+        # Pagination has been disabled, or keyset pagination (which proceeds only forward) is in use
+        if not self.limit or self.use_cursor:
             return None
 
         return super().get_previous_link()
 
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': str(self.cursor_query_description),
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
+
 
 class StripCountAnnotationsPaginator(OptionalLimitOffsetPagination):
     """
@@ -1,7 +1,11 @@
+import json
+
 from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer
 
 __all__ = (
     'FormlessBrowsableAPIRenderer',
+    'NDJSONRenderer',
+    'TarRenderer',
     'TextRenderer',
 )
 
@@ -26,3 +30,34 @@ class TextRenderer(BaseRenderer):
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
         return str(data)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Return data as newline-delimited JSON, with one line per item if a list is provided.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if type(data) is not list:
+            data = [data]
+        return ''.join(json.dumps(item) + '\n' for item in data).encode()
+
+
+class TarRenderer(BaseRenderer):
+    """
+    Placeholder renderer for views which stream tar archives directly. Any other data (e.g. an error response) is
+    rendered as JSON.
+    """
+    media_type = 'application/x-tar'
+    format = 'tar'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data).encode()
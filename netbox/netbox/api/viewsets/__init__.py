@@ -10,7 +10,9 @@ from rest_framework import mixins as drf_mixins
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from core.signals import clear_events
 from utilities.api import get_annotations_for_serializer, get_prefetches_for_serializer
+from utilities.counters import coalesced_counters
 from utilities.exceptions import AbortRequest
 from utilities.query import reapply_model_ordering
 from . import mixins
@@ -133,6 +135,11 @@ class NetBoxModelViewSet(
 
         return super().get_serializer(*args, **kwargs)
 
+    def handle_exception(self, exc):
+        # Any changes made by the request have been rolled back, so discard all queued events
+        clear_events.send(sender=self)
+        return super().handle_exception(exc)
+
     def dispatch(self, request, *args, **kwargs):
         logger = logging.getLogger(f'netbox.api.views.{self.__class__.__name__}')
 
@@ -170,7 +177,7 @@ class NetBoxModelViewSet(
 
         # Enforce object-level permissions on save()
         try:
-            with transaction.atomic():
+            with transaction.atomic(), coalesced_counters():
                 instance = serializer.save()
                 self._validate_objects(instance)
         except ObjectDoesNotExist:
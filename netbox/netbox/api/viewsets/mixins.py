@@ -1,4 +1,4 @@
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import transaction
 from django.http import Http404
 from rest_framework import status
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from core.models import ObjectType
 from extras.models import ExportTemplate
 from netbox.api.serializers import BulkOperationSerializer
+from utilities.counters import coalesced_counters
 
 __all__ = (
     'BulkDestroyModelMixin',
@@ -113,16 +114,26 @@ class BulkUpdateModelMixin:
         return Response(data, status=status.HTTP_200_OK)
 
     def perform_bulk_update(self, objects, update_data, partial):
-        with transaction.atomic():
+        with transaction.atomic(), coalesced_counters():
             data_list = []
-            for obj in objects:
-                data = update_data.get(obj.id)
-                if hasattr(obj, 'snapshot'):
-                    obj.snapshot()
-                serializer = self.get_serializer(obj, data=data, partial=partial)
-                serializer.is_valid(raise_exception=True)
-                self.perform_update(serializer)
-                data_list.append(serializer.data)
+            # Defer the validation of each updated object, then validate all objects at once
+            self._deferred_validation = []
+            try:
+                for obj in objects:
+                    data = update_data.get(obj.id)
+                    if hasattr(obj, 'snapshot'):
+                        obj.snapshot()
+                    serializer = self.get_serializer(obj, data=data, partial=partial)
+                    serializer.is_valid(raise_exception=True)
+                    self.perform_update(serializer)
+                    data_list.append(serializer.data)
+            finally:
+                instances, self._deferred_validation = self._deferred_validation, None
+
+            try:
+                self._validate_objects(instances)
+            except ObjectDoesNotExist:
+                raise PermissionDenied()
 
             return data_list
 
@@ -157,7 +168,7 @@ class BulkDestroyModelMixin:
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_bulk_destroy(self, objects):
-        with transaction.atomic():
+        with transaction.atomic(), coalesced_counters():
             for obj in objects:
                 if hasattr(obj, 'snapshot'):
                     obj.snapshot()
@@ -165,16 +176,22 @@ class BulkDestroyModelMixin:
 
 
 class ObjectValidationMixin:
+    _deferred_validation = None
 
     def _validate_objects(self, instance):
         """
         Check that the provided instance or list of instances are matched by the current queryset. This confirms that
         any newly created or modified objects abide by the attributes granted by any applicable ObjectPermissions.
         """
+        # Validation has been deferred for a bulk operation
+        if self._deferred_validation is not None:
+            self._deferred_validation.extend(instance if type(instance) is list else [instance])
+            return
+
         if type(instance) is list:
-            # Check that all instances are still included in the view's queryset
-            conforming_count = self.queryset.filter(pk__in=[obj.pk for obj in instance]).count()
-            if conforming_count != len(instance):
+            # Check that all instances are still included in the view's queryset using a single query
+            pks = {obj.pk for obj in instance}
+            if self.queryset.filter(pk__in=pks).count() != len(pks):
                 raise ObjectDoesNotExist
         elif not self.queryset.filter(pk=instance.pk).exists():
             raise ObjectDoesNotExist
@@ -1,15 +1,20 @@
+import hashlib
+import json
 import logging
 from collections import defaultdict
 
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.backends import ModelBackend, RemoteUserBackend as _RemoteUserBackend
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
-from users.constants import CONSTRAINT_TOKEN_USER
+from users.constants import CONSTRAINT_TOKEN_USER, OBJECTPERMISSION_CACHE_TIMEOUT
 from users.models import Group, ObjectPermission, User
+from users.utils import get_object_permissions_cache_version
 from utilities.permissions import (
     permission_is_exempt, qs_filter_from_constraints, resolve_permission, resolve_permission_type,
 )
@@ -64,14 +69,47 @@ def get_saml_idps():
 
 
 class ObjectPermissionMixin:
-
+    """
+    Grants permissions assigned to users and groups via ObjectPermissions. Each user's resolved permissions, along
+    with the compiled QuerySet filter for each permission's constraints, are held in the shared cache until any
+    ObjectPermission, group membership, or user is modified.
+    """
     def get_all_permissions(self, user_obj, obj=None):
         if not user_obj.is_active or user_obj.is_anonymous:
             return dict()
         if not hasattr(user_obj, '_object_perm_cache'):
-            user_obj._object_perm_cache = self.get_object_permissions(user_obj)
+            user_obj._object_perm_cache, user_obj._object_perm_filters = self.get_cached_object_permissions(user_obj)
         return user_obj._object_perm_cache
 
+    def get_cache_key(self, user_obj):
+        """
+        Return the key under which the user's object permissions are cached, or None if they should not be cached.
+        """
+        version = get_object_permissions_cache_version()
+        # Default permissions are merged into each user's permissions, so key on the current configuration
+        defaults = hashlib.sha256(
+            json.dumps(settings.DEFAULT_PERMISSIONS, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return f'object_permissions:{version}:{defaults}:{self.__class__.__name__}:{user_obj.pk}'
+
+    def get_cached_object_permissions(self, user_obj):
+        """
+        Return the user's object permissions and a mapping of each permission to its compiled QuerySet filter,
+        retrieving both from the cache if possible.
+        """
+        cache_key = self.get_cache_key(user_obj)
+        if cache_key and (cached := cache.get(cache_key)) is not None:
+            return cached
+
+        perms = self.get_object_permissions(user_obj)
+        filters = {
+            perm: self._get_constraints_filter(user_obj, constraints) for perm, constraints in perms.items()
+        }
+        if cache_key:
+            cache.set(cache_key, (perms, filters), OBJECTPERMISSION_CACHE_TIMEOUT)
+
+        return perms, filters
+
     def get_permission_filter(self, user_obj):
         return Q(users=user_obj) | Q(groups__user=user_obj)
 
@@ -139,17 +177,62 @@ class ObjectPermissionMixin:
                 permission=perm, model=model
             ))
 
-        # Compile a QuerySet filter that matches all instances of the specified model
-        tokens = {
-            CONSTRAINT_TOKEN_USER: user_obj,
-        }
-        qs_filter = qs_filter_from_constraints(object_permissions[perm], tokens)
+        # Retrieve the QuerySet filter that matches all permitted instances of the specified model
+        qs_filter = self.get_permission_constraints_filter(user_obj, perm)
 
         # Permission to perform the requested action on the object depends on whether the specified object matches
         # the specified constraints. Note that this check is made against the *database* record representing the object,
         # not the instance itself.
         return model.objects.filter(qs_filter, pk=obj.pk).exists()
 
+    def get_permitted_pks(self, user_obj, perm, pks):
+        """
+        Return the subset of the given primary keys identifying objects on which the user has been granted the
+        specified permission. Unlike has_perm(), this evaluates the permission's constraints for all objects using a
+        single query.
+        """
+        app_label, __, model_name = resolve_permission(perm)
+        pks = set(pks)
+
+        # Superusers implicitly have all permissions
+        if user_obj.is_active and user_obj.is_superuser:
+            return pks
+
+        # Permission is exempt from enforcement (i.e. listed in EXEMPT_VIEW_PERMISSIONS)
+        if permission_is_exempt(perm):
+            return pks
+
+        # Handle inactive/anonymous users
+        if not user_obj.is_active or user_obj.is_anonymous:
+            return set()
+
+        object_permissions = self.get_all_permissions(user_obj)
+
+        # If no applicable ObjectPermissions have been created for this user/permission, deny permission
+        if perm not in object_permissions or not pks:
+            return set()
+
+        model = apps.get_model(app_label, model_name)
+        qs_filter = self.get_permission_constraints_filter(user_obj, perm)
+
+        return set(model.objects.filter(qs_filter, pk__in=pks).values_list('pk', flat=True))
+
+    def get_permission_constraints_filter(self, user_obj, perm):
+        """
+        Return the compiled QuerySet filter for the constraints of the specified permission.
+        """
+        filters = getattr(user_obj, '_object_perm_filters', {})
+        if perm in filters:
+            return filters[perm]
+        return self._get_constraints_filter(user_obj, self.get_all_permissions(user_obj)[perm])
+
+    @staticmethod
+    def _get_constraints_filter(user_obj, constraints):
+        tokens = {
+            CONSTRAINT_TOKEN_USER: user_obj,
+        }
+        return qs_filter_from_constraints(constraints, tokens)
+
 
 class ObjectPermissionBackend(ObjectPermissionMixin, ModelBackend):
     pass
@@ -317,6 +400,12 @@ try:
     from django_auth_ldap.backend import _LDAPUser, LDAPBackend as LDAPBackend_
 
     class NBLDAPBackend(ObjectPermissionMixin, LDAPBackend_):
+        def get_cache_key(self, user_obj):
+            # Permissions assigned via LDAP group names may vary between sessions, so they are not cached
+            if self.settings.FIND_GROUP_PERMS and hasattr(user_obj, "ldap_user"):
+                return None
+            return super().get_cache_key(user_obj)
+
         def get_permission_filter(self, user_obj):
             permission_filter = super().get_permission_filter(user_obj)
             if (self.settings.FIND_GROUP_PERMS and
@@ -3,7 +3,9 @@ import threading
 
 from django.conf import settings
 from django.core.cache import cache
+from django.core.signals import setting_changed
 from django.db.utils import DatabaseError
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
 from .parameters import PARAMS
@@ -13,36 +15,65 @@ __all__ = (
     'ConfigItem',
     'get_config',
     'PARAMS',
+    'refresh_config',
 )
 
-_thread_locals = threading.local()
+# The configuration currently loaded by this process
+_config = None
+_config_lock = threading.Lock()
 
 logger = logging.getLogger('netbox.config')
 
 
 def get_config():
     """
-    Return the current NetBox configuration, pulling it from cache if not already loaded in memory.
+    Return the current NetBox configuration, pulling it from cache if not already loaded in memory. The loaded
+    configuration is shared by all threads within the process, and persists until cleared.
     """
-    if not hasattr(_thread_locals, 'config'):
-        _thread_locals.config = Config()
-        logger.debug("Initialized configuration")
-    return _thread_locals.config
+    global _config
+
+    if (config := _config) is None:
+        with _config_lock:
+            if (config := _config) is None:
+                config = _config = Config()
+                logger.debug("Initialized configuration")
+    return config
 
 
 def clear_config():
     """
     Delete the currently loaded configuration, if any.
     """
-    if hasattr(_thread_locals, 'config'):
-        del _thread_locals.config
+    global _config
+
+    if _config is not None:
+        _config = None
         logger.debug("Cleared configuration")
 
 
+def refresh_config():
+    """
+    Clear the currently loaded configuration if a different ConfigRevision has since been activated. This requires
+    only a single cache lookup.
+    """
+    if _config is not None and cache.get('config_version') != _config.version:
+        clear_config()
+
+
+@receiver(setting_changed)
+def clear_config_on_setting_changed(**kwargs):
+    """
+    Configuration parameters may be overridden by settings (e.g. under test), so discard the loaded configuration when
+    any setting changes.
+    """
+    clear_config()
+
+
 class Config:
     """
     Fetch and store in memory the current NetBox configuration. This class must be instantiated prior to access, and
-    must be re-instantiated each time it's necessary to check for updates to the cached config.
+    must be re-instantiated each time it's necessary to check for updates to the cached config (see
+    refresh_config()).
     """
     def __init__(self):
         self._populate_from_cache()
@@ -50,7 +81,17 @@ class Config:
             self._populate_from_db()
         self.defaults = {param.name: param.default for param in PARAMS}
 
+        # Resolve all parameters in advance, so that they may be accessed as plain attributes
+        for param in PARAMS:
+            self.__dict__[param.name] = self._resolve(param.name)
+
     def __getattr__(self, item):
+        # Resolve any other item on first access
+        value = self._resolve(item)
+        self.__dict__[item] = value
+        return value
+
+    def _resolve(self, item):
 
         # Check for hard-coded configuration in settings.py
         if hasattr(settings, item):
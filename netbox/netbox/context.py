@@ -1,10 +1,16 @@
 from contextvars import ContextVar
 
 __all__ = (
+    'change_queue',
+    'config_context_queue',
     'current_request',
     'events_queue',
+    'search_queue',
 )
 
 
+change_queue = ContextVar('change_queue', default=None)
+config_context_queue = ContextVar('config_context_queue', default=None)
 current_request = ContextVar('current_request', default=None)
 events_queue = ContextVar('events_queue', default=dict())
+search_queue = ContextVar('search_queue', default=None)
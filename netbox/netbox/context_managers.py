@@ -1,7 +1,13 @@
 from contextlib import contextmanager
+from functools import partial
 
-from netbox.context import current_request, events_queue
+from django.db import connection, transaction
+
+from core.changelog import ChangeQueue, flush_changes
+from netbox.context import change_queue, config_context_queue, current_request, events_queue, search_queue
+from netbox.search.backends import flush_search_queue
 from netbox.utils import register_request_processor
+from extras.configcontexts import flush_config_context_queue
 from extras.events import flush_events
 
 
@@ -26,3 +32,61 @@ def event_tracking(request):
     # Clear context vars
     current_request.set(None)
     events_queue.set({})
+
+
+@register_request_processor
+@contextmanager
+def change_logging(request):
+    """
+    Buffer ObjectChange records in memory while processing a request, then write all those whose changes have been
+    committed to the database at once before returning the response. If the request is processed within an enclosing
+    transaction (which may yet be rolled back), records are instead saved immediately as part of that transaction.
+
+    :param request: WSGIRequest object with a unique `id` set
+    """
+    token = change_queue.set(None if connection.in_atomic_block else ChangeQueue())
+
+    try:
+        yield
+    finally:
+        if queue := change_queue.get():
+            flush_changes(queue)
+        change_queue.reset(token)
+
+
+@register_request_processor
+@contextmanager
+def search_indexing(request):
+    """
+    Queue objects for search indexing while processing a request, then update the search cache for all queued objects
+    at once after the request's changes have been committed. Repeated changes to the same object are indexed only once.
+
+    :param request: WSGIRequest object with a unique `id` set
+    """
+    token = search_queue.set({})
+
+    try:
+        yield
+    finally:
+        if queue := search_queue.get():
+            transaction.on_commit(partial(flush_search_queue, queue))
+        search_queue.reset(token)
+
+
+@register_request_processor
+@contextmanager
+def config_context_updates(request):
+    """
+    Queue Devices and VirtualMachines whose applicable config contexts may have changed while processing a request,
+    then schedule their stored config context data for recomputation once the request's changes have been committed.
+
+    :param request: WSGIRequest object with a unique `id` set
+    """
+    token = config_context_queue.set({})
+
+    try:
+        yield
+    finally:
+        if queue := config_context_queue.get():
+            transaction.on_commit(partial(flush_config_context_queue, queue))
+        config_context_queue.reset(token)
@@ -12,7 +12,7 @@ from django.db import connection, ProgrammingError
 from django.db.utils import InternalError
 from django.http import Http404, HttpResponseRedirect
 
-from netbox.config import clear_config, get_config
+from netbox.config import get_config, refresh_config
 from netbox.registry import registry
 from netbox.views import handler_500
 from utilities.api import is_api_request
@@ -32,6 +32,9 @@ class CoreMiddleware:
 
     def __call__(self, request):
 
+        # Reload the dynamic configuration if a new revision has been activated since the last request
+        refresh_config()
+
         # Assign a random unique ID to the request. This will be used for change logging.
         request.id = uuid.uuid4()
 
@@ -64,9 +67,6 @@ class CoreMiddleware:
         if is_api_request(request):
             response['API-Version'] = settings.REST_FRAMEWORK_VERSION
 
-        # Clear any cached dynamic config parameters after each request.
-        clear_config()
-
         return response
 
     def process_exception(self, request, exception):
@@ -1,7 +1,10 @@
+import base64
+import json
 from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import F, Window, Q, prefetch_related_objects
 from django.db.models.fields.related import ForeignKey
@@ -9,26 +12,45 @@ from django.db.models.functions import window
 from django.db.models.signals import post_delete, post_save
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
+from django_rq import get_queue
 import netaddr
 from netaddr.core import AddrFormatError
 
 from core.models import ObjectType
 from extras.models import CachedValue, CustomField
+from netbox.context import search_queue
 from netbox.registry import registry
+from netbox.signals import post_bulk_create
 from utilities.object_types import object_type_identifier
 from utilities.querysets import RestrictedPrefetch
+from utilities.rqworker import get_queue_for_model
 from utilities.string import title
 from . import FieldTypes, LookupTypes, get_indexer
 
 DEFAULT_LOOKUP_TYPE = LookupTypes.PARTIAL
 MAX_RESULTS = 1000
 
+# The PostgreSQL text search configuration used for full-text matching. (This must match the index on CachedValue.)
+FTS_CONFIG = 'simple'
+
+
+class SearchResults(list):
+    """
+    A page of search results. `next_cursor` holds an opaque value which can be passed to search() to retrieve the
+    next page of results, or None if there are no further results.
+    """
+    next_cursor = None
+
 
 class SearchBackend:
     """
     Base class for search backends. Subclasses must extend the `cache()`, `remove()`, and `clear()` methods below.
+
+    Backends which set `cursor_pagination` accept `cursor` and `limit` arguments to search(), and return a
+    SearchResults list.
     """
     _object_types = None
+    cursor_pagination = False
 
     def get_object_types(self):
         """
@@ -62,13 +84,53 @@ class SearchBackend:
         """
         Receiver for the post_save signal, responsible for caching object creation/changes.
         """
-        self.cache(instance, remove_existing=not created)
+        if not self.enqueue(instance):
+            self.cache(instance, remove_existing=not created)
+
+    def bulk_caching_handler(self, sender, instances, **kwargs):
+        """
+        Receiver for the post_bulk_create signal, responsible for caching objects created in bulk.
+        """
+        if search_queue.get() is not None:
+            for instance in instances:
+                self.enqueue(instance)
+        else:
+            self.cache(instances, remove_existing=False)
 
     def removal_handler(self, sender, instance, **kwargs):
         """
         Receiver for the post_delete signal, responsible for caching object deletion.
         """
-        self.remove(instance)
+        if not self.enqueue(instance):
+            self.remove(instance)
+
+    def enqueue(self, instance):
+        """
+        Queue an object to be (re)indexed once the search queue is flushed, if a queue is active (e.g. while processing
+        a request). Returns True if the object has been queued, or if it does not require indexing.
+        """
+        queue = search_queue.get()
+        if queue is None:
+            return False
+
+        label = f'{instance._meta.app_label}.{instance._meta.model_name}'
+        if label in registry['search']:
+            queue.setdefault(label, set()).add(instance.pk)
+        return True
+
+    def process_queue(self, queue):
+        """
+        Update the cached representations of all queued objects. `queue` maps model labels to sets of object IDs;
+        cached values for any objects which no longer exist are removed.
+        """
+        for label, pks in queue.items():
+            model = registry['search'][label].model
+            found = set()
+            for instance in model.objects.filter(pk__in=pks):
+                self.cache(instance)
+                found.add(instance.pk)
+            for pk in set(pks) - found:
+                self.remove(model(pk=pk))
 
     def cache(self, instances, indexer=None, remove_existing=True):
         """
@@ -137,23 +199,34 @@ class CachedValueSearchBackend(SearchBackend):
         # objects). This must be done before generating the final results list, which returns
         # a RawQuerySet.
         object_type_ids = set(queryset.values_list('object_type', flat=True))
-        object_types = ObjectType.objects.filter(pk__in=object_type_ids)
-
-        # Construct a Prefetch to pre-fetch only those related objects for which the
-        # user has permission to view.
-        if user:
-            prefetch = (RestrictedPrefetch('object', user, 'view'), 'object_type')
-        else:
-            prefetch = ('object', 'object_type')
 
         # Wrap the base query to return only the lowest-weight result for each object
         # Hat-tip to https://blog.oyam.dev/django-filter-by-window-function/ for the solution
         sql, params = queryset.query.sql_with_params()
-        results = CachedValue.objects.prefetch_related(*prefetch).raw(
+        results = CachedValue.objects.prefetch_related(*self._get_prefetch(user)).raw(
             f"SELECT * FROM ({sql}) t WHERE row_number = 1",
             params
         )
 
+        return self._compile_results(results, object_type_ids)
+
+    @staticmethod
+    def _get_prefetch(user):
+        """
+        Construct a Prefetch to pre-fetch only those related objects for which the user has permission to view.
+        """
+        if user:
+            return RestrictedPrefetch('object', user, 'view'), 'object_type'
+        return 'object', 'object_type'
+
+    @staticmethod
+    def _compile_results(results, object_type_ids):
+        """
+        Prefetch any related objects necessary to render the search results, and return a list of those results
+        pertaining to objects which the user has permission to view.
+        """
+        object_types = ObjectType.objects.filter(pk__in=object_type_ids)
+
         # Iterate through each ObjectType represented in the search results and prefetch any
         # related objects necessary to render the prescribed display attributes (display_attrs).
         for object_type in object_types:
@@ -197,7 +270,7 @@ class CachedValueSearchBackend(SearchBackend):
         for instance in instances:
 
             # First item
-            if not counter:
+            if object_type is None:
 
                 # Determine the indexer
                 if indexer is None:
@@ -238,6 +311,68 @@ class CachedValueSearchBackend(SearchBackend):
 
         return counter
 
+    def get_cached_values(self, instances, indexer):
+        """
+        Yield the (unsaved) CachedValues representing each of the given instances of the indexer's model.
+        """
+        object_type = ObjectType.objects.get_for_model(indexer.model)
+        custom_fields = list(CustomField.objects.filter(object_types=object_type).exclude(search_weight=0))
+
+        for instance in instances:
+            for field in indexer.to_cache(instance, custom_fields=custom_fields):
+                yield CachedValue(
+                    object_type=object_type,
+                    object_id=instance.pk,
+                    field=field.name,
+                    type=field.type,
+                    weight=field.weight,
+                    value=field.value
+                )
+
+    def process_queue(self, queue):
+        for label, pks in queue.items():
+            indexer = registry['search'][label]
+            object_type = ObjectType.objects.get_for_model(indexer.model)
+            custom_fields = CustomField.objects.filter(object_types=object_type).exclude(search_weight=0)
+
+            # Compile the values to be cached for each object which still exists
+            values = {
+                instance.pk: {
+                    (field.name, field.type, field.weight, str(field.value))
+                    for field in indexer.to_cache(instance, custom_fields=custom_fields)
+                }
+                for instance in indexer.model.objects.filter(pk__in=pks)
+            }
+
+            # Skip any objects for which no cached value has changed
+            cached = defaultdict(set)
+            for object_id, *value in CachedValue.objects.filter(object_type=object_type, object_id__in=pks).values_list(
+                'object_id', 'field', 'type', 'weight', 'value'
+            ):
+                cached[object_id].add(tuple(value))
+            stale = [pk for pk in pks if values.get(pk, set()) != cached[pk]]
+            if not stale:
+                continue
+
+            # Replace the cached values for all changed objects
+            qs = CachedValue.objects.filter(object_type=object_type, object_id__in=stale)
+            qs._raw_delete(using=qs.db)
+            CachedValue.objects.bulk_create(
+                [
+                    CachedValue(
+                        object_type=object_type,
+                        object_id=pk,
+                        field=name,
+                        type=type_,
+                        weight=weight,
+                        value=value
+                    )
+                    for pk in stale if pk in values
+                    for name, type_, weight, value in values[pk]
+                ],
+                batch_size=2000
+            )
+
     def remove(self, instance):
         # Avoid attempting to query for non-cacheable objects
         try:
@@ -270,6 +405,110 @@ class CachedValueSearchBackend(SearchBackend):
         return CachedValue.objects.count()
 
 
+class FullTextSearchBackend(CachedValueSearchBackend):
+    """
+    Extends CachedValueSearchBackend to take advantage of the trigram and full-text indexes on CachedValue. Partial and
+    "starts with" lookups are served by a GIN trigram index, and partial lookups additionally match values containing
+    all words of the query in any order. Results are ordered by weight and then by full-text rank, and are returned
+    a page at a time using keyset pagination (rather than being capped at MAX_RESULTS).
+    """
+    cursor_pagination = True
+
+    def search(self, value, user=None, object_types=None, lookup=DEFAULT_LOOKUP_TYPE, cursor=None, limit=None):
+        limit = limit or MAX_RESULTS
+        vector = SearchVector('value', config=FTS_CONFIG)
+        query = SearchQuery(value, config=FTS_CONFIG)
+
+        # Build the filter used to find relevant CachedValue records
+        query_filter = Q(**{f'value__{lookup}': value})
+        if lookup in (LookupTypes.STARTSWITH, LookupTypes.ENDSWITH):
+            # "Starts/ends with" matches are valid only on string values
+            query_filter &= Q(type=FieldTypes.STRING)
+        elif lookup == LookupTypes.PARTIAL:
+            query_filter |= Q(search_vector=query)
+            try:
+                # If the value looks like an IP address, add an extra match for CIDR values
+                address = str(netaddr.IPNetwork(value.strip()).cidr)
+                query_filter |= Q(type=FieldTypes.CIDR) & Q(value__net_contains_or_equals=address)
+            except (AddrFormatError, ValueError):
+                pass
+        if object_types:
+            # Limit results by object type
+            query_filter &= Q(object_type__in=object_types)
+
+        # Select the lowest-weight (and then highest-ranked) result for each object
+        queryset = CachedValue.objects.annotate(
+            search_vector=vector,
+            rank=SearchRank(vector, query)
+        ).filter(query_filter).order_by(
+            'object_type', 'object_id', 'weight', '-rank'
+        ).distinct(
+            'object_type', 'object_id'
+        )
+        sql, params = queryset.query.sql_with_params()
+
+        # Retrieve pages of results until the limit has been reached, omitting any objects which the user does not
+        # have permission to view
+        results = SearchResults()
+        cursor = self._decode_cursor(cursor)
+        while True:
+            count = limit - len(results)
+            page = self._get_page(sql, params, cursor, count + 1)
+            has_more = len(page) > count
+            page = page[:count]
+            if page:
+                cursor = (page[-1].weight, page[-1].rank, page[-1].object_type_id, page[-1].object_id)
+            prefetch_related_objects(page, *self._get_prefetch(user))
+            results.extend(self._compile_results(page, {r.object_type_id for r in page}))
+            if not has_more or len(results) >= limit:
+                break
+
+        if has_more:
+            results.next_cursor = self._encode_cursor(cursor)
+
+        return results
+
+    @staticmethod
+    def _get_page(sql, params, cursor, limit):
+        """
+        Return up to `limit` results from the base query following the specified cursor position.
+        """
+        where = ''
+        params = list(params)
+        if cursor:
+            # Results are ordered by ascending weight, descending rank, and object. Rank is compared as a real
+            # (its native type), as the cursor value is only as precise as the rank's text representation.
+            weight, rank, object_type_id, object_id = cursor
+            where = (
+                'WHERE weight > %s OR (weight = %s AND (rank < %s::real OR (rank = %s::real AND '
+                '(object_type_id, object_id) > (%s, %s))))'
+            )
+            params.extend([weight, weight, rank, rank, object_type_id, object_id])
+        params.append(limit)
+
+        return list(CachedValue.objects.raw(
+            f'SELECT * FROM ({sql}) t {where} ORDER BY weight, rank DESC, object_type_id, object_id LIMIT %s',
+            params
+        ))
+
+    @staticmethod
+    def _encode_cursor(cursor):
+        return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        """
+        Decode a cursor string. Invalid cursors are ignored.
+        """
+        if not cursor:
+            return None
+        try:
+            weight, rank, object_type_id, object_id = json.loads(base64.urlsafe_b64decode(cursor))
+            return int(weight), float(rank), int(object_type_id), int(object_id)
+        except (TypeError, ValueError):
+            return None
+
+
 def get_backend():
     """
     Initializes and returns the configured search backend.
@@ -283,8 +522,28 @@ def get_backend():
     return backend_cls()
 
 
+def flush_search_queue(queue):
+    """
+    Update the search cache for all queued objects, or hand off the queue to a background worker if
+    SEARCH_BACKGROUND_INDEXING is enabled.
+    """
+    if settings.SEARCH_BACKGROUND_INDEXING:
+        rq_queue = get_queue(get_queue_for_model('search'))
+        rq_queue.enqueue('netbox.search.backends.process_search_queue', queue)
+    else:
+        search_backend.process_queue(queue)
+
+
+def process_search_queue(queue):
+    """
+    Background task for processing a search queue handed off by flush_search_queue().
+    """
+    search_backend.process_queue(queue)
+
+
 search_backend = get_backend()
 
 # Connect handlers to the appropriate model signals
 post_save.connect(search_backend.caching_handler)
+post_bulk_create.connect(search_backend.bulk_caching_handler)
 post_delete.connect(search_backend.removal_handler)
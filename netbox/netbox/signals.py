@@ -3,3 +3,6 @@ from django.dispatch import Signal
 
 # Signals that a model has completed its clean() method
 post_clean = Signal()
+
+# Signals that objects have been created in bulk (sent once for all objects in lieu of post_save for each object)
+post_bulk_create = Signal()
@@ -1,14 +1,17 @@
 import datetime
 
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from django.test import Client
 from django.test.utils import override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from core.models import ObjectType
+from dcim.api.views import RackViewSet
 from dcim.models import Rack, Site
 from users.models import Group, ObjectPermission, Token, User
+from utilities.permissions import get_permitted_pks
 from utilities.testing import TestCase
 from utilities.testing.api import APITestCase
 
@@ -578,3 +581,102 @@ class ObjectPermissionAPIViewTestCase(TestCase):
         url = reverse('dcim-api:rack-detail', kwargs={'pk': self.racks[0].pk})
         response = self.client.delete(url, format='json', **self.header)
         self.assertEqual(response.status_code, 204)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_bulk_edit_objects(self):
+        url = reverse('dcim-api:rack-list')
+
+        # Assign object permission
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'site__name': 'Site 1'},
+            actions=['change']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ObjectType.objects.get_for_model(Rack))
+
+        # Check the permitted subset of objects
+        self.assertEqual(
+            get_permitted_pks(self.user, 'dcim.change_rack', [rack.pk for rack in self.racks]),
+            {rack.pk for rack in self.racks[:3]}
+        )
+
+        # Edit permitted objects
+        data = [{'id': rack.pk, 'status': 'reserved'} for rack in self.racks[:3]]
+        response = self.client.patch(url, data, format='json', **self.header)
+        self.assertEqual(response.status_code, 200)
+
+        # Attempt to modify permitted objects to non-permitted objects
+        data = [{'id': rack.pk, 'site': self.sites[1].pk} for rack in self.racks[:3]]
+        response = self.client.patch(url, data, format='json', **self.header)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Rack.objects.filter(site=self.sites[0]).count(), 3)
+
+    def test_validate_objects(self):
+        """
+        Check that a list of objects is validated against the view's queryset, including any view-specific filtering.
+        """
+        view = RackViewSet()
+        view.queryset = Rack.objects.filter(site=self.sites[0])
+        view._validate_objects(list(self.racks[:3]))
+        with self.assertRaises(ObjectDoesNotExist):
+            view._validate_objects(list(self.racks[2:4]))
+
+
+class ObjectPermissionCacheTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sites = (
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+        )
+        Site.objects.bulk_create(cls.sites)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_cache_invalidation(self):
+        user = self.user
+        group = Group.objects.create(name='Group 1')
+        obj_perm = ObjectPermission.objects.create(
+            name='Test permission',
+            constraints={'name': 'Site 1'},
+            actions=['view']
+        )
+        obj_perm.object_types.add(ObjectType.objects.get_for_model(Site))
+        obj_perm.groups.add(group)
+
+        def get_permitted_sites():
+            # Retrieve a new instance of the user to simulate a new request
+            return list(Site.objects.restrict(User.objects.get(pk=user.pk), 'view'))
+
+        # No permissions have been assigned to the user
+        self.assertEqual(get_permitted_sites(), [])
+
+        # Modifying the user's group membership invalidates the cache
+        user.groups.add(group)
+        self.assertEqual(get_permitted_sites(), [self.sites[0]])
+
+        # Modifying the ObjectPermission invalidates the cache
+        obj_perm.constraints = {'name': 'Site 2'}
+        obj_perm.save()
+        self.assertEqual(get_permitted_sites(), [self.sites[1]])
+
+        # Deleting the group invalidates the cache
+        group.delete()
+        self.assertEqual(get_permitted_sites(), [])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_cache_default_permissions(self):
+        user = self.user
+
+        def get_permitted_sites():
+            return list(Site.objects.restrict(User.objects.get(pk=user.pk), 'view'))
+
+        with override_settings(DEFAULT_PERMISSIONS={'dcim.view_site': ({'name': 'Site 1'},)}):
+            self.assertEqual(get_permitted_sites(), [self.sites[0]])
+
+        # Permissions cached under a different DEFAULT_PERMISSIONS configuration are not reused
+        with override_settings(DEFAULT_PERMISSIONS={'dcim.view_site': ({'name': 'Site 2'},)}):
+            self.assertEqual(get_permitted_sites(), [self.sites[1]])
+        self.assertEqual(get_permitted_sites(), [])
@@ -3,7 +3,7 @@ from django.core.cache import cache
 from django.test import override_settings, TestCase
 
 from core.models import ConfigRevision
-from netbox.config import clear_config, get_config
+from netbox.config import clear_config, get_config, refresh_config
 
 
 # Prefix cache keys to avoid interfering with the local environment
@@ -66,3 +66,24 @@ class ConfigTestCase(TestCase):
         self.assertEqual(config.version, configrevision.pk)
 
         clear_config()
+
+    @override_settings(CACHES=CACHES)
+    def test_config_refresh(self):
+        cache.clear()
+
+        configrevision = ConfigRevision.objects.create(data={'BANNER_TOP': 'A'})
+        config = get_config()
+        self.assertEqual(config.BANNER_TOP, 'A')
+
+        # The loaded configuration persists until a new revision has been activated
+        refresh_config()
+        self.assertIs(get_config(), config)
+
+        configrevision = ConfigRevision.objects.create(data={'BANNER_TOP': 'B'})
+        self.assertIs(get_config(), config)
+        refresh_config()
+        config = get_config()
+        self.assertEqual(config.BANNER_TOP, 'B')
+        self.assertEqual(config.version, configrevision.pk)
+
+        clear_config()
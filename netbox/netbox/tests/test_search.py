@@ -1,10 +1,17 @@
+from io import StringIO
+from unittest.mock import patch
+
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase
 
-from dcim.models import Site
+from dcim.models import Region, Site
 from dcim.search import SiteIndex
+from extras.management.commands import reindex
 from extras.models import CachedValue
-from netbox.search.backends import search_backend
+from netbox.context import search_queue
+from netbox.search import LookupTypes
+from netbox.search.backends import FullTextSearchBackend, SearchBackend, search_backend
 
 
 class SearchBackendTestCase(TestCase):
@@ -151,3 +158,187 @@ class SearchBackendTestCase(TestCase):
         self.assertEqual(len(results), 1)
         results = search_backend.search('xxxxx')
         self.assertEqual(len(results), 0)
+
+    def test_queued_indexing(self):
+        """
+        Test that objects saved or deleted while a search queue is active are indexed only once the queue is processed.
+        """
+        content_type = ContentType.objects.get_for_model(Site)
+        sites = list(Site.objects.all())
+        pks = [site.pk for site in sites]
+        search_backend.cache(sites)
+
+        token = search_queue.set({})
+        try:
+            sites[0].description = 'Updated'
+            sites[0].save()
+            sites[0].save()
+            sites[1].save()
+            sites[2].delete()
+            queue = search_queue.get()
+        finally:
+            search_queue.reset(token)
+
+        # Objects are queued once and the cache is left unchanged
+        self.assertDictEqual(queue, {'dcim.site': set(pks)})
+        self.assertTrue(CachedValue.objects.filter(object_type=content_type, object_id=pks[2]).exists())
+
+        # Unchanged objects are not reindexed
+        timestamps = dict(CachedValue.objects.filter(object_id=sites[1].pk).values_list('field', 'timestamp'))
+        search_backend.process_queue(queue)
+        self.assertDictEqual(
+            dict(CachedValue.objects.filter(object_id=sites[1].pk).values_list('field', 'timestamp')),
+            timestamps
+        )
+
+        self.assertTrue(
+            CachedValue.objects.filter(object_type=content_type, object_id=sites[0].pk, value='Updated').exists()
+        )
+        self.assertEqual(
+            CachedValue.objects.filter(object_type=content_type, object_id=sites[0].pk).count(),
+            len(SiteIndex.fields)
+        )
+        self.assertFalse(CachedValue.objects.filter(object_type=content_type, object_id=pks[2]).exists())
+
+
+class FullTextSearchBackendTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        sites = Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', description='Lorem ipsum dolor sit amet') for i in range(1, 11)
+        ])
+        FullTextSearchBackend().cache(sites)
+
+    def test_search(self):
+        """
+        Test partial, "starts with", and full-text searches.
+        """
+        backend = FullTextSearchBackend()
+
+        results = backend.search('site')
+        self.assertEqual(len(results), 10)
+        self.assertIsNone(results.next_cursor)
+        results = backend.search('site-1', lookup=LookupTypes.STARTSWITH)
+        self.assertEqual(len(results), 2)
+
+        # Match all words of the query in any order
+        results = backend.search('amet lorem')
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[0].field, 'description')
+        results = backend.search('xxxxx')
+        self.assertEqual(len(results), 0)
+
+    def test_cursor_pagination(self):
+        """
+        Test that paging through results with a cursor returns each matching object exactly once.
+        """
+        backend = FullTextSearchBackend()
+
+        results = []
+        cursor = None
+        for _ in range(3):
+            page = backend.search('site', cursor=cursor, limit=4)
+            results.extend(page)
+            cursor = page.next_cursor
+        self.assertIsNone(cursor)
+        self.assertEqual(
+            sorted(r.object_id for r in results),
+            sorted(Site.objects.values_list('pk', flat=True))
+        )
+
+
+class ReindexTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', description='Lorem ipsum dolor sit amet') for i in range(1, 6)
+        ])
+        Region.objects.create(name='Region 1', slug='region-1')
+
+    def test_reindex_staged_partial(self):
+        """
+        Test rebuilding the cache for a single model in a staging table, leaving the values for other models intact.
+        """
+        search_backend.cache(Region.objects.all())
+        region_values = set(CachedValue.objects.values_list('pk', flat=True))
+
+        call_command('reindex', 'dcim.site', workers=1, batch_size=2, stdout=StringIO())
+
+        content_type = ContentType.objects.get_for_model(Site)
+        self.assertEqual(
+            set(CachedValue.objects.filter(object_type=content_type).values_list('object_id', 'field', 'value')),
+            {
+                (value.object_id, value.field, value.value)
+                for value in search_backend.get_cached_values(Site.objects.all(), SiteIndex)
+            }
+        )
+        region_type = ContentType.objects.get_for_model(Region)
+        self.assertEqual(
+            set(CachedValue.objects.filter(object_type=region_type).values_list('pk', flat=True)),
+            region_values
+        )
+
+    def test_reindex_staged_unsupported_backend(self):
+        """
+        Test that the staged rebuild requires a CachedValue-based search backend.
+        """
+        with patch.object(reindex, 'search_backend', SearchBackend()):
+            with self.assertRaises(CommandError):
+                call_command('reindex', workers=2, stdout=StringIO())
+
+
+class ReindexTableTestCase(TransactionTestCase):
+    """
+    Replacing the cache table cannot take place within a test case's transaction, and worker processes can see only
+    committed data.
+    """
+    serialized_rollback = True
+
+    def setUp(self):
+        ContentType.objects.clear_cache()
+        self.sites = Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', description='Lorem ipsum dolor sit amet') for i in range(1, 11)
+        ])
+        search_backend.cache(self.sites[:5])
+
+    def assertSitesCached(self):
+        content_type = ContentType.objects.get_for_model(Site)
+        self.assertEqual(
+            set(CachedValue.objects.filter(object_type=content_type).values_list('object_id', 'field', 'value')),
+            {
+                (value.object_id, value.field, value.value)
+                for value in search_backend.get_cached_values(Site.objects.all(), SiteIndex)
+            }
+        )
+
+    def test_reindex_staged(self):
+        call_command('reindex', workers=1, batch_size=3, stdout=StringIO())
+        self.assertSitesCached()
+
+    def test_reindex_workers(self):
+        call_command('reindex', workers=2, batch_size=3, stdout=StringIO())
+        self.assertSitesCached()
+
+    def test_reindex_staged_catch_up(self):
+        """
+        Test that objects modified or deleted while the cache is being rebuilt are re-cached once it has been replaced.
+        """
+        sites = self.sites
+        _index_chunk = reindex.index_chunk
+
+        def index_chunk(label, pk_min, pk_max):
+            count = _index_chunk(label, pk_min, pk_max)
+            # Modify & delete sites which have already been indexed
+            if label == 'dcim.site' and pk_min == sites[0].pk:
+                sites[0].name = 'Renamed'
+                sites[0].save()
+                sites[1].delete()
+            return count
+
+        with patch.object(reindex, 'index_chunk', side_effect=index_chunk):
+            call_command('reindex', workers=1, batch_size=3, stdout=StringIO())
+
+        self.assertSitesCached()
+        self.assertTrue(CachedValue.objects.filter(object_id=sites[0].pk, value='Renamed').exists())
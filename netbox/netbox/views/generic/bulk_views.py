@@ -22,12 +22,13 @@ from core.models import ObjectType
 from core.signals import clear_events
 from extras.choices import CustomFieldUIEditableChoices
 from extras.models import CustomField, ExportTemplate
+from utilities.counters import coalesced_counters
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import AbortRequest, AbortTransaction, PermissionsViolation
 from utilities.forms import BulkRenameForm, ConfirmationForm, restrict_form_fields
 from utilities.forms.bulk_import import BulkImportForm
 from utilities.htmx import htmx_partial
-from utilities.permissions import get_permission_for_model
+from utilities.permissions import get_permission_for_model, get_permitted_pks
 from utilities.query import reapply_model_ordering
 from utilities.request import safe_for_redirect
 from utilities.tables import get_table_configs
@@ -278,7 +279,7 @@ class BulkCreateView(GetReturnURLMixin, BaseMultiObjectView):
             logger.debug("Form validation was successful")
 
             try:
-                with transaction.atomic():
+                with transaction.atomic(), coalesced_counters():
                     new_objs = self._create_objects(form, request)
 
                     # Enforce object-level permissions
@@ -295,7 +296,7 @@ class BulkCreateView(GetReturnURLMixin, BaseMultiObjectView):
                 return redirect(self.get_return_url(request))
 
             except IntegrityError:
-                pass
+                clear_events.send(sender=self)
 
             except (AbortRequest, PermissionsViolation) as e:
                 logger.debug(e.message)
@@ -501,7 +502,7 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
 
             try:
                 # Iterate through data and bind each record to a new model form instance.
-                with transaction.atomic():
+                with transaction.atomic(), coalesced_counters():
                     new_objs = self.create_and_update_objects(form, request)
 
                     # Enforce object-level permissions
@@ -681,12 +682,12 @@ class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
             if form.is_valid():
                 logger.debug("Form validation was successful")
                 try:
-                    with transaction.atomic():
+                    with transaction.atomic(), coalesced_counters():
                         updated_objects = self._update_objects(form, request)
 
                         # Enforce object-level permissions
-                        object_count = self.queryset.filter(pk__in=[obj.pk for obj in updated_objects]).count()
-                        if object_count != len(updated_objects):
+                        pks = {obj.pk for obj in updated_objects}
+                        if get_permitted_pks(request.user, self.get_required_permission(), pks) != pks:
                             raise PermissionsViolation
 
                     if updated_objects:
@@ -778,7 +779,7 @@ class BulkRenameView(GetReturnURLMixin, BaseMultiObjectView):
 
             if form.is_valid():
                 try:
-                    with transaction.atomic():
+                    with transaction.atomic(), coalesced_counters():
                         renamed_pks = self._rename_objects(form, selected_objects)
 
                         if '_apply' in request.POST:
@@ -787,7 +788,8 @@ class BulkRenameView(GetReturnURLMixin, BaseMultiObjectView):
                                 obj.save()
 
                             # Enforce constrained permissions
-                            if self.queryset.filter(pk__in=renamed_pks).count() != len(selected_objects):
+                            pks = set(renamed_pks)
+                            if get_permitted_pks(request.user, self.get_required_permission(), pks) != pks:
                                 raise PermissionsViolation
 
                             messages.success(
@@ -875,7 +877,7 @@ class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
                 queryset = self.queryset.filter(pk__in=pk_list)
                 deleted_count = queryset.count()
                 try:
-                    with transaction.atomic():
+                    with transaction.atomic(), coalesced_counters():
                         for obj in queryset:
                             # Take a snapshot of change-logged models
                             if hasattr(obj, 'snapshot'):
@@ -885,11 +887,13 @@ class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
                 except (ProtectedError, RestrictedError) as e:
                     logger.info(f"Caught {type(e)} while attempting to delete objects")
                     handle_protectederror(queryset, request, e)
+                    clear_events.send(sender=self)
                     return redirect(self.get_return_url(request))
 
                 except AbortRequest as e:
                     logger.debug(e.message)
                     messages.error(request, mark_safe(e.message))
+                    clear_events.send(sender=self)
                     return redirect(self.get_return_url(request))
 
                 msg = _("Deleted {count} {object_type}").format(
@@ -980,7 +984,7 @@ class BulkComponentCreateView(GetReturnURLMixin, BaseMultiObjectView):
                 }
 
                 try:
-                    with transaction.atomic():
+                    with transaction.atomic(), coalesced_counters():
 
                         for obj in data['pk']:
 
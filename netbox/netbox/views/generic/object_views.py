@@ -469,11 +469,13 @@ class ObjectDeleteView(GetReturnURLMixin, BaseObjectView):
             except (ProtectedError, RestrictedError) as e:
                 logger.info(f"Caught {type(e)} while attempting to delete objects")
                 handle_protectederror([obj], request, e)
+                clear_events.send(sender=self)
                 return redirect(obj.get_absolute_url())
 
             except AbortRequest as e:
                 logger.debug(e.message)
                 messages.error(request, mark_safe(e.message))
+                clear_events.send(sender=self)
                 return redirect(obj.get_absolute_url())
 
             msg = 'Deleted {} {}'.format(self.queryset.model._meta.verbose_name, obj)
@@ -70,6 +70,7 @@ class SearchView(ConditionalLoginRequiredMixin, View):
     def get(self, request):
         results = []
         highlight = None
+        next_cursor = None
 
         # Initialize search form
         form = SearchForm(request.GET) if 'q' in request.GET else SearchForm()
@@ -83,12 +84,21 @@ class SearchView(ConditionalLoginRequiredMixin, View):
                 object_types.append(ContentType.objects.get_by_natural_key(app_label, model_name))
 
             lookup = form.cleaned_data['lookup'] or LookupTypes.PARTIAL
+            kwargs = {}
+            if search_backend.cursor_pagination:
+                # Retrieve a single page of results
+                kwargs = {
+                    'cursor': request.GET.get('cursor'),
+                    'limit': get_paginate_count(request),
+                }
             results = search_backend.search(
                 form.cleaned_data['q'],
                 user=request.user,
                 object_types=object_types,
-                lookup=lookup
+                lookup=lookup,
+                **kwargs
             )
+            next_cursor = getattr(results, 'next_cursor', None)
 
             # If performing a regex search, pass the highlight value as a compiled pattern
             if form.cleaned_data['lookup'] == LookupTypes.REGEX:
@@ -101,11 +111,14 @@ class SearchView(ConditionalLoginRequiredMixin, View):
 
         table = SearchTable(results, highlight=highlight)
 
-        # Paginate the table results
-        RequestConfig(request, {
-            'paginator_class': EnhancedPaginator,
-            'per_page': get_paginate_count(request)
-        }).configure(table)
+        # Paginate the table results (unless the search backend has already done so)
+        if search_backend.cursor_pagination:
+            RequestConfig(request, paginate=False).configure(table)
+        else:
+            RequestConfig(request, {
+                'paginator_class': EnhancedPaginator,
+                'per_page': get_paginate_count(request)
+            }).configure(table)
 
         # If this is an HTMX request, return only the rendered table HTML
         if htmx_partial(request):
@@ -116,6 +129,7 @@ class SearchView(ConditionalLoginRequiredMixin, View):
         return render(request, 'search.html', {
             'form': form,
             'table': table,
+            'next_cursor': next_cursor,
         })
 
 
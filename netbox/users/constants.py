@@ -7,3 +7,6 @@ OBJECTPERMISSION_OBJECT_TYPES = Q(
 )
 
 CONSTRAINT_TOKEN_USER = '$user'
+
+OBJECTPERMISSION_CACHE_VERSION_KEY = 'object_permissions_version'
+OBJECTPERMISSION_CACHE_TIMEOUT = 60 * 60
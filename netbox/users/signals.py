@@ -1,11 +1,13 @@
 import logging
 
 from django.contrib.auth.signals import user_login_failed
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from netbox.config import get_config
-from users.models import User, UserConfig
+from users.models import Group, ObjectPermission, User, UserConfig
+from users.utils import invalidate_object_permissions_cache
 from utilities.request import get_client_ip
 
 
@@ -31,3 +33,31 @@ def create_userconfig(instance, created, raw=False, **kwargs):
     if created and not raw:
         config = get_config()
         UserConfig(user=instance, data=config.DEFAULT_USER_PREFERENCES).save()
+
+
+@receiver((post_save, post_delete), sender=ObjectPermission)
+@receiver(post_delete, sender=Group)
+@receiver(m2m_changed, sender=ObjectPermission.object_types.through)
+@receiver(m2m_changed, sender=User.object_permissions.through)
+@receiver(m2m_changed, sender=Group.object_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def clear_object_permissions_cache(sender, **kwargs):
+    """
+    Invalidate all cached object permissions when an ObjectPermission, group, or group membership is modified.
+    Invalidation is repeated once the transaction has been committed, in case the cache was repopulated with the
+    prior state in the meantime.
+    """
+    if kwargs.get('action', 'post_').startswith('post_'):
+        invalidate_object_permissions_cache()
+        transaction.on_commit(invalidate_object_permissions_cache)
+
+
+@receiver(post_save, sender=User)
+def clear_user_object_permissions_cache(instance, update_fields=None, **kwargs):
+    """
+    Invalidate all cached object permissions when a user is modified, unless only the user's last login time has
+    been updated.
+    """
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        invalidate_object_permissions_cache()
+        transaction.on_commit(invalidate_object_permissions_cache)
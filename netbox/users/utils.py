@@ -1,5 +1,10 @@
+import uuid
+
+from django.core.cache import cache
 from social_core.storage import NO_ASCII_REGEX, NO_SPECIAL_REGEX
 
+from .constants import OBJECTPERMISSION_CACHE_VERSION_KEY
+
 
 def clean_username(value):
     """Clean username removing any unsupported character"""
@@ -7,3 +12,18 @@ def clean_username(value):
     value = NO_SPECIAL_REGEX.sub('', value)
     value = value.replace(':', '')
     return value
+
+
+def get_object_permissions_cache_version():
+    """
+    Return the current version of the shared object permissions cache. Cached permissions from any prior version are
+    ignored.
+    """
+    return cache.get_or_set(OBJECTPERMISSION_CACHE_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+
+
+def invalidate_object_permissions_cache():
+    """
+    Invalidate the cached object permissions of all users by assigning a new cache version.
+    """
+    cache.set(OBJECTPERMISSION_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
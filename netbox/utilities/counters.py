@@ -1,10 +1,47 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.apps import apps
+from django.db import transaction
 from django.db.models import F, Count, OuterRef, Subquery
 from django.db.models.signals import post_delete, post_save, pre_delete
 
 from netbox.registry import registry
+from netbox.signals import post_bulk_create
 from .fields import CounterCacheField
 
+_pending_counts = ContextVar('pending_counts', default=None)
+
+
+class PendingCounts:
+    """
+    Counter changes aggregated in memory by coalesced_counters().
+    """
+    def __init__(self):
+        # Maps (model, pk) to the net change for each of the object's counters
+        self.deltas = defaultdict(lambda: defaultdict(int))
+        # Tracked objects which have already been deleted (and accounted for)
+        self.deleted = set()
+
+    def add(self, model, pk, counter_name, value):
+        self.deltas[(model, pk)][counter_name] += value
+
+    def flush(self):
+        """
+        Apply all pending changes, updating each parent object once. Objects sharing the same set of changes are
+        updated together.
+        """
+        groups = defaultdict(list)
+        for (model, pk), deltas in self.deltas.items():
+            if changes := tuple(sorted((name, value) for name, value in deltas.items() if value)):
+                groups[(model, changes)].append(pk)
+        for (model, changes), pks in groups.items():
+            model.objects.filter(pk__in=pks).update(**{
+                name: F(name) + value for name, value in changes
+            })
+        self.deltas.clear()
+
 
 def get_counters_for_model(model):
     """
@@ -16,14 +53,44 @@ def get_counters_for_model(model):
 def update_counter(model, pk, counter_name, value):
     """
     Increment or decrement a counter field on an object identified by its model and primary key (PK). Positive values
-    will increment; negative values will decrement.
+    will increment; negative values will decrement. Within a coalesced_counters() block, the change is deferred.
     """
+    if (pending := _pending_counts.get()) is not None:
+        pending.add(model, pk, counter_name, value)
+        return
     model.objects.filter(pk=pk).update(
         **{counter_name: F(counter_name) + value}
     )
 
 
-def update_counts(model, field_name, related_query):
+@contextmanager
+def coalesced_counters():
+    """
+    Aggregate all counter changes made within the block in memory, and apply the net change to each parent object
+    with a single UPDATE at the end of the block. This should be used within a transaction: if an exception is raised,
+    the pending changes are discarded along with the changes which produced them. Nested blocks defer to the
+    outermost block.
+    """
+    if _pending_counts.get() is not None:
+        yield
+        return
+
+    pending = PendingCounts()
+    token = _pending_counts.set(pending)
+    try:
+        yield
+    except Exception:
+        # Apply the changes anyway if they cannot be rolled back
+        if not transaction.get_connection().in_atomic_block:
+            pending.flush()
+        raise
+    else:
+        pending.flush()
+    finally:
+        _pending_counts.reset(token)
+
+
+def update_counts(model, field_name, related_query, chunk_size=None):
     """
     Perform a bulk update for the given model and counter field. For example,
 
@@ -32,7 +99,27 @@ def update_counts(model, field_name, related_query):
     will effectively set
 
         Device.objects.update(_interface_count=Count('interfaces'))
+
+    If chunk_size is specified, objects are instead processed in chunks of up to that many objects. The counts for
+    each chunk are calculated with a single aggregate query, and only objects whose count has changed are updated.
+    Returns the number of objects updated.
     """
+    if chunk_size:
+        updated = 0
+        last_pk = None
+        queryset = model.objects.order_by('pk')
+        while True:
+            chunk = queryset.filter(pk__gt=last_pk) if last_pk is not None else queryset
+            pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                return updated
+            counts = model.objects.filter(pk__in=pks).annotate(_count=Count(related_query)).values_list(
+                'pk', field_name, '_count'
+            )
+            stale = [model(pk=pk, **{field_name: count}) for pk, current, count in counts if current != count]
+            updated += model.objects.bulk_update(stale, [field_name])
+            last_pk = pks[-1]
+
     subquery = Subquery(
         model.objects.filter(pk=OuterRef('pk')).annotate(_count=Count(related_query)).values('_count')
     )
@@ -62,7 +149,27 @@ def post_save_receiver(sender, instance, created, **kwargs):
             update_counter(parent_model, new_pk, counter_name, 1)
 
 
+def post_bulk_create_receiver(sender, instances, **kwargs):
+    """
+    Update counter fields on related objects when many TrackingModelMixin subclass instances are created in bulk. Each
+    parent object's counter is incremented only once.
+    """
+    for field_name, counter_name in get_counters_for_model(sender):
+        parent_model = sender._meta.get_field(field_name).related_model
+        counts = Counter(getattr(instance, field_name, None) for instance in instances)
+        for pk, count in counts.items():
+            if pk is not None:
+                update_counter(parent_model, pk, counter_name, count)
+
+    # Clear any tracked fields, as for a saved instance
+    for instance in instances:
+        instance.tracker.clear()
+
+
 def pre_delete_receiver(sender, instance, origin, **kwargs):
+    # Deletions within a coalesced_counters() block are tracked by post_delete_receiver()
+    if _pending_counts.get() is not None:
+        return
     model = instance._meta.model
     if not model.objects.filter(pk=instance.pk).exists():
         instance._previously_removed = True
@@ -72,6 +179,13 @@ def post_delete_receiver(sender, instance, origin, **kwargs):
     """
     Update counter fields on related objects when a TrackingModelMixin subclass is deleted.
     """
+    # Ignore any object which has already been deleted (e.g. by a cascading deletion) within a coalesced_counters()
+    # block
+    if (pending := _pending_counts.get()) is not None:
+        if (sender, instance.pk) in pending.deleted:
+            return
+        pending.deleted.add((sender, instance.pk))
+
     for field_name, counter_name in get_counters_for_model(sender):
         parent_model = sender._meta.get_field(field_name).related_model
         parent_pk = getattr(instance, field_name, None)
@@ -87,7 +201,8 @@ def post_delete_receiver(sender, instance, origin, **kwargs):
 
 def connect_counters(*models):
     """
-    Register counter fields and connect post_save & post_delete signal handlers for the affected models.
+    Register counter fields and connect post_save, post_bulk_create & post_delete signal handlers for the affected
+    models.
     """
     for model in models:
 
@@ -110,6 +225,12 @@ def connect_counters(*models):
                 weak=False,
                 dispatch_uid=f'{model._meta.label}.{field.name}'
             )
+            post_bulk_create.connect(
+                post_bulk_create_receiver,
+                sender=to_model,
+                weak=False,
+                dispatch_uid=f'{model._meta.label}.{field.name}'
+            )
             pre_delete.connect(
                 pre_delete_receiver,
                 sender=to_model,
@@ -1,3 +1,6 @@
+import json
+from functools import lru_cache
+
 from django.apps import apps
 from jinja2 import BaseLoader, TemplateNotFound
 from jinja2.meta import find_referenced_templates
@@ -7,9 +10,15 @@ from netbox.config import get_config
 
 __all__ = (
     'DataFileLoader',
+    'compile_template',
+    'get_environment',
     'render_jinja2',
 )
 
+# Maximum number of Jinja2 environments and compiled templates retained per process
+ENVIRONMENT_CACHE_SIZE = 64
+TEMPLATE_CACHE_SIZE = 1024
+
 
 class DataFileLoader(BaseLoader):
     """
@@ -39,7 +48,8 @@ class DataFileLoader(BaseLoader):
                 df.path: df.data_as_string for df in related_files
             })
 
-        return template_source, template, lambda: True
+        # The compiled template remains valid for as long as its source is unchanged
+        return template_source, template, lambda: self._template_cache.get(template) == template_source
 
     def cache_templates(self, templates):
         self._template_cache.update(templates)
@@ -49,27 +59,59 @@ class DataFileLoader(BaseLoader):
 # Utility functions
 #
 
+@lru_cache(maxsize=ENVIRONMENT_CACHE_SIZE)
+def get_environment(environment_params, data_source_id=None, data_source_version=None):
+    """
+    Return a SandboxedEnvironment constructed with the given parameters (serialized as JSON). Environments are cached
+    for reuse along with their compiled templates. An environment used to render DataFiles is specific to its
+    DataSource and version (the time of its last synchronization), such that any changes to the source's files are
+    picked up by a new environment.
+    """
+    environment_params = json.loads(environment_params)
+    if data_source_id is not None:
+        environment_params['loader'] = DataFileLoader(data_source_id)
+    else:
+        environment_params['loader'] = BaseLoader()
+
+    environment = SandboxedEnvironment(**environment_params)
+    environment.filters.update(get_config().JINJA2_FILTERS)
+
+    return environment
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(environment, template_code):
+    """
+    Compile the given template code within a cached environment. Templates are cached by their content.
+    """
+    return environment.from_string(source=template_code)
+
+
 def render_jinja2(template_code, context, environment_params=None, data_file=None):
     """
     Render a Jinja2 template with the provided context. Return the rendered content.
     """
     environment_params = environment_params or {}
 
-    if 'loader' not in environment_params:
+    if 'loader' in environment_params:
+        # A custom loader has been specified, so the environment cannot be cached
+        environment = SandboxedEnvironment(**environment_params)
+        environment.filters.update(get_config().JINJA2_FILTERS)
         if data_file:
-            loader = DataFileLoader(data_file.source)
-            loader.cache_templates({
-                data_file.path: template_code
-            })
+            template = environment.get_template(data_file.path)
         else:
-            loader = BaseLoader()
-        environment_params['loader'] = loader
-
-    environment = SandboxedEnvironment(**environment_params)
-    environment.filters.update(get_config().JINJA2_FILTERS)
+            template = environment.from_string(source=template_code)
+        return template.render(**context)
 
+    environment_params = json.dumps(environment_params, sort_keys=True)
     if data_file:
+        environment = get_environment(environment_params, data_file.source_id, data_file.source.last_synced)
+        environment.loader.cache_templates({
+            data_file.path: template_code
+        })
         template = environment.get_template(data_file.path)
     else:
-        template = environment.from_string(source=template_code)
+        environment = get_environment(environment_params)
+        template = compile_template(environment, template_code)
+
     return template.render(**context)
@@ -9,6 +9,12 @@ from utilities.counters import update_counts
 class Command(BaseCommand):
     help = "Force a recalculation of all cached counter fields"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, dest='chunk_size',
+            help="Number of objects to recalculate at once (default: 1000)"
+        )
+
     @staticmethod
     def collect_models():
         """
@@ -29,6 +35,6 @@ class Command(BaseCommand):
     def handle(self, *model_names, **options):
         for model, mappings in self.collect_models().items():
             for field_name, related_query in mappings.items():
-                update_counts(model, field_name, related_query)
+                update_counts(model, field_name, related_query, chunk_size=options['chunk_size'])
 
         self.stdout.write(self.style.SUCCESS('Finished.'))
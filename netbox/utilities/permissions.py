@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.apps import apps
+from django.contrib.auth import get_backends
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
@@ -7,6 +8,7 @@ from users.constants import CONSTRAINT_TOKEN_USER
 
 __all__ = (
     'get_permission_for_model',
+    'get_permitted_pks',
     'permission_is_exempt',
     'qs_filter_from_constraints',
     'resolve_permission',
@@ -27,6 +29,28 @@ def get_permission_for_model(model, action):
     return f'{model._meta.app_label}.{action}_{model._meta.model_name}'
 
 
+def get_permitted_pks(user, permission, pks):
+    """
+    Return the subset of the given primary keys identifying objects on which the user has been granted the specified
+    permission. Each authentication backend which supports object-level permissions checks all remaining objects
+    using a single query.
+
+    :param user: User instance
+    :param permission: Permission name in the format <app_label>.<action>_<model>
+    :param pks: An iterable of primary keys
+    """
+    pks = set(pks)
+    permitted = set()
+
+    for backend in get_backends():
+        if not hasattr(backend, 'get_permitted_pks'):
+            continue
+        if remaining := pks - permitted:
+            permitted |= backend.get_permitted_pks(user, permission, remaining)
+
+    return permitted
+
+
 def resolve_permission(name):
     """
     Given a permission name, return the app_label, action, and model_name components. For example, "dcim.view_site"
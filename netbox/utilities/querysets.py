@@ -58,10 +58,12 @@ class RestrictedQuerySet(QuerySet):
 
         # Filter the queryset to include only objects with allowed attributes
         else:
-            tokens = {
-                CONSTRAINT_TOKEN_USER: user,
-            }
-            attrs = qs_filter_from_constraints(user._object_perm_cache[permission_required], tokens)
+            # Use the compiled filter for the permission's constraints, if available
+            if (attrs := getattr(user, '_object_perm_filters', {}).get(permission_required)) is None:
+                tokens = {
+                    CONSTRAINT_TOKEN_USER: user,
+                }
+                attrs = qs_filter_from_constraints(user._object_perm_cache[permission_required], tokens)
             # #8715: Avoid duplicates when JOIN on many-to-many fields without using DISTINCT.
             # DISTINCT acts globally on the entire request, which may not be desirable.
             allowed_objects = self.model.objects.filter(attrs)
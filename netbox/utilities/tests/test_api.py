@@ -187,6 +187,30 @@ class APIPaginationTestCase(APITestCase):
         self.assertIsNone(response.data['previous'])
         self.assertEqual(len(response.data['results']), 100)
 
+    def test_cursor_pagination(self):
+        site_ids = sorted(Site.objects.values_list('pk', flat=True))
+
+        # Retrieve the first page
+        response = self.client.get(f'{self.url}?limit=30&cursor=', format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertIsNone(response.data['count'])
+        self.assertIsNone(response.data['previous'])
+        self.assertEqual([site['id'] for site in response.data['results']], site_ids[:30])
+
+        # Follow the next links to retrieve the remaining pages
+        results = response.data['results']
+        while next_url := response.data['next']:
+            self.assertNotIn('offset=', next_url)
+            response = self.client.get(next_url, format='json', **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            results.extend(response.data['results'])
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual([site['id'] for site in results], site_ids)
+
+        # Invalid cursor
+        response = self.client.get(f'{self.url}?cursor=foo', format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_404_NOT_FOUND)
+
 
 class APIOrderingTestCase(APITestCase):
     user_permissions = ('dcim.view_site',)
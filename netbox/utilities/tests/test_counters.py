@@ -2,6 +2,7 @@ from django.test import override_settings
 from django.urls import reverse
 
 from dcim.models import *
+from utilities.counters import coalesced_counters, update_counts
 from utilities.testing.base import TestCase
 from utilities.testing.utils import create_test_device
 
@@ -81,6 +82,50 @@ class CountersTest(TestCase):
         self.assertEqual(device1.interface_count, 1)
         self.assertEqual(device2.interface_count, 3)
 
+    def test_coalesced_counters(self):
+        """
+        Counter changes made within a coalesced_counters() block should be applied once at the end of the block.
+        """
+        device1, device2 = Device.objects.all()
+
+        with coalesced_counters():
+            Interface.objects.create(device=device1, name='Interface 5')
+            Interface.objects.create(device=device1, name='Interface 6')
+            interface = Interface.objects.get(name='Interface 3')
+            interface.device = device1
+            interface.save()
+            Interface.objects.get(name='Interface 4').delete()
+            inventory_item1 = InventoryItem.objects.create(device=device2, name='Item 1')
+            inventory_item2 = InventoryItem.objects.create(device=device2, name='Item 2', parent=inventory_item1)
+
+            # Deleting the parent item also deletes its child
+            inventory_item1.delete()
+            inventory_item2.delete()
+
+            # Counters are not updated until the end of the block
+            device1.refresh_from_db()
+            self.assertEqual(device1.interface_count, 2)
+
+        device1.refresh_from_db()
+        device2.refresh_from_db()
+        self.assertEqual(device1.interface_count, 5)
+        self.assertEqual(device2.interface_count, 0)
+        self.assertEqual(device2.inventory_item_count, 0)
+
+    def test_update_counts(self):
+        """
+        Recalculating counters in chunks should correct only those objects whose counts have changed.
+        """
+        Device.objects.filter(name='Device 1').update(interface_count=0)
+        Device.objects.filter(name='Device 2').update(interface_count=5)
+        create_test_device('Device 3')
+
+        self.assertEqual(update_counts(Device, 'interface_count', 'interfaces', chunk_size=1), 2)
+        self.assertListEqual(
+            list(Device.objects.order_by('name').values_list('interface_count', flat=True)),
+            [2, 2, 0]
+        )
+
     @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
     def test_mptt_child_delete(self):
         device1 = Device.objects.first()
@@ -143,6 +143,13 @@ class VirtualMachine(ContactsMixin, ImageAttachmentsMixin, RenderConfigMixin, Co
         to_field='virtual_machine'
     )
 
+    # Stored merge of all applicable config contexts (if MATERIALIZE_CONFIG_CONTEXTS is enabled)
+    _config_context = models.JSONField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+
     objects = ConfigContextModelQuerySet.as_manager()
 
     clone_fields = (